@@ -6,21 +6,45 @@ UI window will reappear.  Toggle "Python < painter-paladin".
 """
 
 # import importlib
+import time
 
-import substance_painter as sp
+# Time plugin imports first. Report with "Import Time Report" in the Debug tab.
+from .painter_paladin.import_timer import IMPORT_TIMER
 
-from .painter_paladin import paladin_ui
+IMPORT_TIMER.start()
+
+import substance_painter as sp  # noqa: E402
+from PySide6.QtCore import QTimer  # noqa: E402
+
+# Only what the dock needs to appear. Logic and debug helpers are imported on first use.
+from .painter_paladin import paladin_ui  # noqa: E402
+from .painter_paladin.session import PaladinSession  # noqa: E402
+
+IMPORT_TIMER.stop()
 
 # importlib.reload(paladin_ui)
 
 # List to keep track of ui elements
 plugin_widgets = []
 
+# Plugin caches, kept current by Substance Painter events while the plugin runs
+plugin_session = PaladinSession()
+
+# Build UI tabs the first time they are shown. Set False to compare startup time.
+DEFER_TABS = True
+# Build the remaining tabs this long after startup, when Painter is idle. None to skip.
+PREBUILD_DELAY_MS = 2000
+
 
 def start_plugin() -> None:
     """Start plugin."""
+    start_time = time.perf_counter()
+
+    # Listen to project and layer stack events
+    plugin_session.connect()
+
     # Painter Paladin UI
-    custom_ui_widget = paladin_ui.PainterPaladinUI()
+    custom_ui_widget = paladin_ui.PainterPaladinUI(plugin_session, defer_tabs=DEFER_TABS)
     dock_widget = sp.ui.add_dock_widget(custom_ui_widget)
     dock_widget.setWindowTitle("Painter Paladin")
 
@@ -31,10 +55,25 @@ def start_plugin() -> None:
     # Show UI
     dock_widget.show()
 
+    if DEFER_TABS and PREBUILD_DELAY_MS is not None:
+        QTimer.singleShot(PREBUILD_DELAY_MS, custom_ui_widget.prebuild_tabs)
+
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    import_ms = IMPORT_TIMER.total_time() * 1000
+    sp.logging.info(
+        f"Painter Paladin started in {elapsed_ms:.1f} ms, imports {import_ms:.1f} ms. "
+        f"Deferred tabs: {DEFER_TABS}",
+    )
+
 
 def close_plugin() -> None:
     """Close plugin."""
-    # Delete widgets
+    # Delete widgets. A hot reload may have given a widget its own session.
     for widget in plugin_widgets:
+        session = getattr(widget, "session", None)
+        if session is not None and session is not plugin_session:
+            session.disconnect()
         sp.ui.delete_ui_element(widget)
     plugin_widgets.clear()
+
+    plugin_session.disconnect()
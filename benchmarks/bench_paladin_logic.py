@@ -0,0 +1,163 @@
+"""Painter Paladin Logic Benchmark
+==================================================
+
+Times every PaladinLogic action against synthetic stacks, outside of Substance Painter.
+Uses the "stand_in" substance_painter package, with optional per-call latency.
+
+Ex. python benchmarks/bench_paladin_logic.py
+Ex. python benchmarks/bench_paladin_logic.py --nodes 100 --channels 8 --latency 0.00005
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+# Stand-in substance_painter first, then the plugin package.
+sys.path[:0] = [str(BENCHMARKS_DIR / "stand_in"), str(BENCHMARKS_DIR.parent)]
+
+import substance_painter as sp  # noqa: E402
+from substance_painter import _fake  # noqa: E402
+
+from painter_paladin.macro import Macro  # noqa: E402
+from painter_paladin.paladin_logic import ExecutionMode, PaladinLogic  # noqa: E402
+from painter_paladin.session import PaladinSession  # noqa: E402
+
+# Latency settings used while timing. Filled from the command line.
+CONFIG = {"latency": 0.0, "search_latency": 0.0}
+
+# Typical texturing pass, replayed per selected node.
+SKIN_PASS = Macro("Skin Pass")
+SKIN_PASS.add("paintable_fill_layer")
+SKIN_PASS.add("set_channel_value", (0.87, 0.69, 0.65), "BaseColor")
+SKIN_PASS.add("add_generator_mask", "Curvature")
+SKIN_PASS.add("set_opacity", opacity_val=0.5)
+
+# (label, PaladinLogic method, args, run once before timing)
+ACTIONS = [
+    ("set_opacity", "set_opacity", (0.5,), False),
+    ("set_opacity (rerun)", "set_opacity", (0.5,), True),
+    ("set_passthrough_mode", "set_passthrough_mode", (), False),
+    ("setup_mask", "setup_mask", ("Black",), False),
+    ("remove_layer_mask", "remove_layer_mask", (), False),
+    ("enable_channels_for_selected_fill", "enable_channels_for_selected_fill", (), False),
+    ("disable_all_except_base_color", "disable_all_except_base_color", (), False),
+    ("set_channel_value", "set_channel_value", ((0.8, 0.6, 0.5), "BaseColor"), False),
+    ("add_mask_fill", "add_mask_fill", (), False),
+    ("add_noise_mask", "add_noise_mask", (), False),
+    ("add_generator_mask", "add_generator_mask", ("Curvature",), False),
+    ("paintable_fill_layer", "paintable_fill_layer", (), False),
+    ("paintable_fill_layer_group", "paintable_fill_layer_group", (), False),
+    ("add_passthrough_paint_layer", "add_passthrough_paint_layer", (), False),
+    ("replay_macro (4 steps, per node)", "replay_macro", (SKIN_PASS, True), False),
+]
+
+
+def run_action(
+    label: str,
+    method_name: str,
+    args: tuple,
+    warm: bool,
+    nodes: int,
+    channels: int,
+    execution_mode: ExecutionMode,
+) -> dict:
+    """Time one action on a freshly built project with every root layer selected.
+
+    Returns:
+        dict: Wall time, API call count, recomputes and undo steps for the action.
+
+    """
+    _fake.configure(call_latency=0.0, search_latency=0.0)
+    _fake.build_project(layers=nodes, channels=channels)
+    stack = sp.textureset.get_active_stack()
+    sp.layerstack.set_selected_nodes(sp.layerstack.get_root_layer_nodes(stack))
+
+    logic = PaladinLogic(PaladinSession(), execution_mode)
+    if warm:
+        getattr(logic, method_name)(*args)
+
+    _fake.configure(call_latency=CONFIG["latency"], search_latency=CONFIG["search_latency"])
+    _fake.reset_counts()
+    sp.logging.RECORDS.clear()
+
+    start = time.perf_counter()
+    getattr(logic, method_name)(*args)
+    wall_time = time.perf_counter() - start
+
+    warnings = [message for level, message in sp.logging.RECORDS if level != "INFO"]
+    return {
+        "action": label,
+        "nodes": nodes,
+        "channels": channels,
+        "wall_ms": round(wall_time * 1000, 3),
+        "api_calls": _fake.total_calls(),
+        "recomputes": _fake.ENGINE["recomputes"],
+        "undo_steps": _fake.ENGINE["undo_steps"],
+        "warnings": warnings,
+    }
+
+
+def print_table(results: list[dict]) -> None:
+    """Print results as a fixed width table."""
+    header = f"{'action':36} {'nodes':>6} {'chan':>5} {'wall ms':>10} {'calls':>8} {'recomp':>7}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['action']:36} {result['nodes']:>6} {result['channels']:>5} "
+            f"{result['wall_ms']:>10.2f} {result['api_calls']:>8} {result['recomputes']:>7}",
+        )
+        for warning in result["warnings"][:1]:
+            print(f"    warning: {warning}")
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--channels", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per API call.")
+    parser.add_argument(
+        "--search-latency",
+        type=float,
+        default=0.0,
+        help="Extra seconds per resource.search call.",
+    )
+    parser.add_argument("--actions", nargs="+", help="Only run these action labels.")
+    parser.add_argument("--verify", action="store_true", help="Use Verify execution mode.")
+    parser.add_argument("--json", type=Path, help="Also write results to a JSON file.")
+    args = parser.parse_args()
+
+    CONFIG["latency"] = args.latency
+    CONFIG["search_latency"] = args.search_latency
+    execution_mode = ExecutionMode.VERIFY if args.verify else ExecutionMode.QUIET
+
+    results = []
+    for nodes in args.nodes:
+        for channels in args.channels:
+            for label, method_name, method_args, warm in ACTIONS:
+                if args.actions and label not in args.actions:
+                    continue
+                results.append(
+                    run_action(
+                        label,
+                        method_name,
+                        method_args,
+                        warm,
+                        nodes,
+                        channels,
+                        execution_mode,
+                    ),
+                )
+
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
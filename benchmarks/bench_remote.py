@@ -0,0 +1,243 @@
+"""Remote Scripting Load Test
+==================================================
+
+Measures requests/sec and tail latency of the "remote_utils" clients under concurrency.
+Runs against the "remote_stand_in" server in the same process, or a running Painter.
+
+Ex. python benchmarks/bench_remote.py
+Ex. python benchmarks/bench_remote.py --clients 1 8 32 --requests 200 --latency 0.002
+Ex. python benchmarks/bench_remote.py --mode async --target localhost:60041
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+# Remote clients, imported the same way "send_to_painter.py" does.
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "remote_utils"))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import lib_remote  # noqa: E402
+import lib_remote_async  # noqa: E402
+from remote_stand_in import StandInConfig, serve_in_thread  # noqa: E402
+
+
+def make_script(payload_size: int) -> str:
+    """Small script padded to about "payload_size" bytes. Returns 1."""
+    return f"# {'x' * max(payload_size - 4, 0)}\n1"
+
+
+def run_sync(
+    host: str,
+    port: int,
+    clients: int,
+    requests: int,
+    script: str,
+    reconnect: bool,
+) -> tuple[list[float], list[str]]:
+    """One thread and one RemotePainter per client.
+
+    Returns:
+        tuple: Latency per successful request in seconds, error type per failed request.
+
+    """
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def client() -> None:
+        remote = lib_remote.RemotePainter(port, host)
+        local_latencies, local_errors = [], []
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                remote.execScript(script, "python")
+                local_latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                local_errors.append(type(e).__name__)
+            if reconnect:
+                remote.close()
+        remote.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def run_async(
+    host: str,
+    port: int,
+    clients: int,
+    requests: int,
+    script: str,
+    reconnect: bool,
+) -> tuple[list[float], list[str]]:
+    """One AsyncRemotePainter per client, all on one event loop. Same returns as "run_sync()"."""
+    latencies: list[float] = []
+    errors: list[str] = []
+
+    async def client() -> None:
+        async with lib_remote_async.AsyncRemotePainter(port, host) as remote:
+            for _ in range(requests):
+                start = time.perf_counter()
+                try:
+                    await remote.execScript(script, "python")
+                    latencies.append(time.perf_counter() - start)
+                except Exception as e:
+                    errors.append(type(e).__name__)
+                if reconnect:
+                    await remote.close()
+
+    async def main() -> None:
+        await asyncio.gather(*(client() for _ in range(clients)))
+
+    asyncio.run(main())
+    return latencies, errors
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest rank percentile of sorted values. 0 if empty."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_load(
+    mode: str,
+    host: str,
+    port: int,
+    clients: int,
+    requests: int,
+    payload_size: int,
+    reconnect: bool,
+) -> dict:
+    """Time one load level.
+
+    Returns:
+        dict: Requests/sec, latency percentiles in ms and error counts.
+
+    """
+    runner = run_async if mode == "async" else run_sync
+    script = make_script(payload_size)
+    # Clients print every response. Discarded so printing isn't what gets timed.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        latencies, errors = runner(host, port, clients, requests, script, reconnect)
+        wall_time = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "mode": mode + (" reconnect" if reconnect else ""),
+        "clients": clients,
+        "requests": clients * requests,
+        "errors": {name: errors.count(name) for name in sorted(set(errors))},
+        "wall_s": round(wall_time, 3),
+        "req_per_s": round(len(latencies) / wall_time, 1) if wall_time else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+def print_table(results: list[dict]) -> None:
+    """Print results as a fixed width table."""
+    header = (
+        f"{'mode':16} {'clients':>7} {'reqs':>7} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['mode']:16} {result['clients']:>7} {result['requests']:>7} "
+            f"{result['req_per_s']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['max_ms']:>8.2f} "
+            f"{sum(result['errors'].values()):>7}",
+        )
+        for name, count in result["errors"].items():
+            print(f"    {name}: {count}")
+
+
+def main() -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client.")
+    parser.add_argument("--payload-size", type=int, default=256, help="Script size in bytes.")
+    parser.add_argument(
+        "--reconnect",
+        action="store_true",
+        help="Also run with a new connection per request, for comparison.",
+    )
+    parser.add_argument("--target", help="host:port of a running server. Stand-in if not set.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in seconds per script.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Stand-in random extra seconds.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Stand-in 0-1 errors.")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Stand-in 0-1 drops.")
+    parser.add_argument("--parallel", action="store_true", help="Stand-in runs scripts at once.")
+    parser.add_argument("--json", type=Path, help="Also write results to a JSON file.")
+    args = parser.parse_args()
+
+    server = None
+    if args.target:
+        host, port = lib_remote_async.parseTarget(args.target)
+    else:
+        config = StandInConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            fail_rate=args.fail_rate,
+            drop_rate=args.drop_rate,
+            serial=not args.parallel,
+            seed=0,
+        )
+        server = serve_in_thread(config)
+        host, port = server.server_address
+
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    results = []
+    try:
+        for mode in modes:
+            for reconnect in [False, True] if args.reconnect else [False]:
+                for clients in args.clients:
+                    results.append(
+                        run_load(
+                            mode,
+                            host,
+                            port,
+                            clients,
+                            args.requests,
+                            args.payload_size,
+                            reconnect,
+                        ),
+                    )
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Remote Transfer Benchmark
+==================================================
+
+Compares moving large payloads to and from Painter in one script request ("single")
+with "RemotePainter.uploadFile()/downloadFile()" in chunks, with and without compression.
+Reports MB/s and peak Python memory per transfer.
+
+Runs against the "remote_stand_in" server in the same process, so peak memory covers
+both the client and the Painter side. Payloads are synthetic preset library JSON,
+which compresses well, and random bytes, which don't.
+
+Ex. python benchmarks/bench_transfer.py
+Ex. python benchmarks/bench_transfer.py --sizes 1 16 64 --chunk-size 4194304 --json out.json
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+# Remote clients, imported the same way "send_to_painter.py" does.
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "remote_utils"))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import lib_remote  # noqa: E402
+from remote_stand_in import StandInConfig, serve_in_thread  # noqa: E402
+
+# One script carrying the whole payload, the way scripts pass data in today.
+SINGLE_UPLOAD_TEMPLATE = """\
+import base64
+with open({path!r}, "wb") as _file:
+    _file.write(base64.b64decode({data!r}))
+"""
+
+# One script returning the whole file as its result.
+SINGLE_DOWNLOAD_TEMPLATE = """\
+import base64
+with open({path!r}, "rb") as _file:
+    _data = base64.b64encode(_file.read()).decode("ascii")
+_data
+"""
+
+
+def make_payload(kind: str, size: int) -> bytes:
+    """Synthetic payload of about "size" bytes.
+
+    Args:
+        kind: "json" for a preset library like document, "random" for incompressible bytes.
+        size: Bytes.
+
+    """
+    if kind == "random":
+        return os.urandom(size)
+    rng = random.Random(0)
+    rows = []
+    total = 0
+    while total < size:
+        row = {
+            "id": f"row_{len(rows)}",
+            "title": f"Preset {len(rows)}:",
+            "channel": rng.choice(["BaseColor", "Roughness", "Metallic", "Height"]),
+            "values": [[round(rng.random(), 3) for _ in range(3)] for _ in range(4)],
+        }
+        rows.append(row)
+        total += len(json.dumps(row)) + 2
+    return json.dumps({"rows": rows}).encode("utf-8")[:size]
+
+
+def single_upload(remote: lib_remote.RemotePainter, payload: bytes, path: str) -> None:
+    script = SINGLE_UPLOAD_TEMPLATE.format(path=path, data=base64.b64encode(payload).decode())
+    remote.execScript(script, "python")
+
+
+def single_download(remote: lib_remote.RemotePainter, path: str) -> bytes:
+    response = remote.execScript(SINGLE_DOWNLOAD_TEMPLATE.format(path=path), "python")
+    return base64.b64decode(response.get("output") or "")
+
+
+def measure(transfer) -> tuple[float, int, object]:
+    """Run a transfer once.
+
+    Returns:
+        tuple: Seconds, peak traced bytes, and the transfer's return value.
+
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = transfer()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, value
+
+
+def run_case(
+    remote: lib_remote.RemotePainter,
+    method: str,
+    kind: str,
+    size_mb: float,
+    chunk_size: int,
+    work_dir: Path,
+) -> dict:
+    """Upload and download one payload with one method, and check it came back intact."""
+    payload = make_payload(kind, int(size_mb * 1024 * 1024))
+    source = work_dir / f"source_{kind}.bin"
+    source.write_bytes(payload)
+    compress = method == "chunked+zlib"
+    result = {"method": method, "payload": kind, "size_mb": size_mb, "error": None}
+
+    try:
+        if method == "single":
+            remote_path = str(work_dir / "single_upload.bin")
+            upload_time, upload_peak, _ = measure(
+                lambda: single_upload(remote, source.read_bytes(), remote_path),
+            )
+            download_time, download_peak, data = measure(
+                lambda: single_download(remote, remote_path),
+            )
+        else:
+            upload_time, upload_peak, remote_path = measure(
+                lambda: remote.uploadFile(source, chunk_size, compress),
+            )
+            output = work_dir / "download.bin"
+            download_time, download_peak, _ = measure(
+                lambda: remote.downloadFile(remote_path, output, chunk_size, compress),
+            )
+            data = output.read_bytes()
+            # The stand-in shares this machine's temp folder.
+            Path(remote_path).unlink()
+        if data != payload:
+            result["error"] = "Downloaded data differs"
+    except (lib_remote.PainterError, OSError) as e:
+        # Ex. the single request was larger than the server accepts.
+        result["error"] = (str(e).splitlines() or [type(e).__name__])[0][:80]
+        return result
+
+    result.update(
+        {
+            "upload_mb_s": round(size_mb / upload_time, 1),
+            "download_mb_s": round(size_mb / download_time, 1),
+            "upload_peak_mb": round(upload_peak / 1024 / 1024, 1),
+            "download_peak_mb": round(download_peak / 1024 / 1024, 1),
+        },
+    )
+    return result
+
+
+def print_table(results: list[dict]) -> None:
+    """Print results as a fixed width table."""
+    header = (
+        f"{'method':13} {'payload':8} {'MB':>6} {'up MB/s':>8} {'down MB/s':>10} "
+        f"{'up peak MB':>11} {'down peak MB':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        line = f"{result['method']:13} {result['payload']:8} {result['size_mb']:>6g}"
+        if result["error"]:
+            print(f"{line} failed: {result['error']}")
+            continue
+        print(
+            f"{line} {result['upload_mb_s']:>8.1f} {result['download_mb_s']:>10.1f} "
+            f"{result['upload_peak_mb']:>11.1f} {result['download_peak_mb']:>13.1f}",
+        )
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 8, 32], help="MB.")
+    parser.add_argument("--payloads", nargs="+", default=["json", "random"])
+    parser.add_argument("--chunk-size", type=int, default=lib_remote.TRANSFER_CHUNK_SIZE)
+    parser.add_argument("--max-body", type=int, default=StandInConfig.max_body)
+    parser.add_argument("--json", type=Path, help="Also write results to a JSON file.")
+    args = parser.parse_args()
+
+    server = serve_in_thread(StandInConfig(max_body=args.max_body))
+    host, port = server.server_address
+    results = []
+    try:
+        with (
+            lib_remote.RemotePainter(port, host) as remote,
+            tempfile.TemporaryDirectory() as work_dir,
+            open(os.devnull, "w") as devnull,
+        ):
+            for kind in args.payloads:
+                for size_mb in args.sizes:
+                    for method in ("single", "chunked", "chunked+zlib"):
+                        # The single path prints whole responses. Discarded, still timed.
+                        with contextlib.redirect_stdout(devnull):
+                            result = run_case(
+                                remote,
+                                method,
+                                kind,
+                                size_mb,
+                                args.chunk_size,
+                                Path(work_dir),
+                            )
+                        results.append(result)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
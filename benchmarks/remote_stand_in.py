@@ -0,0 +1,229 @@
+"""Remote Scripting Stand-in Server
+==================================================
+
+Serves the "/run.json" remote scripting route like Painter with "--enable-remote-scripting".
+Runs on any OS, so "remote_utils" clients can be tested and benchmarked without Painter.
+
+Requests are JSON with a base64 "python" or "js" payload. Python payloads run against the
+"stand_in" substance_painter package, one at a time, like on Painter's main thread.
+The value of a final expression is sent back as JSON. Errors come back as {"error": ...}.
+JS payloads can't run here and return null.
+
+Ex. python benchmarks/remote_stand_in.py --port 60041
+Ex. python benchmarks/remote_stand_in.py --latency 0.005 --fail-rate 0.1 --max-body 1000000
+"""
+
+import argparse
+import ast
+import base64
+import contextlib
+import json
+import random
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+# Scripts sent to the stand-in import the stand-in substance_painter.
+sys.path.insert(0, str(BENCHMARKS_DIR / "stand_in"))
+
+from substance_painter import _fake  # noqa: E402
+
+PAINTER_ROUTE = "/run.json"
+
+
+@dataclass
+class StandInConfig:
+    """Behavior of the stand-in server.
+
+    Args:
+        latency (float): Extra seconds per script, on top of running it.
+        jitter (float): Random extra seconds per script, 0 to jitter.
+        max_body (int): Largest request body in bytes. Larger requests get a 413 error.
+        fail_rate (float): 0-1 chance a script returns an injected {"error": ...}.
+        drop_rate (float): 0-1 chance the connection is closed without a response.
+        serial (bool): Run one script at a time, like Painter's main thread.
+        seed (int | None): Random seed for jitter and failure injection.
+
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    max_body: int = 64 * 1024 * 1024
+    fail_rate: float = 0.0
+    drop_rate: float = 0.0
+    serial: bool = True
+    seed: int | None = None
+
+
+def run_python(source: str, namespace: dict):
+    """Run a script and return the value of its final expression. None without one."""
+    tree = ast.parse(source, "<remote>")
+    last_expression = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last_expression = ast.Expression(tree.body.pop().value)
+    exec(compile(tree, "<remote>", "exec"), namespace)
+    if last_expression is None:
+        return None
+    return eval(compile(last_expression, "<remote>", "eval"), namespace)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """HTTP server for "/run.json", one thread per connection."""
+
+    daemon_threads = True
+    # Many clients connecting at once shouldn't wait on a full listen queue.
+    request_queue_size = 128
+
+    def __init__(self, address: tuple[str, int], config: StandInConfig) -> None:
+        super().__init__(address, StandInHandler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.script_lock = threading.Lock()
+        # Counts per outcome. Ex. {"ok": 10, "error": 2, "dropped": 1}
+        self.counts: dict[str, int] = {"ok": 0, "error": 0, "dropped": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def chance(self, rate: float) -> bool:
+        """True with a 0-1 probability. Ex. an injected failure"""
+        with self._lock:
+            return self.random.random() < rate
+
+    def execute(self, command: dict):
+        """Run a decoded request. Returns the result, or {"error": ...}."""
+        config = self.config
+        with self._lock:
+            delay = config.latency + self.random.uniform(0, config.jitter)
+        fail = self.chance(config.fail_rate)
+
+        with self.script_lock if config.serial else contextlib.nullcontext():
+            if delay:
+                time.sleep(delay)
+            if fail:
+                return {"error": "Injected failure"}
+            try:
+                if "python" in command:
+                    source = base64.b64decode(command["python"]).decode("utf-8")
+                    return run_python(source, {"__name__": "__remote__"})
+                if "js" in command:
+                    base64.b64decode(command["js"])
+                    return None
+                return {"error": "Expected a \"python\" or \"js\" payload"}
+            except Exception:
+                return {"error": traceback.format_exc()}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Handles "/run.json" POST requests on a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # one line per request would dominate the timings
+
+    def do_POST(self) -> None:
+        if self.path != PAINTER_ROUTE:
+            self.send_json(404, {"error": f"Unknown route: {self.path}"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.server.config.max_body:
+            # The body is not read, so the connection can't be reused.
+            self.server.count("rejected")
+            self.close_connection = True
+            self.send_json(413, {"error": f"Payload too large: {length} bytes"})
+            return
+        body = self.rfile.read(length)
+
+        if self.server.chance(self.server.config.drop_rate):
+            self.server.count("dropped")
+            self.close_connection = True
+            return
+
+        try:
+            command = json.loads(body)
+        except ValueError as e:
+            self.server.count("rejected")
+            self.send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        result = self.server.execute(command)
+        is_error = isinstance(result, dict) and "error" in result
+        self.server.count("error" if is_error else "ok")
+        try:
+            self.send_json(200, result)
+        except TypeError as e:
+            self.send_json(200, {"error": f"Result is not JSON serializable: {e}"})
+
+    def send_json(self, status: int, data) -> None:
+        """Send a JSON response in one write, so small responses aren't delayed."""
+        payload = json.dumps(data).encode("utf-8")
+        header = (
+            f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"{'Connection: close' if self.close_connection else 'Connection: keep-alive'}\r\n\r\n"
+        )
+        self.wfile.write(header.encode("latin-1") + payload)
+
+
+def serve_in_thread(
+    config: StandInConfig | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> StandInServer:
+    """Start a stand-in server in a background thread. Port 0 picks a free port.
+    Stop it with "server.shutdown()".
+    """
+    server = StandInServer((host, port), config or StandInConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    """Run the stand-in server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=60041)
+    parser.add_argument("--latency", type=float, default=0.0, help="Extra seconds per script.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds.")
+    parser.add_argument("--max-body", type=int, default=StandInConfig.max_body)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="0-1 injected errors.")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="0-1 dropped connections.")
+    parser.add_argument("--parallel", action="store_true", help="Run scripts concurrently.")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--layers", type=int, default=10, help="Root layers in the project.")
+    args = parser.parse_args()
+
+    _fake.build_project(layers=args.layers)
+    config = StandInConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        max_body=args.max_body,
+        fail_rate=args.fail_rate,
+        drop_rate=args.drop_rate,
+        serial=not args.parallel,
+        seed=args.seed,
+    )
+    server = StandInServer((args.host, args.port), config)
+    print(f"Stand-in serving {PAINTER_ROUTE} on {args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Requests: {server.counts}")
+
+
+if __name__ == "__main__":
+    main()
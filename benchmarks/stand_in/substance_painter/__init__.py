@@ -0,0 +1,33 @@
+"""Substance Painter API Stand-in
+==================================================
+
+Pure-Python stand-in for the parts of the substance_painter API used by Painter Paladin.
+Models enough state to run and benchmark the plugin logic outside of Painter.
+Use "_fake" to build synthetic projects, add latency and read call counts.
+"""
+
+from . import (
+    _fake,
+    application,
+    colormanagement,
+    event,
+    exception,
+    layerstack,
+    logging,
+    project,
+    resource,
+    textureset,
+)
+
+__all__ = [
+    "_fake",
+    "application",
+    "colormanagement",
+    "event",
+    "exception",
+    "layerstack",
+    "logging",
+    "project",
+    "resource",
+    "textureset",
+]
@@ -0,0 +1,126 @@
+"""Stand-in Controls
+==================================================
+
+Latency, call counting and synthetic project building for the stand-in API.
+Not part of the real substance_painter API.
+"""
+
+import functools
+import time
+from collections import Counter
+
+# Per-call latency in seconds. "search" is applied to resource.search on top of "call".
+LATENCY = {"call": 0.0, "search": 0.0}
+
+# Number of calls per API function, keyed by qualified name. Ex. "layerstack.insert_fill"
+CALLS: Counter = Counter()
+
+# Engine side effects. One recompute and one undo entry per mutation outside a
+# ScopedModification, one of each per outermost ScopedModification otherwise.
+ENGINE = {"recomputes": 0, "undo_steps": 0, "scope_depth": 0, "dirty": False}
+
+# Current project state. Filled by "build_project()".
+PROJECT = {"open": False, "texture_sets": [], "active_stack": None, "name": ""}
+
+
+def configure(call_latency: float = 0.0, search_latency: float = 0.0) -> None:
+    """Set per-call latency in seconds."""
+    LATENCY["call"] = call_latency
+    LATENCY["search"] = search_latency
+
+
+def reset_counts() -> None:
+    """Clear call counts and engine counters."""
+    CALLS.clear()
+    ENGINE.update(recomputes=0, undo_steps=0, scope_depth=0, dirty=False)
+
+
+def total_calls() -> int:
+    """Total number of API calls since last reset."""
+    return sum(CALLS.values())
+
+
+def _wait(seconds: float) -> None:
+    if seconds > 0:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+
+def api(name: str, mutation: bool = False):
+    """Decorate a stand-in API function so it is counted and delayed."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            CALLS[name] += 1
+            _wait(LATENCY["call"])
+            result = func(*args, **kwargs)
+            if mutation:
+                mark_mutation()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def mark_mutation() -> None:
+    """Record an engine mutation."""
+    if ENGINE["scope_depth"]:
+        ENGINE["dirty"] = True
+    else:
+        ENGINE["recomputes"] += 1
+        ENGINE["undo_steps"] += 1
+
+
+def build_project(
+    texture_sets: int = 1,
+    layers: int = 10,
+    channels: int = 4,
+    stacks_per_set: int = 1,
+    name: str = "stand_in_project",
+) -> None:
+    """Create a synthetic open project.
+
+    Args:
+        texture_sets (int): Number of texture sets.
+        layers (int): Number of root fill layers per stack. Every third has a mask,
+            every fifth has a fill effect in its content stack.
+        channels (int): Number of channels per stack, 1-16.
+        stacks_per_set (int): More than one makes a layered (multi-material) texture set.
+        name (str): Project name.
+
+    """
+    from . import layerstack, textureset
+
+    channel_types = list(textureset.ChannelType)[:channels]
+    sets = []
+    for ts_index in range(texture_sets):
+        texture_set = textureset.TextureSet(f"texture_set_{ts_index:02d}")
+        for stack_index in range(stacks_per_set):
+            stack_name = "" if stacks_per_set == 1 else f"material_{stack_index}"
+            stack = textureset.Stack(stack_name, texture_set, channel_types)
+            for layer_index in range(layers):
+                node = layerstack.FillLayerNode(f"layer_{layer_index:04d}", stack)
+                node.active_channels = set(channel_types)
+                if layer_index % 3 == 0:
+                    node._mask = layerstack.MaskBackground.White
+                if layer_index % 5 == 0:
+                    effect = layerstack.FillEffectNode("fill_effect", stack, parent=node)
+                    node._content.append(effect)
+                stack._roots.append(node)
+            texture_set._stacks.append(stack)
+        sets.append(texture_set)
+
+    PROJECT.update(
+        open=True,
+        texture_sets=sets,
+        active_stack=sets[0]._stacks[0] if sets else None,
+        name=name,
+    )
+
+
+def close_project() -> None:
+    """Close the synthetic project."""
+    PROJECT.update(open=False, texture_sets=[], active_stack=None, name="")
@@ -0,0 +1,15 @@
+"""Stand-in for substance_painter.application."""
+
+from ._fake import api
+
+
+@api("application.version_info")
+def version_info() -> tuple[int, int, int]:
+    """Return the emulated Painter version."""
+    return (10, 1, 2)
+
+
+@api("application.version")
+def version() -> str:
+    """Return the emulated Painter version string."""
+    return "10.1.2"
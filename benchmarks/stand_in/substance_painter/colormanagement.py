@@ -0,0 +1,15 @@
+"""Stand-in for substance_painter.colormanagement."""
+
+
+class Color:
+    """RGB color with raw (linear) values."""
+
+    def __init__(self, r: float, g: float, b: float) -> None:
+        self.value_raw = (float(r), float(g), float(b))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Color) and self.value_raw == other.value_raw
+
+    def __repr__(self) -> str:
+        r, g, b = self.value_raw
+        return f"Color({r}, {g}, {b})"
@@ -0,0 +1,76 @@
+"""Stand-in for substance_painter.event."""
+
+
+class Event:
+    """Base event."""
+
+
+class ProjectOpened(Event):
+    """A project was opened."""
+
+
+class ProjectCreated(Event):
+    """A project was created."""
+
+
+class ProjectAboutToClose(Event):
+    """A project is about to close."""
+
+
+class ProjectSaved(Event):
+    """A project was saved."""
+
+
+class ProjectEditionEntered(Event):
+    """The project is ready for edition."""
+
+
+class ProjectEditionLeft(Event):
+    """The project left edition."""
+
+
+class ShelfCrawlingStarted(Event):
+    """A shelf started being crawled."""
+
+    def __init__(self, shelf_name: str = "") -> None:
+        self.shelf_name = shelf_name
+
+
+class ShelfCrawlingEnded(Event):
+    """A shelf finished being crawled."""
+
+    def __init__(self, shelf_name: str = "") -> None:
+        self.shelf_name = shelf_name
+
+
+class LayerStacksModelDataChanged(Event):
+    """The layer stacks changed."""
+
+
+class Dispatcher:
+    """Connect callbacks to event types."""
+
+    def __init__(self) -> None:
+        self._callbacks: dict[type, list] = {}
+
+    def connect(self, event_cls: type, callback) -> None:
+        """Connect a callback to an event type."""
+        self._callbacks.setdefault(event_cls, []).append(callback)
+
+    def connect_strong(self, event_cls: type, callback) -> None:
+        """Connect a callback, keeping a strong reference."""
+        self.connect(event_cls, callback)
+
+    def disconnect(self, event_cls: type, callback) -> None:
+        """Disconnect a callback from an event type."""
+        callbacks = self._callbacks.get(event_cls, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, evt: Event) -> None:
+        """Stand-in only. Deliver an event to connected callbacks."""
+        for callback in list(self._callbacks.get(type(evt), [])):
+            callback(evt)
+
+
+DISPATCHER = Dispatcher()
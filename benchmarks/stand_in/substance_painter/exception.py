@@ -0,0 +1,13 @@
+"""Stand-in for substance_painter.exception."""
+
+
+class ProjectError(RuntimeError):
+    """Raised when no project is open."""
+
+
+class ResourceNotFoundError(RuntimeError):
+    """Raised when a resource cannot be found."""
+
+
+class ServiceNotFoundError(RuntimeError):
+    """Raised when a Painter service is unavailable."""
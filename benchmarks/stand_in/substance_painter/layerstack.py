@@ -0,0 +1,486 @@
+"""Stand-in for substance_painter.layerstack.
+
+Nodes keep their state in plain attributes. Every public method is counted and
+delayed through "_fake.api", and mutating ones mark an engine recompute.
+"""
+
+import itertools
+from enum import Enum
+
+from . import event, textureset
+from ._fake import ENGINE, api, mark_mutation
+from .colormanagement import Color
+from .resource import ResourceID
+
+ChannelType = textureset.ChannelType
+
+_UIDS = itertools.count(1)
+_NODES: dict[int, "Node"] = {}
+
+
+class NodeType(Enum):
+    """Layer and effect node types."""
+
+    PaintLayer = 0
+    FillLayer = 1
+    GroupLayer = 2
+    InstanceLayer = 3
+    FillEffect = 4
+    FilterEffect = 5
+    GeneratorEffect = 6
+    LevelsEffect = 7
+    PaintEffect = 8
+
+
+class NodeStack(Enum):
+    """Sub-stacks a node can be inserted into."""
+
+    Substack = 0
+    Content = 1
+    Mask = 2
+
+
+class BlendingMode(Enum):
+    """Channel blending modes."""
+
+    Disable = 0
+    Replace = 1
+    Multiply = 2
+    Normal = 3
+    Passthrough = 4
+    Overlay = 5
+    Screen = 6
+
+
+class MaskBackground(Enum):
+    """Mask background colors."""
+
+    White = 0
+    Black = 1
+
+
+class ProjectionMode(Enum):
+    """Fill projection modes."""
+
+    Fill = 0
+    UV = 1
+    Triplanar = 2
+    Planar = 3
+
+
+class UVTransformation:
+    """UV transformation of projection parameters."""
+
+    def __init__(self) -> None:
+        self.scale = [1.0, 1.0]
+        self.rotation = 0.0
+        self.offset = [0.0, 0.0]
+
+
+class ProjectionParameters:
+    """Fill projection parameters."""
+
+    def __init__(self) -> None:
+        self.uv_transformation = UVTransformation()
+        self.hardness = 0.0
+
+
+class SourceUniformColor:
+    """Uniform color source."""
+
+    def __init__(self, color: Color) -> None:
+        self._color = color
+
+    @api("layerstack.SourceUniformColor.get_color")
+    def get_color(self) -> Color:
+        """Source color."""
+        return self._color
+
+
+class SourceSubstance:
+    """Substance resource source. Has no color."""
+
+    def __init__(self, resource_id: ResourceID) -> None:
+        self.resource_id = resource_id
+
+
+class ScopedModification:
+    """Group modifications into one undo step and one recompute."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        ENGINE["scope_depth"] += 1
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        ENGINE["scope_depth"] -= 1
+        if ENGINE["scope_depth"] == 0 and ENGINE["dirty"]:
+            ENGINE["dirty"] = False
+            ENGINE["recomputes"] += 1
+            ENGINE["undo_steps"] += 1
+            # Like Painter, listeners hear about the change when the scope closes.
+            event.DISPATCHER.emit(event.LayerStacksModelDataChanged())
+        return False
+
+
+class Node:
+    """Base node."""
+
+    node_type = NodeType.PaintLayer
+
+    def __init__(self, name: str, stack, parent: "Node | None" = None) -> None:
+        self._uid = next(_UIDS)
+        self._name = name
+        self._stack = stack
+        self._parent = parent
+        self._blending: dict = {}
+        self._opacity: dict = {}
+        _NODES[self._uid] = self
+
+    @api("layerstack.Node.uid")
+    def uid(self) -> int:
+        """Node unique id."""
+        return self._uid
+
+    @api("layerstack.Node.get_name")
+    def get_name(self) -> str:
+        """Node name."""
+        return self._name
+
+    @api("layerstack.Node.set_name", mutation=True)
+    def set_name(self, name: str) -> None:
+        """Rename the node."""
+        self._name = name
+
+    @api("layerstack.Node.get_type")
+    def get_type(self) -> NodeType:
+        """Node type."""
+        return self.node_type
+
+    @api("layerstack.Node.get_parent")
+    def get_parent(self) -> "Node | None":
+        """Parent node, None at the root."""
+        return self._parent
+
+    @api("layerstack.Node.get_stack")
+    def get_stack(self):
+        """Stack owning the node."""
+        return self._stack
+
+    @api("layerstack.Node.get_blending_mode")
+    def get_blending_mode(self, channel=None) -> BlendingMode:
+        """Channel blending mode."""
+        return self._blending.get(channel, BlendingMode.Normal)
+
+    @api("layerstack.Node.set_blending_mode", mutation=True)
+    def set_blending_mode(self, mode: BlendingMode, channel=None) -> None:
+        """Set channel blending mode."""
+        self._blending[channel] = mode
+
+    @api("layerstack.Node.get_opacity")
+    def get_opacity(self, channel=None) -> float:
+        """Channel opacity."""
+        return self._opacity.get(channel, 1.0)
+
+    @api("layerstack.Node.set_opacity", mutation=True)
+    def set_opacity(self, opacity: float, channel=None) -> None:
+        """Set channel opacity."""
+        self._opacity[channel] = float(opacity)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Node) and other._uid == self._uid
+
+    def __hash__(self) -> int:
+        return hash(self._uid)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._name!r}, uid={self._uid})"
+
+
+class _FillSourceMixin:
+    """Fill sources and channel activation."""
+
+    def _init_fill(self) -> None:
+        self._active_channels: set = set()
+        self._sources: dict = {}
+        self._material_source = None
+        self._projection_mode = ProjectionMode.UV
+        self._projection = ProjectionParameters()
+
+    @property
+    def active_channels(self) -> set:
+        """Active channels."""
+        _count("layerstack.FillNode.active_channels.get")
+        return set(self._active_channels)
+
+    @active_channels.setter
+    def active_channels(self, channels) -> None:
+        _count("layerstack.FillNode.active_channels.set")
+        self._active_channels = set(channels)
+        # Channels that are turned on get a default color source.
+        for channel in self._active_channels:
+            self._sources.setdefault(channel, SourceUniformColor(Color(0.5, 0.5, 0.5)))
+        mark_mutation()
+
+    @api("layerstack.FillNode.get_source")
+    def get_source(self, channel=None):
+        """Channel source, or the material source when channel is None."""
+        if channel is None:
+            return self._material_source
+        return self._sources.get(channel)
+
+    @api("layerstack.FillNode.set_source", mutation=True)
+    def set_source(self, channel, value) -> None:
+        """Set a color or resource source."""
+        if isinstance(value, Color):
+            source = SourceUniformColor(value)
+        elif isinstance(value, SourceUniformColor):
+            source = value
+        else:
+            source = SourceSubstance(value)
+        if channel is None:
+            self._material_source = source
+        else:
+            self._sources[channel] = source
+
+    @api("layerstack.FillNode.reset_source", mutation=True)
+    def reset_source(self, channel=None) -> None:
+        """Reset a source."""
+        if channel is None:
+            self._material_source = None
+        else:
+            self._sources.pop(channel, None)
+
+    @api("layerstack.FillNode.set_projection_mode", mutation=True)
+    def set_projection_mode(self, mode: ProjectionMode) -> None:
+        """Set projection mode."""
+        self._projection_mode = mode
+
+    @api("layerstack.FillNode.get_projection_mode")
+    def get_projection_mode(self) -> ProjectionMode:
+        """Projection mode."""
+        return self._projection_mode
+
+    @api("layerstack.FillNode.get_projection_parameters")
+    def get_projection_parameters(self) -> ProjectionParameters:
+        """Projection parameters."""
+        return self._projection
+
+    @api("layerstack.FillNode.set_projection_parameters", mutation=True)
+    def set_projection_parameters(self, params: ProjectionParameters) -> None:
+        """Set projection parameters."""
+        self._projection = params
+
+
+def _count(name: str) -> None:
+    api(name)(lambda: None)()
+
+
+class LayerNode(Node):
+    """Layer with mask and effect stacks."""
+
+    def __init__(self, name: str, stack, parent: "Node | None" = None) -> None:
+        super().__init__(name, stack, parent)
+        self._mask: MaskBackground | None = None
+        self._content: list[Node] = []
+        self._mask_effects: list[Node] = []
+
+    @api("layerstack.LayerNode.has_mask")
+    def has_mask(self) -> bool:
+        """Whether the layer has a mask."""
+        return self._mask is not None
+
+    @api("layerstack.LayerNode.add_mask", mutation=True)
+    def add_mask(self, background: MaskBackground) -> None:
+        """Add a mask."""
+        if self._mask is not None:
+            raise ValueError(f"{self._name} already has a mask")
+        self._mask = background
+
+    @api("layerstack.LayerNode.remove_mask", mutation=True)
+    def remove_mask(self) -> None:
+        """Remove the mask and its effects."""
+        self._mask = None
+        self._mask_effects.clear()
+
+    @api("layerstack.LayerNode.get_mask_background")
+    def get_mask_background(self) -> MaskBackground:
+        """Mask background."""
+        if self._mask is None:
+            raise ValueError(f"{self._name} has no mask")
+        return self._mask
+
+    @api("layerstack.LayerNode.set_mask_background", mutation=True)
+    def set_mask_background(self, background: MaskBackground) -> None:
+        """Set mask background."""
+        if self._mask is None:
+            raise ValueError(f"{self._name} has no mask")
+        self._mask = background
+
+    @api("layerstack.LayerNode.content_effects")
+    def content_effects(self) -> list[Node]:
+        """Effects in the content stack."""
+        return list(self._content)
+
+    @api("layerstack.LayerNode.mask_effects")
+    def mask_effects(self) -> list[Node]:
+        """Effects in the mask stack."""
+        return list(self._mask_effects)
+
+
+class FillLayerNode(_FillSourceMixin, LayerNode):
+    """Fill layer."""
+
+    node_type = NodeType.FillLayer
+
+    def __init__(self, name: str, stack, parent: "Node | None" = None) -> None:
+        super().__init__(name, stack, parent)
+        self._init_fill()
+
+
+class PaintLayerNode(LayerNode):
+    """Paint layer."""
+
+    node_type = NodeType.PaintLayer
+
+
+class GroupLayerNode(LayerNode):
+    """Group layer."""
+
+    node_type = NodeType.GroupLayer
+
+    def __init__(self, name: str, stack, parent: "Node | None" = None) -> None:
+        super().__init__(name, stack, parent)
+        self._sub_layers: list[Node] = []
+
+    @api("layerstack.GroupLayerNode.sub_layers")
+    def sub_layers(self) -> list[Node]:
+        """Child layers."""
+        return list(self._sub_layers)
+
+
+class EffectNode(Node):
+    """Base effect."""
+
+
+class FillEffectNode(_FillSourceMixin, EffectNode):
+    """Fill effect."""
+
+    node_type = NodeType.FillEffect
+
+    def __init__(self, name: str, stack, parent: "Node | None" = None) -> None:
+        super().__init__(name, stack, parent)
+        self._init_fill()
+
+
+class PaintEffectNode(EffectNode):
+    """Paint effect."""
+
+    node_type = NodeType.PaintEffect
+
+
+class InsertPosition:
+    """Where to insert a new node."""
+
+    def __init__(self, container: list, index: int, stack, parent, kind: str) -> None:
+        self._container = container
+        self._index = index
+        self._stack = stack
+        self._parent = parent
+        self._kind = kind  # "layer" or "effect"
+
+    @staticmethod
+    def _siblings(node: Node) -> tuple[list, str]:
+        parent = node._parent
+        if parent is None:
+            return node._stack._roots, "layer"
+        if isinstance(node, EffectNode):
+            container = parent._mask_effects if node in parent._mask_effects else parent._content
+            return container, "effect"
+        return parent._sub_layers, "layer"
+
+    @classmethod
+    def above_node(cls, node: Node) -> "InsertPosition":
+        """Above a node, in the same stack."""
+        _count("layerstack.InsertPosition.above_node")
+        container, kind = cls._siblings(node)
+        return cls(container, container.index(node), node._stack, node._parent, kind)
+
+    @classmethod
+    def below_node(cls, node: Node) -> "InsertPosition":
+        """Below a node, in the same stack."""
+        _count("layerstack.InsertPosition.below_node")
+        container, kind = cls._siblings(node)
+        return cls(container, container.index(node) + 1, node._stack, node._parent, kind)
+
+    @classmethod
+    def inside_node(cls, node: Node, node_stack: NodeStack) -> "InsertPosition":
+        """At the top of one of a node's stacks."""
+        _count("layerstack.InsertPosition.inside_node")
+        if node_stack == NodeStack.Substack:
+            return cls(node._sub_layers, 0, node._stack, node, "layer")
+        if node_stack == NodeStack.Mask:
+            if node._mask is None:
+                raise ValueError(f"{node._name} has no mask")
+            return cls(node._mask_effects, 0, node._stack, node, "effect")
+        return cls(node._content, 0, node._stack, node, "effect")
+
+    @classmethod
+    def from_textureset_stack(cls, stack) -> "InsertPosition":
+        """At the top of a stack."""
+        _count("layerstack.InsertPosition.from_textureset_stack")
+        return cls(stack._roots, 0, stack, None, "layer")
+
+
+def _insert(position: InsertPosition, layer_cls, effect_cls, name: str) -> Node:
+    node_cls = layer_cls if position._kind == "layer" else effect_cls
+    node = node_cls(name, position._stack, position._parent)
+    position._container.insert(position._index, node)
+    return node
+
+
+@api("layerstack.insert_fill", mutation=True)
+def insert_fill(position: InsertPosition) -> Node:
+    """Insert a fill layer or fill effect."""
+    return _insert(position, FillLayerNode, FillEffectNode, "Fill")
+
+
+@api("layerstack.insert_paint", mutation=True)
+def insert_paint(position: InsertPosition) -> Node:
+    """Insert a paint layer or paint effect."""
+    return _insert(position, PaintLayerNode, PaintEffectNode, "Paint")
+
+
+@api("layerstack.insert_group", mutation=True)
+def insert_group(position: InsertPosition) -> Node:
+    """Insert a group layer."""
+    if position._kind != "layer":
+        raise ValueError("Groups can only be inserted in layer stacks")
+    return _insert(position, GroupLayerNode, GroupLayerNode, "Folder")
+
+
+@api("layerstack.get_selected_nodes")
+def get_selected_nodes(stack) -> list[Node]:
+    """Selected nodes of a stack."""
+    return list(stack._selection)
+
+
+@api("layerstack.set_selected_nodes")
+def set_selected_nodes(nodes: list[Node]) -> None:
+    """Select nodes. All nodes must belong to the same stack."""
+    if nodes:
+        nodes[0]._stack._selection = list(nodes)
+
+
+@api("layerstack.get_root_layer_nodes")
+def get_root_layer_nodes(stack) -> list[Node]:
+    """Root layers of a stack."""
+    return list(stack._roots)
+
+
+@api("layerstack.get_node_by_uid")
+def get_node_by_uid(uid: int) -> Node:
+    """Node from a uid."""
+    return _NODES[uid]
@@ -0,0 +1,33 @@
+"""Stand-in for substance_painter.logging.
+
+Records are kept in RECORDS instead of the Log Window. Set ECHO to also print them.
+"""
+
+from ._fake import api
+
+RECORDS: list[tuple[str, str]] = []
+ECHO = False
+
+
+def _log(level: str, message: str) -> None:
+    RECORDS.append((level, message))
+    if ECHO:
+        print(f"[{level}] {message}")
+
+
+@api("logging.info")
+def info(message: str) -> None:
+    """Log an info message."""
+    _log("INFO", message)
+
+
+@api("logging.warning")
+def warning(message: str) -> None:
+    """Log a warning message."""
+    _log("WARNING", message)
+
+
+@api("logging.error")
+def error(message: str) -> None:
+    """Log an error message."""
+    _log("ERROR", message)
@@ -0,0 +1,42 @@
+"""Stand-in for substance_painter.project."""
+
+from . import event
+from ._fake import PROJECT, api, build_project, close_project
+
+
+@api("project.is_open")
+def is_open() -> bool:
+    """Whether a project is open."""
+    return PROJECT["open"]
+
+
+@api("project.name")
+def name() -> str:
+    """Open project name."""
+    return PROJECT["name"]
+
+
+@api("project.file_path")
+def file_path() -> str:
+    """Open project file path."""
+    return f"/stand_in/{PROJECT['name']}.spp"
+
+
+@api("project.open")
+def open(path: str) -> None:  # noqa: A001
+    """Open a synthetic project named after the file."""
+    build_project(name=path.replace("\\", "/").rsplit("/", 1)[-1].removesuffix(".spp"))
+    event.DISPATCHER.emit(event.ProjectOpened())
+
+
+@api("project.save")
+def save(mode=None) -> None:
+    """Pretend to save."""
+    event.DISPATCHER.emit(event.ProjectSaved())
+
+
+@api("project.close")
+def close() -> None:
+    """Close the synthetic project."""
+    event.DISPATCHER.emit(event.ProjectAboutToClose())
+    close_project()
@@ -0,0 +1,85 @@
+"""Stand-in for substance_painter.resource.
+
+The shelf is a flat list of resources. "search" scans the whole list and pays
+"_fake.LATENCY['search']" on top of the regular call latency.
+"""
+
+from ._fake import LATENCY, _wait, api
+
+
+class ResourceID:
+    """Resource identifier."""
+
+    def __init__(self, context: str, name: str) -> None:
+        self.context = context
+        self.name = name
+
+    def url(self) -> str:
+        """Resource url."""
+        return f"resource://{self.context}/{self.name}"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ResourceID) and self.url() == other.url()
+
+    def __hash__(self) -> int:
+        return hash(self.url())
+
+    def __repr__(self) -> str:
+        return f"ResourceID({self.url()!r})"
+
+
+class Resource:
+    """Shelf resource."""
+
+    def __init__(self, shelf: str, usage: str, name: str) -> None:
+        self._shelf = shelf
+        self._usage = usage
+        self._name = name
+        self._id = ResourceID(shelf, name)
+
+    @api("resource.Resource.identifier")
+    def identifier(self) -> ResourceID:
+        """Resource identifier."""
+        return self._id
+
+    @api("resource.Resource.gui_name")
+    def gui_name(self) -> str:
+        """Resource display name."""
+        return self._name
+
+
+SHELF: list[Resource] = [
+    Resource("starterassets", "procedural", "Clouds 1"),
+    Resource("starterassets", "procedural", "Clouds 2"),
+    Resource("starterassets", "procedural", "White Noise"),
+    Resource("starterassets", "generator", "Curvature"),
+    Resource("starterassets", "generator", "Position"),
+    Resource("starterassets", "generator", "Light"),
+    Resource("starterassets", "generator", "Dirt"),
+]
+
+
+def _matches(res: Resource, query: str) -> bool:
+    for term in query.split(" "):
+        if term.startswith("s:"):
+            if res._shelf != term[2:]:
+                return False
+        elif term.startswith("u:"):
+            if res._usage != term[2:]:
+                return False
+        elif term.startswith("n:"):
+            if not res._name.startswith(term[2:]):
+                return False
+    words = [t for t in query.split(" ") if ":" not in t]
+    return all(w.lower() in res._name.lower() for w in words)
+
+
+@api("resource.search")
+def search(query: str) -> list[Resource]:
+    """Search the shelf. Supports "s:", "u:" and "n:" filters and free words."""
+    _wait(LATENCY["search"])
+    # Terms after "n:" belong to the name. Ex. "n:White Noise"
+    if "n:" in query:
+        head, name = query.split("n:", 1)
+        return [r for r in SHELF if _matches(r, head.strip()) and r._name.startswith(name)]
+    return [r for r in SHELF if _matches(r, query)]
@@ -0,0 +1,145 @@
+"""Stand-in for substance_painter.textureset."""
+
+from enum import Enum
+
+from . import exception
+from ._fake import PROJECT, api
+
+
+class ChannelType(Enum):
+    """Stack channel types. Order matters for "_fake.build_project(channels=...)"."""
+
+    BaseColor = 0
+    Roughness = 1
+    Metallic = 2
+    Normal = 3
+    Height = 4
+    Opacity = 5
+    Emissive = 6
+    AO = 7
+    Specular = 8
+    Glossiness = 9
+    Displacement = 10
+    Transmissive = 11
+    Scattering = 12
+    User0 = 13
+    User1 = 14
+    User2 = 15
+
+
+class Channel:
+    """Stack channel."""
+
+    def __init__(self, channel_type: ChannelType) -> None:
+        self._type = channel_type
+
+    def type(self) -> ChannelType:
+        """Channel type."""
+        return self._type
+
+
+class TextureSet:
+    """Texture set holding one stack, or several for layered materials."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._stacks: list[Stack] = []
+
+    @api("textureset.TextureSet.name")
+    def name(self) -> str:
+        """Texture set name."""
+        return self._name
+
+    @api("textureset.TextureSet.all_stacks")
+    def all_stacks(self) -> list["Stack"]:
+        """All stacks of the texture set."""
+        return list(self._stacks)
+
+    @api("textureset.TextureSet.is_layered_material")
+    def is_layered_material(self) -> bool:
+        """Whether the texture set has more than one stack."""
+        return len(self._stacks) > 1
+
+    @api("textureset.TextureSet.get_stack")
+    def get_stack(self, stack_name: str = "") -> "Stack":
+        """Get a stack by name."""
+        for stack in self._stacks:
+            if stack._name == stack_name:
+                return stack
+        raise ValueError(f"No stack named {stack_name!r}")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TextureSet) and other._name == self._name
+
+    def __hash__(self) -> int:
+        return hash(self._name)
+
+
+class Stack:
+    """Layer stack of a texture set."""
+
+    def __init__(self, name: str, texture_set: TextureSet, channels: list[ChannelType]) -> None:
+        self._name = name
+        self._texture_set = texture_set
+        self._channels = {ct: Channel(ct) for ct in channels}
+        self._roots: list = []
+        self._selection: list = []
+
+    @api("textureset.Stack.name")
+    def name(self) -> str:
+        """Stack name. Empty unless the texture set is a layered material."""
+        return self._name
+
+    @api("textureset.Stack.material")
+    def material(self) -> TextureSet:
+        """Texture set owning this stack."""
+        return self._texture_set
+
+    @api("textureset.Stack.all_channels")
+    def all_channels(self) -> dict[ChannelType, Channel]:
+        """All channels of the stack."""
+        return dict(self._channels)
+
+    @api("textureset.Stack.has_channel")
+    def has_channel(self, channel_type: ChannelType) -> bool:
+        """Whether the stack has a channel."""
+        return channel_type in self._channels
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Stack)
+            and other._texture_set == self._texture_set
+            and other._name == self._name
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._texture_set._name, self._name))
+
+    def __repr__(self) -> str:
+        return f"Stack({self._texture_set._name!r}, {self._name!r})"
+
+
+def _require_project() -> None:
+    if not PROJECT["open"]:
+        raise exception.ProjectError("No project is open")
+
+
+@api("textureset.get_active_stack")
+def get_active_stack() -> Stack:
+    """Active stack."""
+    _require_project()
+    return PROJECT["active_stack"]
+
+
+@api("textureset.set_active_stack")
+def set_active_stack(stack: Stack) -> None:
+    """Set the active stack."""
+    _require_project()
+    PROJECT["active_stack"] = stack
+
+
+@api("textureset.all_texture_sets")
+def all_texture_sets() -> list[TextureSet]:
+    """All texture sets of the project."""
+    _require_project()
+    return list(PROJECT["texture_sets"])
@@ -0,0 +1,288 @@
+"""Painter Paladin API Index
+==================================================
+
+Searchable index of the substance_painter API: modules, classes, functions, methods,
+properties and enum members, with signatures and docstrings.
+Built once per session by walking the loaded API modules, then saved to
+"~/.painter_paladin/api_index_<painter version>.json", so later sessions only load it.
+
+Search terms, separated by spaces. All terms must match. Case insensitive.
+    c:<class>     Members of a class and of its API base classes. Ex. "c:FillLayerNode"
+    k:<kind>      Entry kind. Ex. "k:function", "k:method", "k:enum", "k:member"
+    <word>        Name contains word, or else the first docstring line does.
+"""
+
+import inspect
+import json
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+
+import substance_painter as sp
+
+DEFAULT_CACHE_DIR = Path.home() / ".painter_paladin"
+# Bump when entries change shape, so older cache files are built again.
+INDEX_FORMAT = 1
+# Results returned per search. Typing narrows them down.
+MAX_RESULTS = 200
+
+
+@dataclass
+class ApiEntry:
+    """One indexed API name.
+
+    Args:
+        name (str): Name under substance_painter. Ex. "layerstack.FillLayerNode.set_source"
+        kind (str): "module", "class", "enum", "function", "method", "property",
+            "member" or "attribute".
+        signature (str): Ex. "(channel_type, source)". Value for attributes and enum members.
+        doc (str): Docstring. Empty without one.
+
+    """
+
+    name: str
+    kind: str
+    signature: str = ""
+    doc: str = ""
+
+    @property
+    def summary(self) -> str:
+        """First docstring line."""
+        return self.doc.strip().partition("\n")[0]
+
+
+def api_name(cls: type) -> str:
+    """Class name under substance_painter. Ex. "layerstack.FillLayerNode" """
+    module = cls.__module__.removeprefix(f"{sp.__name__}.")
+    return f"{module}.{cls.__qualname__}"
+
+
+def is_api(value) -> bool:
+    """Whether a class or function is defined in the substance_painter package."""
+    module = getattr(value, "__module__", None) or ""
+    return module == sp.__name__ or module.startswith(f"{sp.__name__}.")
+
+
+def signature(value) -> str:
+    """Call signature. Ex. "(self, opacity: float) -> None" """
+    try:
+        return str(inspect.signature(value))
+    except (TypeError, ValueError):
+        pass
+    # Compiled functions often start their docstring with it. Ex. "set_opacity(self, ...)"
+    first_line = (getattr(value, "__doc__", None) or "").strip().partition("\n")[0]
+    name = getattr(value, "__name__", "")
+    if name and first_line.startswith(f"{name}("):
+        return first_line[len(name) :]
+    return ""
+
+
+def _member_entry(name: str, value, owner: type) -> ApiEntry:
+    """Entry for one class attribute."""
+    if isinstance(value, property):
+        return ApiEntry(name, "property", "", inspect.getdoc(value) or "")
+    if isinstance(value, staticmethod | classmethod):
+        value = value.__func__
+    if isinstance(value, owner):
+        return ApiEntry(name, "member", f" = {value!r}", "")
+    if callable(value):
+        return ApiEntry(name, "method", signature(value), inspect.getdoc(value) or "")
+    return ApiEntry(name, "attribute", f" = {value!r}"[:120], "")
+
+
+# ---------------------------------------------------------- #
+# Index.
+
+
+class ApiIndex:
+    """Searchable substance_painter API index. Loaded or built on the first search.
+
+    Args:
+        cache_dir (Path | None): Folder of the cache file. None to always build.
+
+    """
+
+    def __init__(self, cache_dir: Path | None = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self.entries: list[ApiEntry] = []
+        # API base classes per class name, nearest first.
+        self.bases: dict[str, list[str]] = {}
+        # "cache" or "built". Empty until loaded.
+        self.source = ""
+        self.load_time = 0.0
+        self._loaded = False
+        # Lowercase names and summaries, for search.
+        self._names: list[str] = []
+        self._summaries: list[str] = []
+
+    @property
+    def cache_path(self) -> Path | None:
+        """Cache file for this Painter version. Ex. "api_index_10.1.2.json" """
+        if self.cache_dir is None:
+            return None
+        version = ".".join(str(part) for part in sp.application.version_info())
+        return self.cache_dir / f"api_index_{version}.json"
+
+    def ensure_loaded(self) -> None:
+        """Load the index on first use."""
+        if not self._loaded:
+            self.load()
+
+    def load(self) -> None:
+        """Load the index from the cache file, or build and save it."""
+        start_time = time.perf_counter()
+        if not self._load_cache():
+            self.build()
+            self._save_cache()
+        self._loaded = True
+        self.load_time = time.perf_counter() - start_time
+
+    def build(self) -> None:
+        """Walk the loaded substance_painter modules."""
+        self.entries, self.bases = [], {}
+        self._names, self._summaries = [], []
+        for module_name, module in sorted(vars(sp).items()):
+            if module_name.startswith("_") or not inspect.ismodule(module):
+                continue
+            self._add(ApiEntry(module_name, "module", "", inspect.getdoc(module) or ""))
+            for name, value in sorted(vars(module).items()):
+                if name.startswith("_") or inspect.ismodule(value):
+                    continue
+                if inspect.isclass(value):
+                    if is_api(value):
+                        self.add_class(value)
+                elif callable(value):
+                    if is_api(value):
+                        entry_name = f"{module_name}.{name}"
+                        doc = inspect.getdoc(value) or ""
+                        self._add(ApiEntry(entry_name, "function", signature(value), doc))
+                else:
+                    value_text = f" = {value!r}"[:120]
+                    self._add(ApiEntry(f"{module_name}.{name}", "attribute", value_text))
+        self.source = "built"
+
+    def add_class(self, cls: type) -> str:
+        """Index a class, its members and its API base classes, unless already indexed.
+        Ex. the selected node's class, if its module doesn't list it.
+
+        Returns:
+            str: Class name under substance_painter.
+
+        """
+        class_name = api_name(cls)
+        if class_name in self.bases:
+            return class_name
+        bases = [base for base in cls.__mro__[1:] if is_api(base)]
+        self.bases[class_name] = [api_name(base) for base in bases]
+        kind = "enum" if issubclass(cls, Enum) else "class"
+        self._add(ApiEntry(class_name, kind, signature(cls), inspect.getdoc(cls) or ""))
+
+        members = dict(vars(cls))
+        if issubclass(cls, Enum):
+            members.update(cls.__members__)
+        for name, value in sorted(members.items()):
+            if name.startswith("_"):
+                continue
+            entry = _member_entry(name, value, cls)
+            entry.name = f"{class_name}.{name}"
+            self._add(entry)
+
+        for base in bases:
+            self.add_class(base)
+        return class_name
+
+    def search(self, text: str, limit: int = MAX_RESULTS) -> list[ApiEntry]:
+        """Entries matching a query, best first. Ex. "c:FillLayerNode source"
+
+        Args:
+            text (str): Search terms. See module docstring.
+            limit (int): Most entries returned.
+
+        """
+        self.ensure_loaded()
+
+        # Base class distance per class, for "c:". Own members are listed first.
+        owners: dict[str, int] | None = None
+        kind = ""
+        words = []
+        for term in text.lower().split():
+            prefix, _, value = term.partition(":")
+            if prefix == "c" and value:
+                owners = {}
+                for class_name, bases in self.bases.items():
+                    lower_name = class_name.lower()
+                    if value in (lower_name, lower_name.rpartition(".")[2]):
+                        for distance, owner in enumerate([class_name, *bases]):
+                            owners.setdefault(owner, distance)
+            elif prefix == "k" and value:
+                kind = value
+            else:
+                words.append(term)
+
+        ranked = []
+        for index, entry in enumerate(self.entries):
+            distance = 0
+            if owners is not None:
+                # The class itself, or a member of it or of a base class.
+                distance = owners.get(entry.name, owners.get(entry.name.rpartition(".")[0], -1))
+                if distance < 0:
+                    continue
+            if kind and entry.kind != kind:
+                continue
+            name = self._names[index]
+            rank = 0
+            for word in words:
+                if word in name:
+                    short_name = name.rpartition(".")[2]
+                    rank += 0 if short_name == word else 1 if short_name.startswith(word) else 2
+                elif word in self._summaries[index]:
+                    rank += 4
+                else:
+                    break
+            else:
+                ranked.append((rank, distance, len(entry.name), index))
+        ranked.sort()
+        return [self.entries[ranked_entry[-1]] for ranked_entry in ranked[:limit]]
+
+    def _add(self, entry: ApiEntry) -> None:
+        self.entries.append(entry)
+        self._names.append(entry.name.lower())
+        self._summaries.append(entry.summary.lower())
+
+    def _load_cache(self) -> bool:
+        """Read the cache file. False if there is none or it can't be used."""
+        path = self.cache_path
+        if path is None or not path.is_file():
+            return False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("format") != INDEX_FORMAT:
+                return False
+            entries = [ApiEntry(**entry) for entry in data["entries"]]
+            bases = {name: list(class_bases) for name, class_bases in data["bases"].items()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            sp.logging.warning(f"API index cache not used, building it again: {e}")
+            return False
+
+        self.entries, self.bases = [], bases
+        self._names, self._summaries = [], []
+        for entry in entries:
+            self._add(entry)
+        self.source = "cache"
+        return True
+
+    def _save_cache(self) -> None:
+        path = self.cache_path
+        if path is None:
+            return
+        data = {
+            "format": INDEX_FORMAT,
+            "entries": [asdict(entry) for entry in self.entries],
+            "bases": self.bases,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            sp.logging.warning(f"API index cache not saved: {e}")
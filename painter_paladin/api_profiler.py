@@ -0,0 +1,250 @@
+"""Painter Paladin API Profiler
+==================================================
+
+Opt-in timing of Substance Painter API calls and plugin actions.
+While enabled, public functions of the API modules and methods of their classes are
+wrapped with timers. Disabling puts the original functions back, so it costs nothing when off.
+
+Ex. session.profiler.enable(), click some buttons, session.profiler.dump()
+"""
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import substance_painter as sp
+
+# API modules wrapped while profiling. Missing modules are ignored.
+PROFILED_MODULES = (
+    "application",
+    "colormanagement",
+    "layerstack",
+    "logging",
+    "project",
+    "resource",
+    "textureset",
+    "ui",
+)
+
+
+@dataclass
+class CallStats:
+    """Timing of one API function or plugin action.
+
+    Args:
+        count (int): Number of calls.
+        total_time (float): Cumulative seconds.
+        max_time (float): Slowest single call, in seconds.
+        api_calls (int): API calls made inside. Only counted for plugin actions.
+
+    """
+
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    api_calls: int = 0
+
+    def record(self, elapsed: float) -> None:
+        """Add one call that took "elapsed" seconds."""
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+
+def _is_api(member) -> bool:
+    """Whether a function or class is defined by the Substance Painter API."""
+    return "substance_painter" in (getattr(member, "__module__", None) or "")
+
+
+class ApiProfiler:
+    """Call counts and latency per API function, and total time per plugin action."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.api_calls = 0
+        self._api_stats: dict[str, CallStats] = {}
+        self._action_stats: dict[str, CallStats] = {}
+        # (owner, attribute name, original attribute) to restore on "disable()"
+        self._patched: list[tuple] = []
+
+    # ---------------------------------------------------------- #
+    # Queries.
+
+    def api_stats(self) -> dict[str, CallStats]:
+        """Stats per API function, slowest cumulative first. Ex. "resource.search" """
+        return dict(
+            sorted(self._api_stats.items(), key=lambda item: item[1].total_time, reverse=True),
+        )
+
+    def action_stats(self) -> dict[str, CallStats]:
+        """Stats per plugin action, slowest cumulative first. Ex. "set_opacity" """
+        return dict(
+            sorted(self._action_stats.items(), key=lambda item: item[1].total_time, reverse=True),
+        )
+
+    def report(self, limit: int = 20) -> list[str]:
+        """Report lines for the Log Window.
+
+        Args:
+            limit (int): Max number of API functions listed.
+
+        Returns:
+            list[str]: Action lines, then API function lines.
+
+        """
+        lines = [f"API Profiler: {self.api_calls} API calls recorded."]
+        for name, stats in self.action_stats().items():
+            lines.append(
+                f"Action {name}: {stats.count} runs, {stats.total_time * 1000:.1f} ms total, "
+                f"{stats.max_time * 1000:.1f} ms max, {stats.api_calls} API calls",
+            )
+        for name, stats in list(self.api_stats().items())[:limit]:
+            lines.append(
+                f"{name}: {stats.count} calls, {stats.total_time * 1000:.2f} ms total, "
+                f"{stats.max_time * 1000:.2f} ms max",
+            )
+        return lines
+
+    def dump(self) -> None:
+        """Log the report to the Log Window."""
+        if not self._api_stats and not self._action_stats:
+            sp.logging.info("API Profiler: Nothing recorded. Enable it and run some actions.")
+            return
+        # Built before logging, so the dump's own logging calls are not in it.
+        for line in self.report():
+            sp.logging.info(line)
+
+    def reset(self) -> None:
+        """Forget all recorded stats."""
+        self.api_calls = 0
+        self._api_stats.clear()
+        self._action_stats.clear()
+
+    # ---------------------------------------------------------- #
+    # Enable/ disable.
+
+    def enable(self) -> None:
+        """Wrap API functions and class methods with timers."""
+        if self.enabled:
+            return
+        seen = set()
+        for module_name in PROFILED_MODULES:
+            module = getattr(sp, module_name, None)
+            if module is None:
+                continue
+            for name, member in list(vars(module).items()):
+                # Skip private names and names imported from outside the API.
+                if name.startswith("_") or not _is_api(member):
+                    continue
+                if inspect.isclass(member):
+                    self._patch_class(member, seen)
+                elif inspect.isroutine(member):
+                    self._patch(module, name, member, f"{module_name}.{name}")
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Put the original API functions back. Recorded stats are kept."""
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+        self.enabled = False
+
+    def toggle(self) -> bool:
+        """Enable if disabled, disable if enabled.
+
+        Returns:
+            bool: Whether the profiler is now enabled.
+
+        """
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    @contextmanager
+    def action(self, name: str):
+        """Time a plugin action and count the API calls made inside it.
+
+        Args:
+            name (str): Action name. Ex. "set_opacity"
+
+        """
+        if not self.enabled:
+            yield
+            return
+        api_calls = self.api_calls
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self._action_stats.setdefault(name, CallStats())
+            stats.record(time.perf_counter() - start)
+            stats.api_calls += self.api_calls - api_calls
+
+    # ---------------------------------------------------------- #
+    # Wrapping.
+
+    def _patch_class(self, cls: type, seen: set) -> None:
+        """Wrap methods and properties of an API class and its API base classes."""
+        # Enums and exceptions have nothing worth timing.
+        if hasattr(cls, "__members__") or issubclass(cls, BaseException):
+            return
+        for klass in cls.__mro__:
+            if not _is_api(klass):
+                continue
+            module_name = klass.__module__.rpartition(".")[2]
+            for name, attribute in list(vars(klass).items()):
+                if name.startswith("_") or (klass, name) in seen:
+                    continue
+                seen.add((klass, name))
+                key = f"{module_name}.{klass.__name__}.{name}"
+                if isinstance(attribute, property):
+                    self._patch_property(klass, name, attribute, key)
+                elif isinstance(attribute, staticmethod | classmethod):
+                    wrapped = type(attribute)(self._timed(attribute.__func__, key))
+                    self._replace(klass, name, attribute, wrapped)
+                elif inspect.isroutine(attribute):
+                    self._patch(klass, name, attribute, key)
+
+    def _patch_property(self, owner: type, name: str, prop: property, key: str) -> None:
+        """Wrap the getter and setter of a property. Ex. "active_channels" assignment"""
+        wrapped = property(
+            self._timed(prop.fget, key) if prop.fget else None,
+            self._timed(prop.fset, f"{key} (set)") if prop.fset else None,
+            prop.fdel,
+            prop.__doc__,
+        )
+        self._replace(owner, name, prop, wrapped)
+
+    def _patch(self, owner, name: str, func, key: str) -> None:
+        self._replace(owner, name, func, self._timed(func, key))
+
+    def _replace(self, owner, name: str, original, wrapped) -> None:
+        try:
+            setattr(owner, name, wrapped)
+        except (AttributeError, TypeError):
+            return  # read-only attribute, left untimed
+        self._patched.append((owner, name, original))
+
+    def _timed(self, func, key: str):
+        """Wrap a function so each call is recorded under "key"."""
+        api_stats = self._api_stats
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats = api_stats.get(key)
+                if stats is None:
+                    stats = api_stats[key] = CallStats()
+                stats.record(elapsed)
+                self.api_calls += 1
+
+        return timed
@@ -0,0 +1,132 @@
+"""Painter Paladin Batch Engine
+==================================================
+
+Collects the planned layer stack mutations of an action and applies them together.
+Applied inside one "ScopedModification" per stack, so each stack recomputes once per action.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import substance_painter as sp
+
+
+@dataclass
+class Mutation:
+    """A planned API call.
+
+    Args:
+        func (Callable): API function or bound method to call. Ex. node.set_opacity
+        args (tuple): Positional arguments for the call.
+        structural (bool): Adds, removes or moves nodes. Ex. inserting a fill effect
+
+    """
+
+    func: Callable
+    args: tuple = ()
+    structural: bool = False
+
+    @property
+    def node(self):
+        """Node the call changes. The bound node, or the first argument. None if neither."""
+        target = getattr(self.func, "__self__", None)
+        if hasattr(target, "uid"):
+            return target
+        if self.args and hasattr(self.args[0], "uid"):
+            return self.args[0]
+        return None
+
+    def apply(self) -> None:
+        """Call the planned function."""
+        self.func(*self.args)
+
+
+class ActionBatch:
+    """Planned mutations for one plugin action.
+
+    Plan with "add()", then "apply()" once everything for the action is collected.
+    Mutations are grouped by stack, one scoped modification per group.
+    Writes that would not change anything are counted with "skip()" instead.
+    """
+
+    # While set, "apply()" adds its counts here instead of logging a summary.
+    # Ex. a macro replay logs one summary for all of its steps.
+    totals: "ActionBatch | None" = None
+    # While set, "apply()" reports the changes of each group here, as
+    # (group, changed node uids, structural). Ex. the session updates its stack index.
+    changes: Callable[[str, set[int], bool], None] | None = None
+
+    def __init__(self, action_name: str) -> None:
+        """Initialize an empty batch.
+
+        Args:
+            action_name (str): Shown in the undo history and the summary line.
+                Ex. "Set Opacity"
+
+        """
+        self.action_name = action_name
+        self.applied = 0
+        self.applied_groups = 0
+        self.skipped = 0
+        self._groups: dict[str, list[Mutation]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(mutations) for mutations in self._groups.values())
+
+    def add(self, func: Callable, *args, group: str = "", structural: bool = False) -> None:
+        """Plan a mutation. Nothing is applied until "apply()".
+
+        Args:
+            func (Callable): API function or bound method. Ex. node.set_opacity
+            *args: Arguments for the call. Ex. 0.5, channel
+            group (str): Stack the mutation belongs to. Ex. "body/material_1"
+            structural (bool): The call adds, removes or moves nodes.
+
+        """
+        self._groups.setdefault(group, []).append(Mutation(func, args, structural))
+
+    def skip(self, count: int = 1) -> None:
+        """Count planned writes skipped because the node already has the value.
+
+        Args:
+            count (int): Number of skipped writes.
+
+        """
+        self.skipped += count
+
+    def apply(self) -> int:
+        """Apply all planned mutations, one scoped modification per group.
+
+        Returns:
+            int: Number of mutations applied.
+
+        """
+        for group, mutations in self._groups.items():
+            # Reported first. Painter sends its layer stack event when the scope closes.
+            if ActionBatch.changes is not None:
+                nodes = [mutation.node for mutation in mutations]
+                structural = any(m.structural for m in mutations) or None in nodes
+                uids = {node.uid() for node in nodes if node is not None}
+                ActionBatch.changes(group, uids, structural)
+            with sp.layerstack.ScopedModification(self.action_name):
+                for mutation in mutations:
+                    mutation.apply()
+                    self.applied += 1
+            self.applied_groups += 1
+        self._groups.clear()
+
+        if ActionBatch.totals is not None:
+            ActionBatch.totals.applied += self.applied
+            ActionBatch.totals.skipped += self.skipped
+        else:
+            sp.logging.info(self.summary())
+        return self.applied
+
+    def summary(self) -> str:
+        """One line summary of the applied batch."""
+        summary = f"{self.action_name}: {self.applied} changes applied"
+        if self.applied_groups > 1:
+            summary += f" across {self.applied_groups} stacks"
+        if self.skipped:
+            summary += f", {self.skipped} unchanged skipped"
+        return f"{summary}."
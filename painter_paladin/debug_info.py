@@ -59,46 +59,6 @@ class DebugInfo:
         except Exception as e:
             sp.logging.warning(f"{e}")
 
-    @staticmethod
-    def layer_help() -> None:
-        """Get python help() for selected layer."""
-        try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-
-            if not selected_nodes:
-                sp.logging.warning("No layer or effect selected.")
-                return
-
-            for node in selected_nodes:
-                help(node)
-                sp.logging.info(
-                    f"Help outputed above for:\n{node.get_name()}\n"
-                    f"Copy and paste to code editor as '.md' for better viewing.",
-                )
-
-        except Exception as e:
-            sp.logging.warning(f"{e}")
-
-    @staticmethod
-    def module_help(module_name_str: str) -> None:
-        """Get python help() for a substance_painter api module.
-
-        Args:
-            module_name_str (str): Substance Painter API module name.
-            Ex. "ui", "textureset", "layerstack"
-
-        """
-        try:
-            module = getattr(sp, module_name_str)
-            help(module)
-            sp.logging.info(
-                f"Help outputed above for:\n{module}\n"
-                f"Copy and paste to code editor as '.md' for better viewing.",
-            )
-        except Exception as e:
-            sp.logging.warning(f"{e}")
-
     @staticmethod
     def toggle_window(window_name: str) -> None:
         """Toggle a Substance Painter Qt Window open and close.
@@ -0,0 +1,291 @@
+"""Painter Paladin Hot Reload
+==================================================
+
+Reloads plugin modules whose source changed, without restarting the plugin.
+Modules that import a changed module at module level are reloaded after it, so they
+pick up its new classes and functions. Imports inside functions read the module again
+on each call and don't need a reload.
+
+Ex. reloader = ModuleReloader(), edit paladin_logic.py, reloader.reload_changed()
+"""
+
+import ast
+import hashlib
+import importlib
+import inspect
+import sys
+from pathlib import Path
+from types import CodeType, FunctionType
+
+import substance_painter as sp
+
+PACKAGE = __package__
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+# Modules holding process wide state that a reload would orphan. Changes need a restart.
+# Ex. IMPORT_TIMER is installed in sys.meta_path.
+NO_RELOAD = {"import_timer", "hot_reload"}
+
+
+def _source_hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def module_imports(path: Path) -> set[str]:
+    """Package modules imported at module level. Ex. {"batch_engine", "session"}
+
+    Args:
+        path (Path): Module source file.
+
+    """
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return set()
+
+    imports = set()
+    statements = list(tree.body)
+    while statements:
+        statement = statements.pop()
+        if isinstance(statement, ast.ImportFrom) and statement.level == 1:
+            if statement.module:
+                imports.add(statement.module.split(".")[0])
+            else:
+                imports.update(alias.name for alias in statement.names)
+        elif isinstance(statement, ast.Import):
+            for alias in statement.names:
+                if alias.name.startswith(f"{PACKAGE}."):
+                    imports.add(alias.name[len(PACKAGE) + 1 :].split(".")[0])
+        elif isinstance(statement, ast.If | ast.Try):
+            # Conditional module level imports. Ex. try: import x except ImportError:
+            for block in (statement.body, statement.orelse, getattr(statement, "handlers", [])):
+                for item in block:
+                    statements.extend(item.body if isinstance(item, ast.ExceptHandler) else [item])
+    return imports
+
+
+# ---------------------------------------------------------- #
+# Definition changes. Tells which functions and classes of a reloaded module changed.
+
+
+def _code_key(code: CodeType) -> tuple:
+    """Bytecode, names and constants of a code object. Line numbers are left out,
+    so a function only moved by an edit above it compares equal.
+    """
+    constants = tuple(
+        _code_key(constant) if isinstance(constant, CodeType) else constant
+        for constant in code.co_consts
+    )
+    return (code.co_code, code.co_names, constants)
+
+
+def definition_key(value):
+    """Comparable form of a function, class or constant. Equal if the definition is unchanged."""
+    if isinstance(value, FunctionType):
+        return _code_key(value.__code__)
+    if isinstance(value, staticmethod | classmethod):
+        return definition_key(value.__func__)
+    if isinstance(value, property):
+        return tuple(definition_key(func) for func in (value.fget, value.fset, value.fdel))
+    if isinstance(value, type):
+        return {
+            name: definition_key(attribute)
+            for name, attribute in vars(value).items()
+            if name not in ("__dict__", "__weakref__")
+        }
+    if value is None or isinstance(value, str | bytes | int | float | tuple | frozenset):
+        return value
+    return type(value).__qualname__
+
+
+def changed_members(old_class: type, new_class: type) -> set[str]:
+    """Attribute names whose definition differs between two versions of a class."""
+    old_members, new_members = vars(old_class), vars(new_class)
+    return {
+        name
+        for name in old_members.keys() | new_members.keys()
+        if definition_key(old_members.get(name)) != definition_key(new_members.get(name))
+    }
+
+
+def changed_names(old_namespace: dict, module, reloaded: set[str]) -> set[str]:
+    """Global names of a reloaded module that now mean something else.
+    Functions and classes defined in it whose code changed, and names imported from
+    other reloaded modules.
+
+    Args:
+        old_namespace (dict): Module namespace before the reload.
+        module: The reloaded module.
+        reloaded (set[str]): Short names of all reloaded modules. Ex. {"session"}
+
+    """
+    changed = set()
+    for name, value in vars(module).items():
+        old_value = old_namespace.get(name)
+        if value is old_value:
+            continue
+        if inspect.ismodule(value):
+            source_module = value.__name__
+        else:
+            source_module = getattr(value, "__module__", None) or module.__name__
+        if source_module != module.__name__:
+            # Imported. Changed only if it came from a module reloaded now.
+            if source_module.rpartition(".")[2] in reloaded:
+                changed.add(name)
+        elif definition_key(value) != definition_key(old_value):
+            changed.add(name)
+    return changed
+
+
+# Nested code that runs right away, as part of the function that defines it.
+INLINE_CODE = {"<listcomp>", "<setcomp>", "<dictcomp>", "<genexpr>"}
+
+
+def referenced_names(cls: type, method_name: str) -> set[str]:
+    """Names a method uses while it runs, including the methods of the class it calls.
+    Lambdas and inner functions are left out, they look names up again when called later.
+    Ex. "build_debug_tab" uses "build_debug_tab", "DebugInfo", "debug_info", "session", ...
+
+    Args:
+        cls (type): Class of the method.
+        method_name (str): Method to start from.
+
+    """
+    names = {method_name}
+    pending = [method_name]
+    while pending:
+        func = inspect.getattr_static(cls, pending.pop(), None)
+        if isinstance(func, staticmethod | classmethod):
+            func = func.__func__
+        if not isinstance(func, FunctionType):
+            continue
+        codes = [func.__code__]
+        while codes:
+            code = codes.pop()
+            codes.extend(
+                const
+                for const in code.co_consts
+                if isinstance(const, CodeType) and const.co_name in INLINE_CODE
+            )
+            for name in code.co_names:
+                if name not in names:
+                    names.add(name)
+                    pending.append(name)
+    return names
+
+
+# ---------------------------------------------------------- #
+# Reloading.
+
+
+class ModuleReloader:
+    """Tracks plugin module sources and reloads the changed ones in dependency order."""
+
+    def __init__(self) -> None:
+        # Source hash per module file, as of plugin start or its last reload.
+        self._hashes: dict[str, str | None] = {
+            path.stem: _source_hash(path) for path in PACKAGE_DIR.glob("*.py")
+        }
+        # (source hash, imports) per module. Parsing every module on each reload is slow.
+        self._imports: dict[str, tuple[str | None, set[str]]] = {}
+
+    def changed_modules(self) -> set[str]:
+        """Module names whose source differs from the last loaded version. Ex. {"session"}"""
+        changed = set()
+        for path in PACKAGE_DIR.glob("*.py"):
+            if self._hashes.get(path.stem) != _source_hash(path):
+                changed.add(path.stem)
+        return changed
+
+    def module_imports(self, name: str) -> set[str]:
+        """Package modules a module imports at module level, parsed again only if it changed."""
+        path = PACKAGE_DIR / f"{name}.py"
+        source_hash = _source_hash(path)
+        cached = self._imports.get(name)
+        if cached is None or cached[0] != source_hash:
+            cached = self._imports[name] = (source_hash, module_imports(path))
+        return cached[1]
+
+    def reload_order(self, changed: set[str]) -> list[str]:
+        """Loaded modules to reload for the changed ones, dependencies first.
+
+        Args:
+            changed (set[str]): Changed module names.
+
+        Returns:
+            list[str]: Changed modules and the loaded modules that import them,
+                directly or not.
+
+        """
+        loaded = {
+            path.stem
+            for path in PACKAGE_DIR.glob("*.py")
+            if f"{PACKAGE}.{path.stem}" in sys.modules
+        }
+        imports = {name: self.module_imports(name) & loaded for name in loaded}
+
+        # Changed modules, then everything importing them.
+        to_reload = changed & loaded
+        pending = list(to_reload)
+        while pending:
+            name = pending.pop()
+            for importer, imported in imports.items():
+                if name in imported and importer not in to_reload:
+                    to_reload.add(importer)
+                    pending.append(importer)
+
+        order: list[str] = []
+
+        def visit(name: str, visiting: set) -> None:
+            if name in order or name in visiting:
+                return  # done, or an import cycle
+            visiting.add(name)
+            for imported in sorted(imports[name] & to_reload):
+                visit(imported, visiting)
+            order.append(name)
+
+        for name in sorted(to_reload):
+            visit(name, set())
+        return order
+
+    def reload_changed(self) -> dict[str, dict]:
+        """Reload changed modules and their importers. Stops at the first module that
+        fails to reload, and tries it again next time.
+
+        Returns:
+            dict[str, dict]: Namespace before the reload per reloaded module, in reload order.
+                Ex. {"batch_engine": {...}, "paladin_logic": {...}}
+
+        """
+        changed = self.changed_modules()
+        blocked = changed & NO_RELOAD
+        if blocked:
+            sp.logging.warning(f"Hot reload: Restart the plugin to apply {', '.join(blocked)}")
+            for name in blocked:
+                self._hashes[name] = _source_hash(PACKAGE_DIR / f"{name}.py")
+        changed -= NO_RELOAD
+
+        order = self.reload_order(changed)
+        reloaded = {}
+        for name in order:
+            module = sys.modules[f"{PACKAGE}.{name}"]
+            old_namespace = dict(module.__dict__)
+            try:
+                importlib.reload(module)
+            except Exception as e:
+                # A half run module body leaves new and old names mixed. Put the old ones back.
+                module.__dict__.clear()
+                module.__dict__.update(old_namespace)
+                sp.logging.warning(f"Hot reload: {name} not reloaded: {e}")
+                break
+            reloaded[name] = old_namespace
+            changed.discard(name)
+            self._hashes[name] = _source_hash(PACKAGE_DIR / f"{name}.py")
+
+        # Changed, but not loaded yet. Their first import reads the new source.
+        for name in changed - set(order):
+            self._hashes[name] = _source_hash(PACKAGE_DIR / f"{name}.py")
+        return reloaded
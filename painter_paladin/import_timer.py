@@ -0,0 +1,172 @@
+"""Painter Paladin Import Timer
+==================================================
+
+Records how long each module import takes, like "python -X importtime", but inside Painter.
+Start it before the plugin imports, then dump the report to the Log Window.
+Only imports that run while recording are timed. Modules already loaded cost nothing.
+
+Ex. IMPORT_TIMER.start(), import plugin modules, IMPORT_TIMER.stop(), IMPORT_TIMER.dump()
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import substance_painter as sp
+
+
+@dataclass
+class ImportRecord:
+    """Timing of one module import.
+
+    Args:
+        name (str): Module name. Ex. "painter_paladin.paladin_logic"
+        self_time (float): Seconds spent in the module itself.
+        cumulative_time (float): Seconds including the imports it triggered.
+        depth (int): Nesting level. 0 for imports not triggered by another timed import.
+
+    """
+
+    name: str
+    self_time: float
+    cumulative_time: float
+    depth: int
+
+
+class _TimedLoader:
+    """Loader wrapper that times "exec_module()", then puts the original loader back."""
+
+    def __init__(self, loader, timer: "ImportTimer") -> None:
+        self.loader = loader
+        self.timer = timer
+
+    def __getattr__(self, name: str):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        # Later reloads and resource lookups see the original loader.
+        spec = module.__spec__
+        module.__loader__ = spec.loader = self.loader
+        with self.timer.timing(spec.name):
+            self.loader.exec_module(module)
+
+
+class ImportTimer:
+    """Meta path finder that times module imports while recording."""
+
+    def __init__(self) -> None:
+        self.records: list[ImportRecord] = []
+        # Child import time per open import, to split self and cumulative time.
+        self._child_times: list[float] = []
+        self._finding: set[str] = set()
+
+    @property
+    def recording(self) -> bool:
+        """Whether imports are timed right now."""
+        return self in sys.meta_path
+
+    def start(self) -> None:
+        """Time imports from now on."""
+        if not self.recording:
+            sys.meta_path.insert(0, self)
+
+    def stop(self) -> None:
+        """Stop timing imports. Records are kept."""
+        if self.recording:
+            sys.meta_path.remove(self)
+
+    @contextmanager
+    def record(self):
+        """Time imports inside the with block. Ex. a deferred import on first use."""
+        was_recording = self.recording
+        self.start()
+        try:
+            yield self
+        finally:
+            if not was_recording:
+                self.stop()
+
+    def total_time(self) -> float:
+        """Seconds spent in timed imports, not counting nested imports twice."""
+        return sum(record.cumulative_time for record in self.records if record.depth == 0)
+
+    def report(self, limit: int = 40) -> list[str]:
+        """Report lines for the Log Window, most recent imports last.
+
+        Args:
+            limit (int): Max number of modules listed.
+
+        Returns:
+            list[str]: Total line, then "self ms | cumulative ms | module" lines.
+
+        """
+        lines = [
+            f"Import Timer: {len(self.records)} modules in {self.total_time() * 1000:.1f} ms.",
+            "   self ms | cumulative ms | module",
+        ]
+        # Post order like "-X importtime", children above their parent.
+        for record in self.records[-limit:]:
+            lines.append(
+                f"{record.self_time * 1000:10.2f} | {record.cumulative_time * 1000:13.2f} | "
+                f"{'  ' * record.depth}{record.name}",
+            )
+        return lines
+
+    def dump(self) -> None:
+        """Log the report to the Log Window."""
+        if not self.records:
+            sp.logging.info("Import Timer: No imports recorded.")
+            return
+        for line in self.report():
+            sp.logging.info(line)
+
+    @contextmanager
+    def timing(self, name: str):
+        """Time one module body. Nested timings are subtracted from the self time."""
+        depth = len(self._child_times)
+        self._child_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative_time = time.perf_counter() - start
+            child_time = self._child_times.pop()
+            if self._child_times:
+                self._child_times[-1] += cumulative_time
+            self.records.append(
+                ImportRecord(name, cumulative_time - child_time, cumulative_time, depth),
+            )
+
+    # ---------------------------------------------------------- #
+    # Meta path finder.
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        """Find the module with the other finders and wrap its loader with a timer."""
+        # Main thread only, nesting is tracked per import chain.
+        if fullname in self._finding or threading.current_thread() is not threading.main_thread():
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+
+# Shared by the plugin entry point and the Debug tab. Imports are process wide.
+IMPORT_TIMER = ImportTimer()
@@ -0,0 +1,174 @@
+"""Painter Paladin Job Runner
+==================================================
+
+Runs a per node action over a large selection in chunks, one chunk per event loop pass.
+Painter stays responsive, and a progress bar and cancel button can update between chunks.
+Each chunk is a complete action with its own undo step. Cancelling stops before the
+next chunk, so every chunk is either fully applied or not started.
+Actions log their own errors, so a chunk that neither applied nor skipped a single write
+failed. The job stops there and reports as failed.
+
+Ex. runner.start("set_opacity", opacity_val=0.5), runner.cancel()
+"""
+
+import time
+from collections import deque
+
+import substance_painter as sp
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .batch_engine import ActionBatch
+from .macro import MacroStep
+
+# Selections up to this many nodes run at once, without chunks or progress.
+CHUNK_SIZE = 50
+# Chunk sizes adapt so one chunk takes about this long. Keeps the UI responsive.
+CHUNK_BUDGET = 0.05
+MAX_CHUNK_SIZE = 1000
+
+
+class JobRunner(QObject):
+    """Chunked runs of PaladinLogic actions on the Qt event loop."""
+
+    started = Signal(str, int)  # job name, nodes total
+    progress = Signal(int, int)  # nodes done, nodes total
+    finished = Signal(str)  # summary line
+
+    def __init__(self, logic, chunk_size: int = CHUNK_SIZE, parent=None) -> None:
+        """Initialize an idle runner.
+
+        Args:
+            logic (PaladinLogic): Plugin logic the actions run on.
+            chunk_size (int): Largest selection run at once, and the first chunk size.
+                Later chunks adapt to CHUNK_BUDGET.
+            parent: The parent object in Qt's hierarchy. Defaults to None.
+
+        """
+        super().__init__(parent)
+        self.logic = logic
+        self.chunk_size = chunk_size
+        self._step: MacroStep | None = None
+        # (stack, nodes not run yet) per target.
+        self._queue: deque = deque()
+        self._chunk_size = chunk_size
+        self._totals: ActionBatch | None = None
+        self._cancelled = False
+        self._failed = False
+        self._done = 0
+        self._total = 0
+        self._chunks = 0
+        self._start_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether a job is in progress."""
+        return self._step is not None
+
+    def start(self, action: str, *args, **kwargs) -> bool:
+        """Run an action on the selection. Small selections run right away,
+        larger ones in chunks from the event loop.
+
+        Args:
+            action (str): PaladinLogic method name. Ex. "set_opacity"
+            *args: Positional arguments of the call.
+            **kwargs: Keyword arguments of the call.
+
+        Returns:
+            bool: Whether the action ran or was scheduled.
+
+        """
+        if self.running:
+            sp.logging.warning("A job is already running. Cancel it or wait until it's done.")
+            return False
+
+        targets = self.logic.selection_targets()
+        if not targets:
+            return False
+
+        total = sum(len(target.nodes) for target in targets)
+        if total <= self.chunk_size:
+            getattr(self.logic, action)(*args, **kwargs)
+            return True
+
+        # Chunks run inside actions, so the call is recorded once here.
+        if self.logic.recording is not None:
+            self.logic.recording.add(action, *args, **kwargs)
+
+        self._step = MacroStep(action, args, kwargs)
+        self._queue = deque((target.stack, list(target.nodes)) for target in targets)
+        self._totals = ActionBatch(action)
+        self._totals.applied_groups = len(targets)
+        self._cancelled = False
+        self._failed = False
+        self._done = 0
+        self._total = total
+        self._chunks = 0
+        self._chunk_size = self.chunk_size
+        self._start_time = time.perf_counter()
+        self.started.emit(action, total)
+        QTimer.singleShot(0, self._run_next_chunk)
+        return True
+
+    def cancel(self) -> None:
+        """Stop before the next chunk. Chunks already applied stay applied."""
+        if self.running:
+            self._cancelled = True
+
+    def _run_next_chunk(self) -> None:
+        """Run one chunk, then schedule the next one."""
+        if self._cancelled or self._failed or not self._queue or not sp.project.is_open():
+            self._finish()
+            return
+
+        stack, nodes = self._queue[0]
+        chunk, nodes[:] = nodes[: self._chunk_size], nodes[self._chunk_size :]
+        if not nodes:
+            self._queue.popleft()
+
+        start = time.perf_counter()
+        writes = self._totals.applied + self._totals.skipped
+        ActionBatch.totals = self._totals
+        try:
+            self.logic.run_steps(stack, chunk, [self._step])
+        except Exception as e:
+            sp.logging.warning(f"Job stopped: {e}")
+            self._failed = True
+        finally:
+            ActionBatch.totals = None
+        elapsed = time.perf_counter() - start
+
+        if self._totals.applied + self._totals.skipped == writes:
+            self._failed = True  # errors already logged by the action
+        if self._failed:
+            QTimer.singleShot(0, self._run_next_chunk)
+            return
+
+        self._done += len(chunk)
+        self._chunks += 1
+        if elapsed > 0:
+            chunk_size = int(len(chunk) * CHUNK_BUDGET / elapsed)
+            self._chunk_size = max(1, min(chunk_size, MAX_CHUNK_SIZE))
+        self.progress.emit(self._done, self._total)
+        QTimer.singleShot(0, self._run_next_chunk)
+
+    def _finish(self) -> None:
+        """Log the totals and throughput, then go idle."""
+        elapsed = time.perf_counter() - self._start_time
+        throughput = self._done / elapsed if elapsed > 0 else 0.0
+        summary = (
+            f"{self._totals.summary()} {self._done}/{self._total} nodes in {self._chunks} chunks, "
+            f"{elapsed:.2f} s, {throughput:.0f} nodes/sec."
+        )
+        if self._failed:
+            summary += " Failed, a chunk applied nothing. Applied chunks kept."
+        elif self._done < self._total:
+            summary += " Cancelled, applied chunks kept."
+        if self._failed:
+            sp.logging.warning(summary)
+        else:
+            sp.logging.info(summary)
+
+        self._step = None
+        self._queue.clear()
+        self._totals = None
+        self.finished.emit(summary)
@@ -0,0 +1,49 @@
+"""Painter Paladin Macros
+==================================================
+
+Recorded sequences of PaladinLogic actions, replayed as one batched run.
+Ex. paintable_fill_layer(), set_channel_value(skin color), add_generator_mask("Curvature")
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class MacroStep:
+    """One recorded action call.
+
+    Args:
+        action (str): PaladinLogic method name. Ex. "set_opacity"
+        args (tuple): Positional arguments of the call.
+        kwargs (dict): Keyword arguments of the call.
+
+    """
+
+    action: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+    def describe(self) -> str:
+        """Readable call. Ex. "set_opacity(opacity_val=0.5)" """
+        arguments = [repr(arg) for arg in self.args]
+        arguments += [f"{key}={value!r}" for key, value in self.kwargs.items()]
+        return f"{self.action}({', '.join(arguments)})"
+
+
+@dataclass
+class Macro:
+    """Ordered action calls, recorded from the UI or built in code."""
+
+    name: str = "Macro"
+    steps: list[MacroStep] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def add(self, action: str, *args, **kwargs) -> None:
+        """Append an action call. Ex. macro.add("add_generator_mask", "Curvature")"""
+        self.steps.append(MacroStep(action, args, kwargs))
+
+    def describe(self) -> str:
+        """One line per step, for the Log Window."""
+        return "\n".join(f"{index}. {step.describe()}" for index, step in enumerate(self.steps, 1))
@@ -2,16 +2,112 @@
 ==================================================
 
 This module contains logic for the plugin buttons and actions in Substance Painter.
+Actions plan their changes into an "ActionBatch" and apply them as one undo step.
 """
 
 #import traceback  # noqa: F401
 
+import functools
+import math
+from enum import Enum
+
 import substance_painter as sp
 
+from . import preset_library
+from .batch_engine import ActionBatch
+from .macro import Macro, MacroStep
+from .resource_cache import GENERATOR_QUERY, MASK_FILL_QUERY, NOISE_QUERY
+from .session import PaladinSession
+from .target_scope import StackTarget, TargetScope, resolve_targets, texture_set_names
+
+
+# Values closer than this are treated as unchanged and not written again.
+VALUE_TOLERANCE = 1e-4
+
+# Actions not recorded into macros. Selection changes would break replay per node.
+UNRECORDED_ACTIONS = {"select_by_query", "replay_macro"}
+
+# Actions that change every selected node on its own, so the selection can be
+# split into chunks run one after another. Insert actions only use the first node.
+PER_NODE_ACTIONS = {
+    "add_generator_mask",
+    "add_mask_fill",
+    "add_noise_mask",
+    "apply_recipe",
+    "disable_all_except_base_color",
+    "enable_channels_for_selected_fill",
+    "remove_layer_mask",
+    "set_channel_value",
+    "set_opacity",
+    "set_passthrough_mode",
+    "setup_mask",
+}
+
+
+class ExecutionMode(Enum):
+    """How much checking and logging an action does.
+
+    QUIET: Skip read-back of applied values. One summary line per action.
+    VERIFY: Read back every applied value and log it per node and channel.
+    """
+
+    QUIET = "Quiet"
+    VERIFY = "Verify"
+
+
+def paladin_action(method):
+    """Run a PaladinLogic action inside one session action.
+    The active stack and selection are read once and shared by the whole action.
+    Timed by the session profiler while it is enabled.
+    Recorded into the macro while recording, unless called by another action.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if (
+            self.recording is not None
+            and not self.session.in_action
+            and method.__name__ not in UNRECORDED_ACTIONS
+        ):
+            self.recording.add(method.__name__, *args, **kwargs)
+        with self.session.action(), self.session.profiler.action(method.__name__):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class PaladinLogic:
     """Logic for the plugin."""
 
+    def __init__(
+        self,
+        session: PaladinSession | None = None,
+        execution_mode: ExecutionMode = ExecutionMode.QUIET,
+        scope: TargetScope = TargetScope.ACTIVE_STACK,
+    ) -> None:
+        """Initialize plugin logic.
+
+        Args:
+            session (PaladinSession): Shared plugin caches. A new one if None.
+            execution_mode (ExecutionMode): Quiet for speed, Verify for debugging.
+            scope (TargetScope): Stacks that selection based actions apply to.
+
+        """
+        self.session = session or PaladinSession()
+        self.execution_mode = execution_mode
+        self.scope = scope
+        # Texture set names used by TargetScope.CHOSEN_TEXTURE_SETS
+        self.chosen_texture_sets: list[str] = []
+        # Macro being recorded, and the last recorded macro.
+        self.recording: Macro | None = None
+        self.macro: Macro | None = None
+
+    @property
+    def verify(self) -> bool:
+        """Whether applied values are read back and logged."""
+        return self.execution_mode is ExecutionMode.VERIFY
+
+    @paladin_action
     def paintable_fill_layer(self) -> None:
         """Creates a Fill Layer, inserts a Paint Effect inside it, adds a Fill Effect below it,
         and ensures all channels are enabled for the Fill Effect and Layer.
@@ -20,43 +116,19 @@ class PaladinLogic:
         Paint channels work in unison and are not separate like Fill channels.
         """
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-
-            # Insert Fill Layer at the top
-            insert_position = sp.layerstack.InsertPosition.above_node(selected_nodes[0])
-            fill_layer = sp.layerstack.insert_fill(insert_position)
-            fill_layer.set_name("fill_layer")
-            sp.logging.info("Created Fill Layer")
-
-            # Get available channels on the Fill Layer
-            available_channels = set(stack.all_channels())
-
-            # Enable available channels on Fill Layer
-            fill_layer.active_channels = available_channels
-
-            # Insert a Paint Effect inside the Fill Layer's content stack
-            insert_position = sp.layerstack.InsertPosition.inside_node(
-                fill_layer,
-                sp.layerstack.NodeStack.Content,
+            stack = self.session.active_stack()
+            selected_nodes = self.session.selected_nodes()
+            # Get available channels for the Fill Layer
+            available_channels = self.session.channels(stack)
+
+            batch = ActionBatch("Paintable Fill Layer")
+            batch.add(
+                self._insert_paintable_fill_layer,
+                selected_nodes[0],
+                available_channels,
+                structural=True,
             )
-            paint_effect = sp.layerstack.insert_paint(insert_position)
-            paint_effect.set_name("paint_effect_passthrough")
-            sp.logging.info("Inserted Paint Effect inside Fill Layer")
-            # Paint Effect channels fail to activate. Activation not supported.
-            # paint_effect.active_channels = available_channels
-
-            # Set blend mode to Passthrough for the Paint Effect
-            passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
-            for channel in available_channels:
-                paint_effect.set_blending_mode(passthrough_blend_mode, channel)
-
-            # Insert a Fill Effect directly below the Paint Effect
-            insert_position = sp.layerstack.InsertPosition.below_node(paint_effect)
-            fill_effect = sp.layerstack.insert_fill(insert_position)
-            fill_effect.set_name("fill_effect")
-            fill_effect.active_channels = available_channels  # Enable channels on Fill Effect
-            sp.logging.info("Inserted Fill Effect below Paint Effect.")
+            batch.apply()
 
         except sp.exception.ProjectError:
             sp.logging.warning("No project loaded. Please open or start a new project.")
@@ -64,45 +136,25 @@ class PaladinLogic:
         except Exception as e:
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def paintable_fill_layer_group(self) -> None:
         """Similar to "paintable_fill_layer()".
         Creats a group, a paint layer with passthrough blend mode, and a fill layer.
         Uses a group instead of effect nodes in a fill layer.
         """
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-            available_channels = set(stack.all_channels())
-
-            # Insert Group Layer above selection
-            insert_position = sp.layerstack.InsertPosition.above_node(selected_nodes[0])
-            group_layer = sp.layerstack.insert_group(insert_position)
-            group_layer.set_name("group_layer")
-            sp.logging.info(f"Created: {group_layer.get_name()}")
-
-            # Insert Fill Layer inside group layer
-            insert_position = sp.layerstack.InsertPosition.inside_node(
-                group_layer,
-                sp.layerstack.NodeStack.Substack,
+            stack = self.session.active_stack()
+            selected_nodes = self.session.selected_nodes()
+            available_channels = self.session.channels(stack)
+
+            batch = ActionBatch("Paintable Fill Layer Group")
+            batch.add(
+                self._insert_paintable_fill_layer_group,
+                selected_nodes[0],
+                available_channels,
+                structural=True,
             )
-            fill_layer = sp.layerstack.insert_fill(insert_position)
-            fill_layer.set_name("fill_layer")
-            fill_layer.active_channels = available_channels  # turn on channels
-            sp.logging.info(f"Created: {fill_layer.get_name()}")
-
-            # Insert Paint Layer inside group layer
-            insert_position = sp.layerstack.InsertPosition.above_node(fill_layer)
-            paint_layer = sp.layerstack.insert_paint(insert_position)
-            paint_layer.set_name("passthrough_paint_layer")
-            sp.logging.info(f"Created: {paint_layer.get_name()}")
-
-            # Set blend mode to Passthrough for the Paint Layer
-            passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
-            for channel in available_channels:
-                paint_layer.set_blending_mode(passthrough_blend_mode, channel)
-            # Check blending mode
-            blend_mode = paint_layer.get_blending_mode(list(available_channels)[0])
-            sp.logging.info(f"{paint_layer.get_name()} - {blend_mode.name}")
+            batch.apply()
 
         except sp.exception.ProjectError:
             sp.logging.warning("No project loaded. Please open or start a new project.")
@@ -111,57 +163,94 @@ class PaladinLogic:
             # sp.logging.warning(f"Error: {e}\nTraceback: {traceback.format_exc()}")
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def setup_mask(self, background: str) -> None:
         """Add mask to selected layers, white or black.
         Change color if mask already exists.
         """
         try:
-            # Get selected
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-
             # Mask types
-            white_mask = sp.layerstack.MaskBackground.White
-            black_mask = sp.layerstack.MaskBackground.Black
+            mask_backgrounds = {
+                "black": sp.layerstack.MaskBackground.Black,
+                "white": sp.layerstack.MaskBackground.White,
+            }
+            mask_background = mask_backgrounds.get(background.lower())
+            if mask_background is None:
+                sp.logging.warning(f"Unsupported background: {background}")
+                return
 
-            if background.lower() == "black":
-                for node in selected_nodes:
-                    mask_check = sp.layerstack.LayerNode.has_mask(node)
-                    if mask_check is False:  # Apply new mask
-                        sp.layerstack.LayerNode.add_mask(node, black_mask)
-                    else:
-                        sp.layerstack.LayerNode.set_mask_background(node, black_mask)
-                    current_mask = sp.layerstack.LayerNode.get_mask_background(node)
-                    sp.logging.info(f"Mask applied to {node.get_name()}: {current_mask.name}")
-            elif background.lower() == "white":
-                for node in selected_nodes:
+            # Get selected
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
+
+            batch = ActionBatch(f"Set {mask_background.name} Mask")
+            for target in targets:
+                for node in target.nodes:
                     mask_check = sp.layerstack.LayerNode.has_mask(node)
                     if mask_check is False:  # Apply new mask
-                        sp.layerstack.LayerNode.add_mask(node, white_mask)
+                        batch.add(
+                            sp.layerstack.LayerNode.add_mask,
+                            node,
+                            mask_background,
+                            group=target.label,
+                        )
+                    elif (
+                        sp.layerstack.LayerNode.get_mask_background(node) == mask_background
+                    ):
+                        batch.skip()  # Mask already has this background
                     else:
-                        sp.layerstack.LayerNode.set_mask_background(node, white_mask)
-                    current_mask = sp.layerstack.LayerNode.get_mask_background(node)
-                    sp.logging.info(f"Mask applied to {node.get_name()}: {current_mask.name}")
-            else:
-                sp.logging.warning(f"Unsupported background: {background}")
+                        batch.add(
+                            sp.layerstack.LayerNode.set_mask_background,
+                            node,
+                            mask_background,
+                            group=target.label,
+                        )
+            batch.apply()
+
+            if self.verify:
+                for target in targets:
+                    for node in target.nodes:
+                        current_mask = sp.layerstack.LayerNode.get_mask_background(node)
+                        sp.logging.info(
+                            f"Mask applied to {target.label} {node.get_name()}: "
+                            f"{current_mask.name}",
+                        )
 
         except Exception as e:
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def remove_layer_mask(self) -> None:
         """Remove mask from selected layers."""
         try:
             # Get selected
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
 
             # Remove masks for selected
-            for node in selected_nodes:
-                sp.layerstack.LayerNode.remove_mask(node)
+            batch = ActionBatch("Remove Mask")
+            for target in targets:
+                for node in target.nodes:
+                    if sp.layerstack.LayerNode.has_mask(node) is False:
+                        batch.skip()  # No mask to remove
+                        continue
+                    # Removes the mask effects too.
+                    batch.add(
+                        sp.layerstack.LayerNode.remove_mask,
+                        node,
+                        group=target.label,
+                        structural=True,
+                    )
+            batch.apply()
 
         except Exception as e:
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def add_mask_fill(self) -> None:
         """Add fill to layer's mask.
         A decent way to control transparency.
@@ -169,139 +258,173 @@ class PaladinLogic:
         """
         try:
             # Get selected
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-
-            # Mask types
-            white_mask = sp.layerstack.MaskBackground.White
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
 
-            for node in selected_nodes:
-                mask_check = sp.layerstack.LayerNode.has_mask(node)
-                if mask_check is False:  # Create mask first if doesn't exist
-                    sp.layerstack.LayerNode.add_mask(node, white_mask)
-                else:
-                    pass
-                insert_position = sp.layerstack.InsertPosition.inside_node(
-                    node,
-                    sp.layerstack.NodeStack.Mask,
-                )
-                fill_effect = sp.layerstack.insert_fill(insert_position)
-                fill_effect.set_name("fill_effect")
-                # Set and unset a fill resource to trigger the greyscale adjustment slider
-                noise_resource = sp.resource.search("n:White Noise")[0]
-                fill_effect.set_source(None, noise_resource.identifier())
-                fill_effect.reset_source()
-
-                sp.logging.info(f"{node.get_name()} - {fill_effect.get_name()}")
+            # Set and unset a fill resource to trigger the greyscale adjustment slider
+            noise_resource_id = self.session.resources.identifier(MASK_FILL_QUERY)
+
+            batch = ActionBatch("Add Mask Fill")
+            for target in targets:
+                for node in target.nodes:
+                    batch.add(
+                        self._insert_mask_fill,
+                        node,
+                        noise_resource_id,
+                        group=target.label,
+                        structural=True,
+                    )
+            batch.apply()
 
         except Exception as e:
             # sp.logging.warning(f"Error: {e}\nTraceback: {traceback.format_exc()}")
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def enable_channels_for_selected_fill(self) -> None:
         """Enables all available channels for the currently selected Fill Layer/ Effect."""
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-            available_channels = set(stack.all_channels())
-
-            if not selected_nodes:
+            targets = self._targets()
+            if not targets:
                 sp.logging.warning("No layer or effect selected.")
                 return
 
-            for node in selected_nodes:
-                sp.logging.info(f"Enabling channels for: {node.get_name()}")
-
-                # get channel color values to reapply later
-                channel_val_dict = {}
-                for channel in available_channels:
-                    source = node.get_source(channel)
-                    if hasattr(source, "get_color"):  # avoid bitmap texture error
-                        channel_val = source.get_color()
-                        channel_val_dict[channel] = channel_val
-
-                # activate all channels
-                node.active_channels = available_channels
+            batch = ActionBatch("Enable All Channels")
+            for target in targets:
+                available_channels = target.channels
+                for node in target.nodes:
+                    if self.verify:
+                        sp.logging.info(f"Enabling channels for: {node.get_name()}")
+
+                    if node.active_channels == available_channels:
+                        batch.skip()  # All channels already enabled
+                        continue
+
+                    # get channel color values to reapply later
+                    channel_val_dict = {}
+                    for channel in available_channels:
+                        source = node.get_source(channel)
+                        if hasattr(source, "get_color"):  # avoid bitmap texture error
+                            channel_val = source.get_color()
+                            channel_val_dict[channel] = channel_val
+
+                    # activate all channels
+                    batch.add(
+                        self._set_active_channels,
+                        node,
+                        available_channels,
+                        group=target.label,
+                    )
 
-                # reapply channel color values
-                for channel, channel_val in channel_val_dict.items():
-                    node.set_source(channel, channel_val)
+                    # reapply channel color values
+                    for channel, channel_val in channel_val_dict.items():
+                        batch.add(node.set_source, channel, channel_val, group=target.label)
+            batch.apply()
 
-                sp.logging.info(f"Applied Channels: {[ch.name for ch in node.active_channels]}")
+            if self.verify:
+                for target in targets:
+                    for node in target.nodes:
+                        sp.logging.info(
+                            f"Applied Channels: {[ch.name for ch in node.active_channels]}",
+                        )
 
         except Exception as e:
             # sp.logging.warning(f"Error: {e}\nTraceback: {traceback.format_exc()}")
             sp.logging.warning(f"Error enabling channels: {e}")
 
+    @paladin_action
     def disable_all_except_base_color(self) -> None:
         """Disables all channels except Base Color for the selected Fill Layer/ Effect."""
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
+            targets = self._targets()
             base_color_channel = sp.textureset.ChannelType.BaseColor
 
-            if not selected_nodes:
+            if not targets:
                 sp.logging.warning("No layer or effect selected.")
                 return
 
-            for node in selected_nodes:
-                sp.logging.info(f"Disabling all but Base Color for: {node.get_name()}")
-                source = node.get_source(base_color_channel)
+            batch = ActionBatch("Color Channel Only")
+            for target in targets:
+                for node in target.nodes:
+                    if self.verify:
+                        sp.logging.info(f"Disabling all but Base Color for: {node.get_name()}")
 
-                # get base color value if available
-                if hasattr(source, "get_color"):
-                    channel_val = source.get_color()
+                    if node.active_channels == {base_color_channel}:
+                        batch.skip()  # Already Base Color only
+                        continue
 
-                # activate only base color channel
-                node.active_channels = {base_color_channel}
+                    source = node.get_source(base_color_channel)
 
-                if hasattr(source, "get_color"):
-                    # reapply channel values
-                    node.set_source(base_color_channel, channel_val)
+                    # activate only base color channel
+                    batch.add(
+                        self._set_active_channels,
+                        node,
+                        {base_color_channel},
+                        group=target.label,
+                    )
 
-                sp.logging.info(f"Applied Channels: {[ch.name for ch in node.active_channels]}")
+                    # get base color value if available and reapply it
+                    if hasattr(source, "get_color"):
+                        batch.add(
+                            node.set_source,
+                            base_color_channel,
+                            source.get_color(),
+                            group=target.label,
+                        )
+            batch.apply()
+
+            if self.verify:
+                for target in targets:
+                    for node in target.nodes:
+                        sp.logging.info(
+                            f"Applied Channels: {[ch.name for ch in node.active_channels]}",
+                        )
 
         except Exception as e:
             sp.logging.warning(f"Error disabling channels: {e}")
 
+    @paladin_action
     def set_channel_value(self, channel_val: float, channel_type: str) -> None:
         """Set 0-1 channel values.
 
         Args:
-            channel_val (float): 0-1 channel value.
+            channel_val (float | tuple): 0-1 channel value, or (R, G, B) 0-1.
             channel_type (str): BaseColor, Roughness, Metallic, etc.
 
         """
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-            available_channels = set(stack.all_channels())
+            targets = self._targets()
 
-            if not selected_nodes:
+            if not targets:
                 sp.logging.warning("No layer or effect selected.")
                 return
 
-            channel_type = getattr(sp.layerstack.ChannelType, channel_type)
-            if isinstance(channel_val, (float, int)):
-                color = sp.colormanagement.Color(channel_val, channel_val, channel_val)
-            elif isinstance(channel_val, (tuple, list)):
-                color = sp.colormanagement.Color(channel_val[0], channel_val[1], channel_val[2])
-
-            for node in selected_nodes:
-                if channel_type in available_channels:
-                    node.set_source(channel_type, color)  # Set Value
-
-                    node_attr_result = node.get_source(channel_type)  # Get Value
-                    r, g, b = node_attr_result.get_color().value_raw
-                    sp.logging.info(
-                        f"Value applied: {node.get_name()} "
-                        f"{channel_type.name}: "
-                        f"{r:.2f}, {g:.2f}, {b:.2f}",
-                    )
+            # Cached, built once per channel name and value.
+            channel_type = preset_library.channel_type(channel_type)
+            color = self._color(channel_val)
+
+            batch = ActionBatch(f"Set {channel_type.name}")
+            for target in targets:
+                if channel_type not in target.channels:
+                    sp.logging.warning(f"Channel not in stack {target.label}: {channel_type.name}")
+                    continue
+                for node in target.nodes:
+                    self._plan_channel_value(batch, target, node, channel_type, color)
+            batch.apply()
+
+            if self.verify:
+                for target in targets:
+                    if channel_type not in target.channels:
+                        continue
+                    for node in target.nodes:
+                        self._log_channel_value(node, channel_type)
 
         except Exception as e:
             sp.logging.warning(f"Channel values not applied: {e}")
 
+    @paladin_action
     def set_opacity(self, opacity_val: float) -> None:
         """Set overall channel opacity for layer.
         Not to be confused with fill/ paint layer channel value.
@@ -311,147 +434,583 @@ class PaladinLogic:
 
         """
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-            available_channels = set(stack.all_channels())
+            targets = self._targets()
 
-            if not selected_nodes:
+            if not targets:
                 sp.logging.warning("No layer or effect selected.")
                 return
 
-            for node in selected_nodes:
-                sp.logging.info("# ---------------------------------------- #")
-                for channel in available_channels:
-                    node.set_opacity(opacity_val, channel)
-                    channel_opacity = node.get_opacity(channel)
-                    sp.logging.info(
-                        f"{node.get_name()} - {channel.name} - {channel_opacity}",
-                    )
+            batch = ActionBatch("Set Opacity")
+            for target in targets:
+                for node in target.nodes:
+                    self._plan_opacity(batch, target, node, opacity_val)
+            batch.apply()
+
+            if self.verify:
+                for target in targets:
+                    for node in target.nodes:
+                        self._log_opacity(target, node)
 
         except Exception as e:
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def set_passthrough_mode(self) -> None:
         """Set all channels to Passthrough blend mode for selected."""
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-            available_channels = set(stack.all_channels())
-
-            for node in selected_nodes:
-                sp.logging.info(f"Selected: {node.get_name()}")
-                # Set blend mode to Passthrough for the Layer
-                passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
-                for channel in available_channels:
-                    node.set_blending_mode(passthrough_blend_mode, channel)
-                    blend_mode = node.get_blending_mode(channel)
-                    sp.logging.info(
-                        f"{channel.name} - {blend_mode.name}",
-                    )
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
+
+            # Set blend mode to Passthrough for the Layer
+            passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
+            batch = ActionBatch("Set Passthrough Mode")
+            for target in targets:
+                for node in target.nodes:
+                    self._plan_blend_mode(batch, target, node, passthrough_blend_mode)
+            batch.apply()
+
+            if self.verify:
+                for target in targets:
+                    for node in target.nodes:
+                        self._log_blend_modes(target, node)
 
         except Exception as e:
             sp.logging.warning(f"{e}")
 
+    @paladin_action
+    def apply_recipe(
+        self,
+        channel_values: dict | None = None,
+        opacity_val: float | None = None,
+        blend_mode: str | None = None,
+        recipe_name: str = "Material Recipe",
+    ) -> None:
+        """Set channel values, opacity and blend mode in one pass over the selected nodes.
+        Same per node changes as "set_channel_value()", "set_opacity()" and
+        "set_passthrough_mode()", applied as one undo step.
+
+        Args:
+            channel_values (dict): 0-1 value or (R, G, B) 0-1 per channel name.
+                Ex. {"BaseColor": (0.69, 0.68, 0.68), "Roughness": 0.35, "Metallic": 1.0}
+            opacity_val (float): Overall channel opacity. Unchanged if None.
+            blend_mode (str): Blend mode for all channels. Ex. "Normal". Unchanged if None.
+            recipe_name (str): Shown in the undo history and the summary line.
+
+        """
+        try:
+            targets = self._targets()
+
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
+
+            # Resolved once for the whole recipe.
+            sources = [
+                (preset_library.channel_type(name), self._color(value))
+                for name, value in (channel_values or {}).items()
+            ]
+            blending_mode = preset_library.blending_mode(blend_mode) if blend_mode else None
+
+            batch = ActionBatch(recipe_name)
+            for target in targets:
+                target_sources = []
+                for channel_type, color in sources:
+                    if channel_type in target.channels:
+                        target_sources.append((channel_type, color))
+                    else:
+                        sp.logging.warning(
+                            f"Channel not in stack {target.label}: {channel_type.name}",
+                        )
+                # One pass per node for every part of the recipe.
+                for node in target.nodes:
+                    for channel_type, color in target_sources:
+                        self._plan_channel_value(batch, target, node, channel_type, color)
+                    if opacity_val is not None:
+                        self._plan_opacity(batch, target, node, opacity_val)
+                    if blending_mode is not None:
+                        self._plan_blend_mode(batch, target, node, blending_mode)
+            batch.apply()
+
+            if self.verify:
+                for target in targets:
+                    for node in target.nodes:
+                        for channel_type, _ in sources:
+                            if channel_type in target.channels:
+                                self._log_channel_value(node, channel_type)
+                        if opacity_val is not None:
+                            self._log_opacity(target, node)
+                        if blending_mode is not None:
+                            self._log_blend_modes(target, node)
+
+        except Exception as e:
+            sp.logging.warning(f"Recipe not applied: {e}")
+
+    @paladin_action
     def add_passthrough_paint_layer(self) -> None:
         """Add paint layer with passthrough above selected."""
         try:
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-            available_channels = set(stack.all_channels())
-
-            # Insert paint layer above selection
-            insert_position = sp.layerstack.InsertPosition.above_node(selected_nodes[0])
-            paint_layer = sp.layerstack.insert_paint(insert_position)
-            paint_layer.set_name("passthrough_paint_layer")
-            sp.logging.info(f"Created: {paint_layer.get_name()}")
-
-            # Set blend mode to Passthrough for the Paint Layer
-            passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
-            for channel in available_channels:
-                paint_layer.set_blending_mode(passthrough_blend_mode, channel)
-                blend_mode = paint_layer.get_blending_mode(channel)
-                sp.logging.info(f"{channel.name} - {blend_mode.name}")
+            stack = self.session.active_stack()
+            selected_nodes = self.session.selected_nodes()
+            available_channels = self.session.channels(stack)
+
+            batch = ActionBatch("Add Passthrough Layer")
+            batch.add(
+                self._insert_passthrough_paint_layer,
+                selected_nodes[0],
+                available_channels,
+                structural=True,
+            )
+            batch.apply()
 
         except Exception as e:
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def add_noise_mask(self) -> None:
         """Add mask with noise resource to selected.
         Add to existing mask if already exists.
         """
         try:
             # Get selected
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
-
-            # Mask
-            white_mask = sp.layerstack.MaskBackground.White
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
 
-            for node in selected_nodes:
-                mask_check = sp.layerstack.LayerNode.has_mask(node)
-                if mask_check is False:  # Create mask first if doesn't exist
-                    sp.layerstack.LayerNode.add_mask(node, white_mask)
-                else:
-                    pass
-                insert_position = sp.layerstack.InsertPosition.inside_node(
-                    node,
-                    sp.layerstack.NodeStack.Mask,
-                )
-                noise_fill_effect = sp.layerstack.insert_fill(insert_position)
-                noise_fill_effect.set_name("noise_fill_effect")
-                # noise_resource = sp.resource.search(
-                #     "s:starterassets u:procedural n:Clouds 1"
-                # )[0]
-                noise_resource = sp.resource.search("Clouds 1")[0]
-                noise_fill_effect.set_source(None, noise_resource.identifier())  # None (channel)
-
-                # Set triplanar mode
-                noise_fill_effect.set_projection_mode(sp.layerstack.ProjectionMode.Triplanar)
-                # Adjust fill effect settings
-                projection_params = noise_fill_effect.get_projection_parameters()
-                projection_params.uv_transformation.scale = [2.5, 2.5]  # UV tiling
-                projection_params.hardness = 0.5  # Triplanar blend hardness
-                noise_fill_effect.set_projection_parameters(projection_params)
-
-                sp.logging.info(f"Created: {node.get_name()} - {noise_fill_effect.get_name()}")
+            # noise_resource = sp.resource.search(
+            #     "s:starterassets u:procedural n:Clouds 1"
+            # )[0]
+            noise_resource_id = self.session.resources.identifier(NOISE_QUERY)
+
+            batch = ActionBatch("Add Noise Mask")
+            for target in targets:
+                for node in target.nodes:
+                    batch.add(
+                        self._insert_noise_mask,
+                        node,
+                        noise_resource_id,
+                        group=target.label,
+                        structural=True,
+                    )
+            batch.apply()
 
         except Exception as e:  ##
             # sp.logging.warning(f"Error: {e}\nTraceback: {traceback.format_exc()}")
             sp.logging.warning(f"{e}")
 
+    @paladin_action
     def add_generator_mask(self, generator_name: str) -> None:
         """Add mask with fill effect. Then add generator resource to mask.
         Example: Curvature, Position, Light, etc.
         """
         try:
             # Get selected
-            stack = sp.textureset.get_active_stack()
-            selected_nodes = sp.layerstack.get_selected_nodes(stack)
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
 
-            # Mask
-            white_mask = sp.layerstack.MaskBackground.White
+            fill_effect_resource_id = self.session.resources.identifier(
+                GENERATOR_QUERY.format(name=generator_name),
+            )
 
-            for node in selected_nodes:
-                mask_check = sp.layerstack.LayerNode.has_mask(node)
-                if mask_check is False:  # Create mask first if doesn't exist
-                    sp.layerstack.LayerNode.add_mask(node, white_mask)
-                else:
-                    pass
-                insert_position = sp.layerstack.InsertPosition.inside_node(
-                    node,
-                    sp.layerstack.NodeStack.Mask,
-                )
-                fill_effect = sp.layerstack.insert_fill(insert_position)
-                fill_effect.set_name("generator_fill_effect")
-                fill_effect_resource = sp.resource.search(
-                    f"s:starterassets u:generator n:{generator_name}",
-                )[0]
-                fill_effect.set_source(None, fill_effect_resource.identifier())
-                # Set default uv mode
-                fill_effect.set_projection_mode(sp.layerstack.ProjectionMode.Fill)
-
-                sp.logging.info(f"Created: {node.get_name()} - {fill_effect.get_name()}")
+            batch = ActionBatch(f"Add {generator_name} Mask")
+            for target in targets:
+                for node in target.nodes:
+                    batch.add(
+                        self._insert_generator_mask,
+                        node,
+                        fill_effect_resource_id,
+                        group=target.label,
+                        structural=True,
+                    )
+            batch.apply()
 
         except Exception as e:
             # sp.logging.warning(f"Error: {e}\nTraceback: {traceback.format_exc()}")
             sp.logging.warning(f"{e}")
+
+    @paladin_action
+    def select_by_query(self, query: str) -> None:
+        """Select layers and effects of the active stack matching an index query.
+        Any selection based action can then run on them.
+
+        Args:
+            query (str): Stack index query. Ex. "t:fill n:fill_effect", "b:passthrough c:roughness"
+
+        """
+        try:
+            nodes = self.session.stack_index.query_nodes(query)
+            if not nodes:
+                sp.logging.warning(f"No layer or effect matches: {query}")
+                return
+
+            sp.layerstack.set_selected_nodes(nodes)
+            sp.logging.info(f"Selected {len(nodes)} matching: {query}")
+
+        except sp.exception.ProjectError:
+            sp.logging.warning("No project loaded. Please open or start a new project.")
+
+        except Exception as e:
+            sp.logging.warning(f"{e}")
+
+    # ---------------------------------------------------------- #
+    # Macros and chunked runs.
+
+    def start_recording(self, name: str = "Macro") -> None:
+        """Record every following action call, with its arguments, into a new macro."""
+        self.recording = Macro(name)
+        sp.logging.info(f"Recording macro: {name}")
+
+    def stop_recording(self) -> Macro | None:
+        """Stop recording. The recorded macro becomes the one replayed by default.
+
+        Returns:
+            Macro: Recorded macro. None if not recording.
+
+        """
+        macro, self.recording = self.recording, None
+        if macro is None:
+            return None
+        if macro.steps:
+            self.macro = macro
+        sp.logging.info(f"Recorded macro {macro.name}, {len(macro)} steps:\n{macro.describe()}")
+        return macro
+
+    @paladin_action
+    def replay_macro(self, macro: Macro | None = None, each_node: bool = False) -> None:
+        """Replay a macro over the selection in one batched run and one undo step.
+        Stacks, selection and channels are resolved once for the whole macro.
+        With a texture set scope, the macro runs once per texture set stack,
+        on the nodes matching the selection.
+
+        Args:
+            macro (Macro): Macro to replay. The last recorded macro if None.
+            each_node (bool): Run the macro once per selected node, instead of once
+                per stack. Ex. a paintable fill layer above every selected layer.
+
+        """
+        macro = macro or self.macro
+        if not macro or not macro.steps:
+            sp.logging.warning("No macro recorded.")
+            return
+
+        try:
+            targets = self._targets()
+
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+                return
+
+            # Each run is one stack and its nodes, treated as active and selected.
+            runs = []
+            for target in targets:
+                if each_node:
+                    runs.extend((target.stack, [node]) for node in target.nodes)
+                else:
+                    runs.append((target.stack, target.nodes))
+
+            totals = ActionBatch(macro.name)
+            totals.applied_groups = len(targets)
+            ActionBatch.totals = totals
+            with sp.layerstack.ScopedModification(macro.name):
+                for stack, nodes in runs:
+                    self.run_steps(stack, nodes, macro.steps)
+
+            sp.logging.info(f"{totals.summary()} {len(macro)} steps x {len(runs)} runs.")
+
+        except Exception as e:
+            sp.logging.warning(f"Macro not replayed: {e}")
+
+        finally:
+            ActionBatch.totals = None
+
+    def run_steps(self, stack, nodes: list, steps: list[MacroStep]) -> None:
+        """Run action calls on some nodes of one stack, treated as the active stack
+        and selection. Used by macro replay and by the chunked job runner.
+
+        Args:
+            stack (sp.textureset.Stack): Stack the actions treat as active.
+            nodes (list): Nodes the actions treat as selected.
+            steps (list[MacroStep]): Action calls, run in order.
+
+        """
+        scope = self.scope
+        self.scope = TargetScope.ACTIVE_STACK
+        try:
+            with self.session.snapshot(stack, nodes):
+                for step in steps:
+                    getattr(self, step.action)(*step.args, **step.kwargs)
+        finally:
+            self.scope = scope
+
+    def selection_targets(self) -> list[StackTarget]:
+        """Stacks and nodes the next action would change. Empty if nothing is selected."""
+        try:
+            targets = self._targets()
+            if not targets:
+                sp.logging.warning("No layer or effect selected.")
+            return targets
+
+        except sp.exception.ProjectError:
+            sp.logging.warning("No project loaded. Please open or start a new project.")
+
+        except Exception as e:
+            sp.logging.warning(f"{e}")
+
+        return []
+
+    def texture_set_names(self) -> list[str]:
+        """Texture set names for the "Chosen Texture Sets" scope. Empty if no project."""
+        try:
+            return texture_set_names()
+
+        except sp.exception.ProjectError:
+            sp.logging.warning("No project loaded. Please open or start a new project.")
+
+        except Exception as e:
+            sp.logging.warning(f"{e}")
+
+        return []
+
+    # ---------------------------------------------------------- #
+    # Targets.
+
+    def _targets(self) -> list[StackTarget]:
+        """Stacks and nodes to change, based on the selection and the current scope."""
+        return resolve_targets(self.session, self.scope, self.chosen_texture_sets)
+
+    # ---------------------------------------------------------- #
+    # Per node planning, shared by single value actions and recipes.
+
+    @staticmethod
+    def _color(channel_val: float | tuple | list):
+        """Cached color for a 0-1 value or (R, G, B) 0-1."""
+        if isinstance(channel_val, list):
+            channel_val = tuple(channel_val)
+        return preset_library.uniform_color(channel_val)
+
+    def _plan_channel_value(
+        self,
+        batch: ActionBatch,
+        target: StackTarget,
+        node,
+        channel_type,
+        color,
+    ) -> None:
+        """Plan a uniform color source for one channel, unless already set."""
+        if self._same_color(node.get_source(channel_type), color):
+            batch.skip()  # Already this value
+            return
+        batch.add(node.set_source, channel_type, color, group=target.label)  # Set Value
+
+    @staticmethod
+    def _plan_opacity(batch: ActionBatch, target: StackTarget, node, opacity_val: float) -> None:
+        """Plan opacity for every channel of the stack, unless already set."""
+        for channel in target.channels:
+            if math.isclose(node.get_opacity(channel), opacity_val, abs_tol=VALUE_TOLERANCE):
+                batch.skip()  # Already this opacity
+                continue
+            batch.add(node.set_opacity, opacity_val, channel, group=target.label)
+
+    @staticmethod
+    def _plan_blend_mode(batch: ActionBatch, target: StackTarget, node, blend_mode) -> None:
+        """Plan a blend mode for every channel of the stack, unless already set."""
+        for channel in target.channels:
+            if node.get_blending_mode(channel) == blend_mode:
+                batch.skip()  # Already this blend mode
+                continue
+            batch.add(node.set_blending_mode, blend_mode, channel, group=target.label)
+
+    @staticmethod
+    def _log_channel_value(node, channel_type) -> None:
+        node_attr_result = node.get_source(channel_type)  # Get Value
+        r, g, b = node_attr_result.get_color().value_raw
+        sp.logging.info(
+            f"Value applied: {node.get_name()} {channel_type.name}: {r:.2f}, {g:.2f}, {b:.2f}",
+        )
+
+    @staticmethod
+    def _log_opacity(target: StackTarget, node) -> None:
+        sp.logging.info("# ---------------------------------------- #")
+        for channel in target.channels:
+            channel_opacity = node.get_opacity(channel)
+            sp.logging.info(f"{node.get_name()} - {channel.name} - {channel_opacity}")
+
+    @staticmethod
+    def _log_blend_modes(target: StackTarget, node) -> None:
+        sp.logging.info(f"Selected: {target.label} {node.get_name()}")
+        for channel in target.channels:
+            blend_mode = node.get_blending_mode(channel)
+            sp.logging.info(f"{channel.name} - {blend_mode.name}")
+
+    # ---------------------------------------------------------- #
+    # Batched mutations. Planned per node and run by "ActionBatch.apply()".
+
+    @staticmethod
+    def _same_color(source, color) -> bool:
+        """Whether a channel source is a uniform color equal to color."""
+        if not hasattr(source, "get_color"):  # bitmap or substance source
+            return False
+        current = source.get_color().value_raw
+        return all(
+            math.isclose(a, b, abs_tol=VALUE_TOLERANCE)
+            for a, b in zip(current, color.value_raw, strict=True)
+        )
+
+    @staticmethod
+    def _set_active_channels(node, channels: set) -> None:
+        """Set active channels on a Fill Layer/ Effect."""
+        node.active_channels = channels
+
+    @staticmethod
+    def _ensure_mask(node) -> None:
+        """Create a white mask first if doesn't exist."""
+        if sp.layerstack.LayerNode.has_mask(node) is False:
+            sp.layerstack.LayerNode.add_mask(node, sp.layerstack.MaskBackground.White)
+
+    def _insert_paintable_fill_layer(self, selected_node, available_channels: set) -> None:
+        """Fill Layer with a Passthrough Paint Effect and a Fill Effect inside."""
+        # Insert Fill Layer at the top
+        insert_position = sp.layerstack.InsertPosition.above_node(selected_node)
+        fill_layer = sp.layerstack.insert_fill(insert_position)
+        fill_layer.set_name("fill_layer")
+        if self.verify:
+            sp.logging.info("Created Fill Layer")
+
+        # Enable available channels on Fill Layer
+        fill_layer.active_channels = available_channels
+
+        # Insert a Paint Effect inside the Fill Layer's content stack
+        insert_position = sp.layerstack.InsertPosition.inside_node(
+            fill_layer,
+            sp.layerstack.NodeStack.Content,
+        )
+        paint_effect = sp.layerstack.insert_paint(insert_position)
+        paint_effect.set_name("paint_effect_passthrough")
+        if self.verify:
+            sp.logging.info("Inserted Paint Effect inside Fill Layer")
+        # Paint Effect channels fail to activate. Activation not supported.
+        # paint_effect.active_channels = available_channels
+
+        # Set blend mode to Passthrough for the Paint Effect
+        passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
+        for channel in available_channels:
+            paint_effect.set_blending_mode(passthrough_blend_mode, channel)
+
+        # Insert a Fill Effect directly below the Paint Effect
+        insert_position = sp.layerstack.InsertPosition.below_node(paint_effect)
+        fill_effect = sp.layerstack.insert_fill(insert_position)
+        fill_effect.set_name("fill_effect")
+        fill_effect.active_channels = available_channels  # Enable channels on Fill Effect
+        if self.verify:
+            sp.logging.info("Inserted Fill Effect below Paint Effect.")
+
+    def _insert_paintable_fill_layer_group(self, selected_node, available_channels: set) -> None:
+        """Group with a Fill Layer and a Passthrough Paint Layer inside."""
+        # Insert Group Layer above selection
+        insert_position = sp.layerstack.InsertPosition.above_node(selected_node)
+        group_layer = sp.layerstack.insert_group(insert_position)
+        group_layer.set_name("group_layer")
+        if self.verify:
+            sp.logging.info(f"Created: {group_layer.get_name()}")
+
+        # Insert Fill Layer inside group layer
+        insert_position = sp.layerstack.InsertPosition.inside_node(
+            group_layer,
+            sp.layerstack.NodeStack.Substack,
+        )
+        fill_layer = sp.layerstack.insert_fill(insert_position)
+        fill_layer.set_name("fill_layer")
+        fill_layer.active_channels = available_channels  # turn on channels
+        if self.verify:
+            sp.logging.info(f"Created: {fill_layer.get_name()}")
+
+        # Insert Paint Layer inside group layer
+        insert_position = sp.layerstack.InsertPosition.above_node(fill_layer)
+        paint_layer = sp.layerstack.insert_paint(insert_position)
+        paint_layer.set_name("passthrough_paint_layer")
+        if self.verify:
+            sp.logging.info(f"Created: {paint_layer.get_name()}")
+
+        # Set blend mode to Passthrough for the Paint Layer
+        passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
+        for channel in available_channels:
+            paint_layer.set_blending_mode(passthrough_blend_mode, channel)
+        # Check blending mode
+        if self.verify:
+            blend_mode = paint_layer.get_blending_mode(list(available_channels)[0])
+            sp.logging.info(f"{paint_layer.get_name()} - {blend_mode.name}")
+
+    def _insert_passthrough_paint_layer(self, selected_node, available_channels: set) -> None:
+        """Paint Layer in Passthrough above the selected node."""
+        # Insert paint layer above selection
+        insert_position = sp.layerstack.InsertPosition.above_node(selected_node)
+        paint_layer = sp.layerstack.insert_paint(insert_position)
+        paint_layer.set_name("passthrough_paint_layer")
+        if self.verify:
+            sp.logging.info(f"Created: {paint_layer.get_name()}")
+
+        # Set blend mode to Passthrough for the Paint Layer
+        passthrough_blend_mode = sp.layerstack.BlendingMode.Passthrough
+        for channel in available_channels:
+            paint_layer.set_blending_mode(passthrough_blend_mode, channel)
+            if self.verify:
+                blend_mode = paint_layer.get_blending_mode(channel)
+                sp.logging.info(f"{channel.name} - {blend_mode.name}")
+
+    def _insert_mask_fill(self, node, resource_id) -> None:
+        """Fill Effect in the node's mask, with the greyscale slider enabled."""
+        self._ensure_mask(node)
+        insert_position = sp.layerstack.InsertPosition.inside_node(
+            node,
+            sp.layerstack.NodeStack.Mask,
+        )
+        fill_effect = sp.layerstack.insert_fill(insert_position)
+        fill_effect.set_name("fill_effect")
+        # Set and unset a fill resource to trigger the greyscale adjustment slider
+        fill_effect.set_source(None, resource_id)
+        fill_effect.reset_source()
+
+        if self.verify:
+            sp.logging.info(f"{node.get_name()} - {fill_effect.get_name()}")
+
+    def _insert_noise_mask(self, node, resource_id) -> None:
+        """Triplanar noise Fill Effect in the node's mask."""
+        self._ensure_mask(node)
+        insert_position = sp.layerstack.InsertPosition.inside_node(
+            node,
+            sp.layerstack.NodeStack.Mask,
+        )
+        noise_fill_effect = sp.layerstack.insert_fill(insert_position)
+        noise_fill_effect.set_name("noise_fill_effect")
+        noise_fill_effect.set_source(None, resource_id)  # None (channel)
+
+        # Set triplanar mode
+        noise_fill_effect.set_projection_mode(sp.layerstack.ProjectionMode.Triplanar)
+        # Adjust fill effect settings
+        projection_params = noise_fill_effect.get_projection_parameters()
+        projection_params.uv_transformation.scale = [2.5, 2.5]  # UV tiling
+        projection_params.hardness = 0.5  # Triplanar blend hardness
+        noise_fill_effect.set_projection_parameters(projection_params)
+
+        if self.verify:
+            sp.logging.info(f"Created: {node.get_name()} - {noise_fill_effect.get_name()}")
+
+    def _insert_generator_mask(self, node, resource_id) -> None:
+        """Generator Fill Effect in the node's mask."""
+        self._ensure_mask(node)
+        insert_position = sp.layerstack.InsertPosition.inside_node(
+            node,
+            sp.layerstack.NodeStack.Mask,
+        )
+        fill_effect = sp.layerstack.insert_fill(insert_position)
+        fill_effect.set_name("generator_fill_effect")
+        fill_effect.set_source(None, resource_id)
+        # Set default uv mode
+        fill_effect.set_projection_mode(sp.layerstack.ProjectionMode.Fill)
+
+        if self.verify:
+            sp.logging.info(f"Created: {node.get_name()} - {fill_effect.get_name()}")
@@ -4,13 +4,24 @@
 This module contains the PySide UI window and button connections.
 """
 
-# import importlib
+import sys
+import time
 
-from PySide6.QtCore import QSize, Qt, Signal
+import substance_painter as sp
+from PySide6.QtCore import QFileSystemWatcher, QRectF, QSize, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QPainter
 from PySide6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
     QFrame,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QPlainTextEdit,
+    QProgressBar,
     QScrollArea,
     QSizePolicy,
     QTabWidget,
@@ -19,52 +30,280 @@ from PySide6.QtWidgets import (
 )
 
 # from . import debug_info, paladin_logic
-from .debug_info import DebugInfo
-from .paladin_logic import PaladinLogic
+# Debug helpers, hot reload and plugin logic are imported on first use.
+# See "logic", "reloader" and "build_debug_tab()".
+from .import_timer import IMPORT_TIMER
+from .job_runner import JobRunner
+from .preset_library import PresetRow
+from .session import PaladinSession
+from .target_scope import TargetScope
 
-# importlib.reload(debug_info)
-# importlib.reload(paladin_logic)
+# Shared style for titled CustomButtons. Parsed once for the whole plugin window.
+# Turn off QLabel color, only use QFrame. Was doubling values.
+TITLED_BUTTON_STYLE = """
+    QFrame[titled="true"] {
+    background-color: rgb(42, 42, 42);
+    border: 1px solid rgba(102, 102, 102, 100);
+    border-radius: 3px;
+    padding: 0px;
+    }
+    QFrame[titled="true"]:hover {
+    background-color: rgb(36, 36, 36);
+    border: 1px solid rgba(200, 200, 255, 100);
+    }
+    QFrame[titled="true"] QLabel {
+    background-color: transparent;
+    border: 0px;
+    border-radius: 0px;
+    padding: 0px;
+    }
+"""
 
 
 class PainterPaladinUI(QWidget):
-    """Pyside UI window with tabs for the plugin."""
+    """Pyside UI window with tabs for the plugin.
+    Tab content is built the first time a tab is shown, unless "defer_tabs" is False.
+    """
+
+    # (title, builder method) per tab.
+    TABS = (
+        ("Toolset", "build_toolset_tab"),
+        ("Debug", "build_debug_tab"),
+        ("Extra", "build_extra_tab"),
+    )
+
+    def __init__(
+        self,
+        session: PaladinSession | None = None,
+        defer_tabs: bool = True,
+        parent=None,
+    ):
+        """Initialize the plugin window.
+
+        Args:
+            session (PaladinSession): Shared plugin caches. A new one if None.
+            defer_tabs (bool): Build each tab the first time it is shown, instead of all now.
+            parent: The parent widget in Qt's hierarchy. Defaults to None.
 
-    def __init__(self, parent=None):
+        """
         super().__init__(parent)
 
+        # Session caches are shared with the plugin. Plugin logic is created on first click.
+        self.session = session or PaladinSession()
+        self._logic = None
+        self._job_runner = None
+        # Plugin module sources, hashed in idle time after startup.
+        # "hot_reload()" applies later edits.
+        self._reloader = None
+
         # Create layout
-        self.setup_ui()
+        self.setup_ui(defer_tabs)
+        QTimer.singleShot(0, self.track_sources)
+
+    @property
+    def logic(self):
+        """Shared plugin logic for all buttons. Imported and created on first use.
+
+        Returns:
+            PaladinLogic: Plugin logic using the window's session.
+
+        """
+        if self._logic is None:
+            with IMPORT_TIMER.record():
+                from .paladin_logic import PaladinLogic
+
+            self._logic = PaladinLogic(self.session)
+        return self._logic
+
+    @property
+    def reloader(self):
+        """Tracks plugin module sources for "hot_reload()". Created by "track_sources()".
+
+        Returns:
+            ModuleReloader: Source hashes as of its creation or last reload.
+
+        """
+        if self._reloader is None:
+            self.track_sources()
+        return self._reloader
+
+    def track_sources(self) -> None:
+        """Hash the plugin module sources once, so later edits can be hot reloaded.
+        Hot reload is imported here, not at plugin start.
+        """
+        if self._reloader is not None:
+            return
+        with IMPORT_TIMER.record():
+            from .hot_reload import ModuleReloader
 
-    def setup_ui(self):
-        """Set up all main UI elements."""
-        # ----------------------------------------------- #
-        # -------------------- Setup -------------------- #
+        self._reloader = ModuleReloader()
+
+    @property
+    def job_runner(self) -> JobRunner:
+        """Runs per node actions on large selections in chunks. Created on first use."""
+        if self._job_runner is None:
+            self._job_runner = JobRunner(self.logic, parent=self)
+            # Lambdas look the handlers up on each call, so they follow a hot reload.
+            self._job_runner.started.connect(
+                lambda name, total: self.show_job_progress(name, total),
+            )
+            self._job_runner.progress.connect(
+                lambda done, total: self.update_job_progress(done, total),
+            )
+            self._job_runner.finished.connect(lambda summary: self.job_widget.hide())
+        return self._job_runner
+
+    def run_action(self, action: str, *args, **kwargs) -> None:
+        """Run a plugin action. Per node actions on large selections run as a chunked job.
+
+        Args:
+            action (str): PaladinLogic method name. Ex. "set_opacity"
+            *args: Positional arguments of the call.
+            **kwargs: Keyword arguments of the call.
+
+        """
+        from .paladin_logic import PER_NODE_ACTIONS
+
+        if action in PER_NODE_ACTIONS:
+            self.job_runner.start(action, *args, **kwargs)
+        else:
+            getattr(self.logic, action)(*args, **kwargs)
+
+    def setup_ui(self, defer_tabs: bool = True):
+        """Set up all main UI elements. Tab content is built by "build_tab()"."""
         # Create main layout
         main_layout = QVBoxLayout(self)
+        self.setStyleSheet(TITLED_BUTTON_STYLE)
+
+        # Preset row layouts and widgets per tab, filled when the tab is built.
+        self._preset_sections: dict[str, QVBoxLayout] = {}
+        self._preset_widgets: dict[str, dict[str, QWidget]] = {}
+        # Reload preset rows when preset files are edited. No restart needed.
+        self.preset_watcher = QFileSystemWatcher(self)
+        self.preset_watcher.fileChanged.connect(lambda path: self.reload_presets())
+        self.preset_watcher.directoryChanged.connect(lambda path: self.reload_presets())
+        self.watch_presets()
 
-        # Create QTabWidget to hold tabs.
-        tab_main_widget = QTabWidget()
-
-        # Create tabs with layout and scroll areas.
-        tab1_scroll_area = QScrollArea()
-        tab1_scroll_area.setWidgetResizable(True)
-        tab1_content = QWidget()
-        tab1_scroll_area.setWidget(tab1_content)
-        tab1_layout = QVBoxLayout(tab1_content)
-        tab2_scroll_area = QScrollArea()
-        tab2_scroll_area.setWidgetResizable(True)
-        tab2_content = QWidget()
-        tab2_scroll_area.setWidget(tab2_content)
-        tab2_layout = QVBoxLayout(tab2_content)
-        tab3_scroll_area = QScrollArea()
-        tab3_scroll_area.setWidgetResizable(True)
-        tab3_content = QWidget()
-        tab3_scroll_area.setWidget(tab3_content)
-        tab3_layout = QVBoxLayout(tab3_content)
-
-        # ----------------------------------------------- #
-        # -------------------- TAB 1 -------------------- #
-        # Toolset Tab
+        # Create QTabWidget to hold tabs. Each tab is an empty scroll area until built.
+        self.tab_main_widget = QTabWidget()
+        self._built_tabs: set[int] = set()
+        for title, _builder in self.TABS:
+            scroll_area = QScrollArea()
+            scroll_area.setWidgetResizable(True)
+            self.tab_main_widget.addTab(scroll_area, title)
+        main_layout.addWidget(self.tab_main_widget)
+
+        # Progress of chunked jobs, hidden while idle.
+        self.job_widget = QWidget()
+        job_layout = QHBoxLayout(self.job_widget)
+        job_layout.setContentsMargins(0, 0, 0, 0)
+        self.job_label = QLabel()
+        job_layout.addWidget(self.job_label)
+        self.job_progress_bar = QProgressBar()
+        self.job_progress_bar.setFormat("%v / %m nodes")
+        job_layout.addWidget(self.job_progress_bar, 1)
+        cancel_job_btn = CustomButton(title="Cancel")
+        cancel_job_btn.clicked.connect(lambda: self.job_runner.cancel())
+        job_layout.addWidget(cancel_job_btn)
+        self.job_widget.hide()
+        main_layout.addWidget(self.job_widget)
+
+        if defer_tabs:
+            # Only the visible tab now. Others on first show or "prebuild_tabs()".
+            self.build_tab(self.tab_main_widget.currentIndex())
+            self.tab_main_widget.currentChanged.connect(lambda index: self.build_tab(index))
+        else:
+            for index in range(self.tab_main_widget.count()):
+                self.build_tab(index)
+
+    def build_tab(self, index: int) -> None:
+        """Build the content of a tab, once.
+
+        Args:
+            index (int): Tab index. 0 Toolset, 1 Debug, 2 Extra.
+
+        """
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+
+        content = QWidget()
+        layout = QVBoxLayout(content)
+        getattr(self, self.TABS[index][1])(layout)
+        layout.addStretch()
+        self.tab_main_widget.widget(index).setWidget(content)
+
+    def prebuild_tabs(self) -> None:
+        """Build the remaining tabs in idle time, one per event loop pass."""
+        for index in range(self.tab_main_widget.count()):
+            if index not in self._built_tabs:
+                self.build_tab(index)
+                QTimer.singleShot(0, self.prebuild_tabs)
+                return
+
+    def build_toolset_tab(self, layout: QVBoxLayout) -> None:
+        """Toolset tab. Scope, selection, fill layers, channels, colors, opacity and masks."""
+        # -------------------- #
+        # Target scope. Which stacks selection based buttons apply to.
+        scope_layout = QHBoxLayout()
+        scope_label = QLabel("Scope:")
+        scope_label.setFixedWidth(88)
+        scope_layout.addWidget(scope_label)
+        # Dropdown. Active stack, texture set stacks, all or chosen texture sets.
+        self.scope_combo = QComboBox()
+        for scope in TargetScope:
+            self.scope_combo.addItem(scope.value, scope)
+        self.scope_combo.currentIndexChanged.connect(self.set_target_scope)
+        scope_layout.addWidget(self.scope_combo, 1)
+        # Button. Pick texture sets for "Chosen Texture Sets".
+        choose_texture_sets_btn = CustomButton(title="Choose Texture Sets")
+        choose_texture_sets_btn.clicked.connect(self.choose_texture_sets)
+        scope_layout.addWidget(choose_texture_sets_btn, 1)
+        layout.addLayout(scope_layout)
+
+        # -------------------- #
+        # Select layers and effects by query. Ex. "t:fill n:fill_effect m:black"
+        select_query_layout = QHBoxLayout()
+        select_query_label = QLabel("Select Query:")
+        select_query_label.setFixedWidth(88)
+        select_query_layout.addWidget(select_query_label)
+        # Query text. Enter key also selects.
+        self.select_query_edit = QLineEdit()
+        self.select_query_edit.setPlaceholderText("t:fill n:fill_effect m:black b:passthrough")
+        self.select_query_edit.setToolTip(
+            "t:type  n:name  p:parent  m:black/white/any/none  c:channel  b:blend mode",
+        )
+        self.select_query_edit.returnPressed.connect(
+            lambda: self.logic.select_by_query(self.select_query_edit.text()),
+        )
+        select_query_layout.addWidget(self.select_query_edit, 2)
+        # Button. Select matching.
+        select_query_btn = CustomButton(title="Select Matching")
+        select_query_btn.clicked.connect(
+            lambda: self.logic.select_by_query(self.select_query_edit.text()),
+        )
+        select_query_layout.addWidget(select_query_btn, 1)
+        layout.addLayout(select_query_layout)
+
+        # -------------------- #
+        # Record a sequence of button clicks, then replay it in one run and one undo step.
+        macro_layout = QHBoxLayout()
+        macro_label = QLabel("Macro:")
+        macro_label.setFixedWidth(88)
+        macro_layout.addWidget(macro_label)
+        # Button. Start/ stop recording.
+        self.record_macro_btn = CustomButton(title="Record")
+        self.record_macro_btn.clicked.connect(self.toggle_macro_recording)
+        macro_layout.addWidget(self.record_macro_btn)
+        # Button. Replay once over the selection.
+        replay_macro_btn = CustomButton(title="Replay")
+        replay_macro_btn.clicked.connect(lambda: self.logic.replay_macro())
+        macro_layout.addWidget(replay_macro_btn)
+        # Button. Replay once per selected node.
+        replay_macro_each_btn = CustomButton(title="Replay Per Node")
+        replay_macro_each_btn.clicked.connect(lambda: self.logic.replay_macro(each_node=True))
+        macro_layout.addWidget(replay_macro_each_btn)
+        layout.addLayout(macro_layout)
 
         # -------------------- #
         # Paintable fill layer creation.
@@ -74,7 +313,7 @@ class PainterPaladinUI(QWidget):
             title="Paintable Fill Layer (Passthrough)",
         )
         paintable_fill_layer_btn.clicked.connect(
-            lambda: PaladinLogic().paintable_fill_layer(),
+            lambda: self.logic.paintable_fill_layer(),
         )
         paintable_fill_layout.addWidget(paintable_fill_layer_btn)
         # Button. Create Group with Fill Layer and Paint Layer in Passthrough.
@@ -82,11 +321,11 @@ class PainterPaladinUI(QWidget):
             title="Paintable Fill Layer Group (Passthrough)",
         )
         paintable_fill_layer_btn.clicked.connect(
-            lambda: PaladinLogic().paintable_fill_layer_group(),
+            lambda: self.logic.paintable_fill_layer_group(),
         )
         paintable_fill_layout.addWidget(paintable_fill_layer_btn)
         # Add to tab layout.
-        tab1_layout.addLayout(paintable_fill_layout)
+        layout.addLayout(paintable_fill_layout)
 
         # -------------------- #
         # Channels enable/ disable. For Fill layer.
@@ -94,113 +333,21 @@ class PainterPaladinUI(QWidget):
         # Button. Enable all channels for selected.
         apply_channels_btn = CustomButton(title="Enable All Channels (Fill Layer)")
         apply_channels_btn.clicked.connect(
-            lambda: PaladinLogic().enable_channels_for_selected_fill(),
+            lambda: self.run_action("enable_channels_for_selected_fill"),
         )
         channels_toggle_layout.addWidget(apply_channels_btn)
         # Button. Enable Base Color only.
         disable_all_except_base_btn = CustomButton(title="Color Channel Only (Fill Layer)")
         disable_all_except_base_btn.clicked.connect(
-            lambda: PaladinLogic().disable_all_except_base_color(),
+            lambda: self.run_action("disable_all_except_base_color"),
         )
         channels_toggle_layout.addWidget(disable_all_except_base_btn)
         # Add to tab layout.
-        tab1_layout.addLayout(channels_toggle_layout)
-
-        # -------------------- #
-        # Set skin color values.
-        set_skin_color_layout = QHBoxLayout()
-        # Create row title.
-        skin_color_label = QLabel("Skin Color (Fill):")
-        skin_color_label.setFixedWidth(88)
-        set_skin_color_layout.addWidget(skin_color_label)
-        # RGB values.
-        skin_color_values = [
-            (221, 176, 166),  # Very Light
-            (251, 179, 153),  # Light
-            (200, 151, 129),  # Medium
-            (207, 147, 113),
-            (206, 128, 95),  # Tan
-            (140, 85, 61),  # Dark
-        ]
-        # Buttons.
-        for value in skin_color_values:
-            set_skin_color_btn = CustomButton(value)
-            rgb_0_1 = tuple(rgb_val / 255 for rgb_val in value)
-            set_skin_color_btn.clicked.connect(
-                lambda v=rgb_0_1: PaladinLogic().set_channel_value(v, "BaseColor"),
-            )
-            set_skin_color_layout.addWidget(set_skin_color_btn, 1)
-        # Add to tab layout.
-        tab1_layout.addLayout(set_skin_color_layout)
-
-        # -------------------- #
-        # Button. Set monochrome color values.
-        set_mono_color_layout = QHBoxLayout()
-        # Create row title.
-        mono_color_label = QLabel("Mono Color (Fill):")
-        mono_color_label.setFixedWidth(88)
-        set_mono_color_layout.addWidget(mono_color_label)
-        # Grayscale values.
-        mono_color_values = [0.0, 0.25, 0.5, 0.75, 1.0]
-        # Buttons.
-        for value in mono_color_values:
-            rgb_val = int(value * 255)
-            set_mono_color_btn = CustomButton(rgb_val)
-            set_mono_color_btn.clicked.connect(
-                lambda v=value: PaladinLogic().set_channel_value(v, "BaseColor"),
-            )
-            set_mono_color_layout.addWidget(set_mono_color_btn)
-        # Add to tab layout.
-        tab1_layout.addLayout(set_mono_color_layout)
-
-        # -------------------- #
-        # Set roughness values.
-        set_roughness_layout = QHBoxLayout()
-        # Create row title.
-        roughness_label = QLabel("Roughness (Fill):")
-        roughness_label.setFixedWidth(88)
-        set_roughness_layout.addWidget(roughness_label)
-        # Grayscale values.
-        roughness_values = [0.0, 0.25, 0.5, 0.75, 1.0]
-        # Buttons.
-        for value in roughness_values:
-            set_roughness_btn = CustomButton(title=f"{value}")
-            set_roughness_btn.clicked.connect(
-                lambda v=value: PaladinLogic().set_channel_value(v, "Roughness"),
-            )
-            set_roughness_layout.addWidget(set_roughness_btn)
-        # Add to tab layout.
-        tab1_layout.addLayout(set_roughness_layout)
-
-        # -------------------- #
-        # Buttons. Set metallic values.
-        set_metallic_layout = QHBoxLayout()
-        metallic_label = QLabel("Metallic (Fill):")
-        metallic_label.setFixedWidth(88)
-        set_metallic_layout.addWidget(metallic_label)
-        metallic_values = [0.0, 0.25, 0.5, 0.75, 1.0]
-        for value in metallic_values:
-            set_metallic_btn = CustomButton(title=f"{value}")
-            set_metallic_btn.clicked.connect(
-                lambda v=value: PaladinLogic().set_channel_value(v, "Metallic"),
-            )
-            set_metallic_layout.addWidget(set_metallic_btn)
-        tab1_layout.addLayout(set_metallic_layout)
+        layout.addLayout(channels_toggle_layout)
 
         # -------------------- #
-        # Buttons. Set opacity for all channels, for selected.
-        set_opacity_layout = QHBoxLayout()
-        opacity_label = QLabel("Opacity:")
-        opacity_label.setFixedWidth(88)
-        set_opacity_layout.addWidget(opacity_label)
-        opacity_values = [0.0, 0.25, 0.5, 0.75, 1.0]
-        for value in opacity_values:
-            set_opacity_btn = CustomButton(title=f"{value}")
-            set_opacity_btn.clicked.connect(
-                lambda v=value: PaladinLogic().set_opacity(opacity_val=v),
-            )
-            set_opacity_layout.addWidget(set_opacity_btn)
-        tab1_layout.addLayout(set_opacity_layout)
+        # Preset rows. Skin, mono, roughness, metallic and opacity. From preset JSON files.
+        self.add_preset_section(layout, "Toolset")
 
         # -------------------- #
         # Add or set masks.
@@ -208,16 +355,16 @@ class PainterPaladinUI(QWidget):
         # Button.
         black_mask_btn = CustomButton(title="Set Black Mask")
         black_mask_btn.clicked.connect(
-            lambda: PaladinLogic().setup_mask(background="Black"),
+            lambda: self.run_action("setup_mask", background="Black"),
         )
         set_mask_layout.addWidget(black_mask_btn)
         # Button.
         white_mask_btn = CustomButton(title="Set White Mask")
         white_mask_btn.clicked.connect(
-            lambda: PaladinLogic().setup_mask(background="White"),
+            lambda: self.run_action("setup_mask", background="White"),
         )
         set_mask_layout.addWidget(white_mask_btn)
-        tab1_layout.addLayout(set_mask_layout)
+        layout.addLayout(set_mask_layout)
 
         # -------------------- #
         # Remove mask and add mask with fill.
@@ -225,16 +372,16 @@ class PainterPaladinUI(QWidget):
         # Button. Remove Mask
         remove_layer_mask_btn = CustomButton(title="Remove Mask")
         remove_layer_mask_btn.clicked.connect(
-            lambda: PaladinLogic().remove_layer_mask(),
+            lambda: self.run_action("remove_layer_mask"),
         )
         mask_01_layout.addWidget(remove_layer_mask_btn)
         # Button. Add fill effect to mask for transparency control.
         add_mask_fill = CustomButton(title="Add Mask Fill")
         add_mask_fill.clicked.connect(
-            lambda: PaladinLogic().add_mask_fill(),
+            lambda: self.run_action("add_mask_fill"),
         )
         mask_01_layout.addWidget(add_mask_fill)
-        tab1_layout.addLayout(mask_01_layout)
+        layout.addLayout(mask_01_layout)
 
         # -------------------- #
         # Set channels to passthrough and create passthrough paint layer.
@@ -242,97 +389,112 @@ class PainterPaladinUI(QWidget):
         # Button. Set blending mode to passthrough.
         set_passthrough_mode_btn = CustomButton(title="Set Passthrough Mode")
         set_passthrough_mode_btn.clicked.connect(
-            lambda: PaladinLogic().set_passthrough_mode(),
+            lambda: self.run_action("set_passthrough_mode"),
         )
         passthrough_btns_layout.addWidget(set_passthrough_mode_btn)
         # Button. Passthrough paint layer.
         add_passthrough_paint_layer_btn = CustomButton(title="Add Passthrough Layer")
         add_passthrough_paint_layer_btn.clicked.connect(
-            lambda: PaladinLogic().add_passthrough_paint_layer(),
+            lambda: self.logic.add_passthrough_paint_layer(),
         )
         passthrough_btns_layout.addWidget(add_passthrough_paint_layer_btn)
-        tab1_layout.addLayout(passthrough_btns_layout)
+        layout.addLayout(passthrough_btns_layout)
 
-        # ----------------------------------------------- #
-        # -------------------- TAB 2 -------------------- #
-        # Debug tab.
+    def build_debug_tab(self, layout: QVBoxLayout) -> None:
+        """Debug tab. Environment info, windows, execution mode, profiler and API search."""
+        with IMPORT_TIMER.record():
+            from .debug_info import DebugInfo
 
         # -------------------- #
         # Buttons. Get helpful info.
         envrionment_info_btn = CustomButton(title="Environment Info (Log Window)")
         envrionment_info_btn.clicked.connect(DebugInfo.environment_info)
-        tab2_layout.addWidget(envrionment_info_btn)
+        layout.addWidget(envrionment_info_btn)
 
         logging_example_btn = CustomButton(title="Logging Example (Log Window)")
         logging_example_btn.clicked.connect(DebugInfo.logging_example)
-        tab2_layout.addWidget(logging_example_btn)
+        layout.addWidget(logging_example_btn)
 
         log_window_btn = CustomButton(title="Toggle Log Window")
         log_window_btn.clicked.connect(lambda: DebugInfo().toggle_window("Log Window"))
-        tab2_layout.addWidget(log_window_btn)
+        layout.addWidget(log_window_btn)
 
         python_console_btn = CustomButton(title="Toggle Python Console")
         python_console_btn.clicked.connect(
             lambda: DebugInfo().toggle_window("pythonConsole"),
         )
-        tab2_layout.addWidget(python_console_btn)
+        layout.addWidget(python_console_btn)
 
         available_qt_windows_btn = CustomButton(title="Print Available Qt Windows")
         available_qt_windows_btn.clicked.connect(DebugInfo.available_qt_windows)
-        tab2_layout.addWidget(available_qt_windows_btn)
+        layout.addWidget(available_qt_windows_btn)
 
-        layer_help_btn = CustomButton(title="Selected Layer help()")
-        layer_help_btn.clicked.connect(DebugInfo.layer_help)
-        tab2_layout.addWidget(layer_help_btn)
+        # Button. Toggle between quiet (fast) and verify (read back and log every value).
+        self.execution_mode_btn = CustomButton(
+            title=f"Execution Mode: {self.logic.execution_mode.value}",
+        )
+        self.execution_mode_btn.clicked.connect(self.toggle_execution_mode)
+        layout.addWidget(self.execution_mode_btn)
 
         # -------------------- #
-        # Buttons. Python module help().
-        module_help_layout = QHBoxLayout()
+        # Buttons. Time API calls and actions. Costs nothing while off.
+        api_profiler_layout = QHBoxLayout()
+        self.api_profiler_btn = CustomButton(title="API Profiler: Off")
+        self.api_profiler_btn.clicked.connect(self.toggle_api_profiler)
+        api_profiler_layout.addWidget(self.api_profiler_btn)
 
-        ui_module_help_btn = CustomButton(title="ui")
-        ui_module_help_btn.clicked.connect(lambda: DebugInfo.module_help("ui"))
-        module_help_layout.addWidget(ui_module_help_btn)
+        dump_api_profile_btn = CustomButton(title="Dump API Profile (Log Window)")
+        dump_api_profile_btn.clicked.connect(lambda: self.session.profiler.dump())
+        api_profiler_layout.addWidget(dump_api_profile_btn)
 
-        layerstack_module_help_btn = CustomButton(title="layerstack")
-        layerstack_module_help_btn.clicked.connect(
-            lambda: DebugInfo().module_help("layerstack"),
-        )
-        module_help_layout.addWidget(layerstack_module_help_btn)
+        reset_api_profile_btn = CustomButton(title="Reset API Profile")
+        reset_api_profile_btn.clicked.connect(lambda: self.session.profiler.reset())
+        api_profiler_layout.addWidget(reset_api_profile_btn)
+        layout.addLayout(api_profiler_layout)
 
-        textureset_module_help_btn = CustomButton(title="textureset")
-        textureset_module_help_btn.clicked.connect(
-            lambda: DebugInfo().module_help("textureset"),
-        )
-        module_help_layout.addWidget(textureset_module_help_btn)
+        # Button. Plugin import times, including imports deferred to first use.
+        import_time_report_btn = CustomButton(title="Import Time Report (Log Window)")
+        import_time_report_btn.clicked.connect(IMPORT_TIMER.dump)
+        layout.addWidget(import_time_report_btn)
 
-        colormanagement_module_help_btn = CustomButton(title="colormanagement")
-        colormanagement_module_help_btn.clicked.connect(
-            lambda: DebugInfo().module_help("colormanagement"),
-        )
-        module_help_layout.addWidget(colormanagement_module_help_btn)
-        logging_module_help_btn = CustomButton(title="logging")
-        logging_module_help_btn.clicked.connect(lambda: DebugInfo.module_help("logging"))
-        module_help_layout.addWidget(logging_module_help_btn)
-
-        resource_module_help_btn = CustomButton(title="resource")
-        resource_module_help_btn.clicked.connect(
-            lambda: DebugInfo().module_help("resource"),
-        )
-        module_help_layout.addWidget(resource_module_help_btn)
+        # Button. Apply plugin source edits without restarting the plugin.
+        hot_reload_btn = CustomButton(title="Hot Reload Changed Modules")
+        hot_reload_btn.clicked.connect(lambda: self.hot_reload())
+        layout.addWidget(hot_reload_btn)
 
-        # Add to tab layout.
-        tab2_layout.addLayout(module_help_layout)
+        # -------------------- #
+        # API search. Instant search of the substance_painter API and the selected node's class.
+        api_search_layout = QHBoxLayout()
+        self.api_search_edit = QLineEdit()
+        self.api_search_edit.setPlaceholderText("Search API. Ex. set_source, c:FillLayerNode")
+        self.api_search_edit.setToolTip("c:class  k:kind (function, method, enum...)  words")
+        self.api_search_edit.textChanged.connect(self.search_api)
+        api_search_layout.addWidget(self.api_search_edit, 2)
+
+        selected_node_api_btn = CustomButton(title="Selected Node")
+        selected_node_api_btn.clicked.connect(self.search_selected_node_api)
+        api_search_layout.addWidget(selected_node_api_btn, 1)
+        layout.addLayout(api_search_layout)
+
+        self.api_results_list = QListWidget()
+        self.api_results_list.setMinimumHeight(160)
+        self.api_results_list.currentRowChanged.connect(self.show_api_entry)
+        layout.addWidget(self.api_results_list)
+
+        self.api_doc_view = QPlainTextEdit()
+        self.api_doc_view.setReadOnly(True)
+        self.api_doc_view.setMinimumHeight(120)
+        layout.addWidget(self.api_doc_view)
+        self._api_results = []
 
         # -------------------- #
         # Button. For testing.
         test_code_btn = CustomButton(title="Test Code")
         test_code_btn.clicked.connect(lambda: DebugInfo().test_code())
-        tab2_layout.addWidget(test_code_btn)
-
-        # ----------------------------------------------- #
-        # -------------------- TAB 3 -------------------- #
-        # Extra tab.
+        layout.addWidget(test_code_btn)
 
+    def build_extra_tab(self, layout: QVBoxLayout) -> None:
+        """Extra tab. Mask generators and additional color presets."""
         # -------------------- #
         # Add noise mask.  Add curvature mask.
         # Works as new mask or pre-existing mask.
@@ -340,16 +502,16 @@ class PainterPaladinUI(QWidget):
         # Button.
         add_noise_mask_btn = CustomButton(title="Noise Mask")
         add_noise_mask_btn.clicked.connect(
-            lambda: PaladinLogic().add_noise_mask(),
+            lambda: self.run_action("add_noise_mask"),
         )
         mask_effect_01_layout.addWidget(add_noise_mask_btn)
         # Button.
         add_curvature_mask_btn = CustomButton(title="Curvature Mask")
         add_curvature_mask_btn.clicked.connect(
-            lambda: PaladinLogic().add_generator_mask("Curvature"),
+            lambda: self.run_action("add_generator_mask", "Curvature"),
         )
         mask_effect_01_layout.addWidget(add_curvature_mask_btn)
-        tab3_layout.addLayout(mask_effect_01_layout)
+        layout.addLayout(mask_effect_01_layout)
 
         # -------------------- #
         # Add position mask.  Add light mask.
@@ -358,85 +520,319 @@ class PainterPaladinUI(QWidget):
         # Button.
         add_position_mask_btn = CustomButton(title="Position Mask")
         add_position_mask_btn.clicked.connect(
-            lambda: PaladinLogic().add_generator_mask("Position"),
+            lambda: self.run_action("add_generator_mask", "Position"),
         )
         mask_effect_02_layout.addWidget(add_position_mask_btn)
         # Button.
         add_light_mask_btn = CustomButton(title="Light Mask")
         add_light_mask_btn.clicked.connect(
-            lambda: PaladinLogic().add_generator_mask("Light"),
+            lambda: self.run_action("add_generator_mask", "Light"),
         )
         mask_effect_02_layout.addWidget(add_light_mask_btn)
-        tab3_layout.addLayout(mask_effect_02_layout)
+        layout.addLayout(mask_effect_02_layout)
 
         # -------------------- #
-        # Set metal color values.
-        # As in BaseColor picked from metal images.
-        set_metal_color_layout = QHBoxLayout()
-        # Row title.
-        metal_color_label = QLabel("Metal Color (Fill):")
-        metal_color_label.setFixedWidth(88)
-        set_metal_color_layout.addWidget(metal_color_label)
-        # RGB values.
-        metal_color_values = [
-            (176, 174, 174),
-            (160, 152, 147),
-            (209, 127, 61),
-            (114, 67, 54),
-            (111, 156, 200),
-            (37, 123, 174),
-        ]
-        # Buttons.
-        for value in metal_color_values:
-            set_metal_color_btn = CustomButton(value)
-            rgb_0_1 = tuple(rgb_val / 255 for rgb_val in value)
-            set_metal_color_btn.clicked.connect(
-                lambda v=rgb_0_1: PaladinLogic().set_channel_value(v, "BaseColor"),
-            )
-            set_metal_color_layout.addWidget(set_metal_color_btn)
-        # Add to tab layout.
-        tab3_layout.addLayout(set_metal_color_layout)
+        # Preset rows. Metal and basic colors. From preset JSON files.
+        self.add_preset_section(layout, "Extra")
 
-        # -------------------- #
-        # Buttons. Set basic color values.
-        set_basic_color_layout = QHBoxLayout()
-        basic_color_label = QLabel("Basic Color (Fill):")
-        basic_color_label.setFixedWidth(88)
-        set_basic_color_layout.addWidget(basic_color_label)
-        basic_color_values = [
-            (255, 0, 0),  # Red
-            (255, 255, 0),  # Yellow
-            (0, 255, 0),  # Green
-            (0, 255, 255),  # Cyan
-            (0, 0, 255),  # Blue
-            (255, 0, 255),  # Magenta
-        ]
-        for value in basic_color_values:
-            set_basic_color_btn = CustomButton(value)
-            rgb_0_1 = tuple(rgb_val / 255 for rgb_val in value)
-            set_basic_color_btn.clicked.connect(
-                lambda v=rgb_0_1: PaladinLogic().set_channel_value(v, "BaseColor"),
+    # ---------------------------------------------------------- #
+    # Preset rows.
+
+    def add_preset_section(self, layout: QVBoxLayout, tab: str) -> None:
+        """Add the preset rows of a tab. Rows are rebuilt when their preset file changes.
+
+        Args:
+            layout (QVBoxLayout): Tab layout.
+            tab (str): Preset tab name. "Toolset" or "Extra".
+
+        """
+        section_layout = QVBoxLayout()
+        section_layout.setContentsMargins(0, 0, 0, 0)
+        self._preset_sections[tab] = section_layout
+        self._preset_widgets[tab] = {}
+        for preset_row in self.session.presets.rows(tab):
+            row_widget = self.preset_row_widget(preset_row)
+            self._preset_widgets[tab][preset_row.id] = row_widget
+            section_layout.addWidget(row_widget)
+        layout.addLayout(section_layout)
+
+    def preset_row_widget(self, preset_row: PresetRow) -> QWidget:
+        """Row title and swatches for one preset row."""
+        row_widget = QWidget()
+        row_layout = QHBoxLayout(row_widget)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        # Create row title.
+        row_label = QLabel(preset_row.title)
+        row_label.setFixedWidth(88)
+        row_layout.addWidget(row_label)
+        # Swatches. Colors, or gray buttons with the value as text.
+        if preset_row.style == "label":
+            swatch_row = SwatchRow(values=preset_row.values, labels=preset_row.labels)
+        else:
+            swatch_row = SwatchRow(values=preset_row.values, colors=preset_row.colors)
+        swatch_row.clicked.connect(lambda v, r=preset_row: self.apply_preset(r, v))
+        row_layout.addWidget(swatch_row, 1)
+        return row_widget
+
+    def apply_preset(self, preset_row: PresetRow, value) -> None:
+        """Apply the clicked swatch value with the row's action."""
+        if preset_row.action == "set_opacity":
+            self.run_action("set_opacity", opacity_val=value)
+        elif preset_row.action == "apply_recipe":
+            self.run_action(
+                "apply_recipe",
+                dict(value.channel_values),
+                value.opacity,
+                value.blend_mode,
+                recipe_name=value.title,
             )
-            set_basic_color_layout.addWidget(set_basic_color_btn)
-        tab3_layout.addLayout(set_basic_color_layout)
+        else:
+            self.run_action("set_channel_value", value, preset_row.channel)
+
+    def watch_presets(self) -> None:
+        """Watch preset files and folders. Replaced files need to be added again."""
+        watched = set(self.preset_watcher.files() + self.preset_watcher.directories())
+        new_paths = [path for path in self.session.presets.watch_paths() if path not in watched]
+        if new_paths:
+            self.preset_watcher.addPaths(new_paths)
+
+    def reload_presets(self) -> None:
+        """Parse changed preset files and rebuild only the rows that changed."""
+        changed_ids = self.session.presets.reload_changed()
+        self.watch_presets()
+        if not changed_ids:
+            return
+
+        for tab, section_layout in self._preset_sections.items():
+            row_widgets = self._preset_widgets[tab]
+            # Remove changed and removed rows.
+            for row_id in list(row_widgets):
+                if row_id in changed_ids:
+                    row_widget = row_widgets.pop(row_id)
+                    section_layout.removeWidget(row_widget)
+                    row_widget.deleteLater()
+            # Insert changed and new rows in file order. Unchanged rows stay.
+            for index, preset_row in enumerate(self.session.presets.rows(tab)):
+                if preset_row.id not in row_widgets:
+                    row_widgets[preset_row.id] = self.preset_row_widget(preset_row)
+                    section_layout.insertWidget(index, row_widgets[preset_row.id])
+
+    def set_target_scope(self, index: int) -> None:
+        """Apply the scope picked in the dropdown to plugin logic."""
+        self.logic.scope = self.scope_combo.itemData(index)
+
+    def choose_texture_sets(self) -> None:
+        """Pick texture sets for the "Chosen Texture Sets" scope."""
+        names = self.logic.texture_set_names()
+        if not names:
+            return
+
+        dialog = TextureSetPickerDialog(names, self.logic.chosen_texture_sets, self)
+        if dialog.exec() == QDialog.Accepted:
+            self.logic.chosen_texture_sets = dialog.checked_names()
+            # Picking texture sets implies the chosen scope.
+            chosen_index = self.scope_combo.findData(TargetScope.CHOSEN_TEXTURE_SETS)
+            self.scope_combo.setCurrentIndex(chosen_index)
+
+    def toggle_execution_mode(self) -> None:
+        """Switch plugin logic between Quiet and Verify execution modes."""
+        from .paladin_logic import ExecutionMode
+
+        if self.logic.execution_mode is ExecutionMode.QUIET:
+            self.logic.execution_mode = ExecutionMode.VERIFY
+        else:
+            self.logic.execution_mode = ExecutionMode.QUIET
+        self.execution_mode_btn.label.setText(
+            f"Execution Mode: {self.logic.execution_mode.value}",
+        )
+
+    def toggle_macro_recording(self) -> None:
+        """Start or stop recording button clicks into a macro."""
+        if self.logic.recording is None:
+            self.logic.start_recording()
+            self.record_macro_btn.label.setText("Stop Recording")
+        else:
+            self.logic.stop_recording()
+            self.record_macro_btn.label.setText("Record")
+
+    def show_job_progress(self, name: str, total: int) -> None:
+        """Show the progress bar for a job that just started."""
+        self.job_label.setText(name)
+        self.job_progress_bar.setRange(0, total)
+        self.job_progress_bar.setValue(0)
+        self.job_widget.show()
+
+    def update_job_progress(self, done: int, total: int) -> None:
+        """Move the progress bar after each chunk."""
+        self.job_progress_bar.setValue(done)
+
+    def hot_reload(self) -> None:
+        """Reload changed plugin modules and swap them in behind the open dock.
+        Session and logic are replaced only if their modules were reloaded, keeping the
+        logic settings. Only tabs using changed code are rebuilt.
+        Signals connected to a bound method keep calling the old code. Tabs are rebuilt
+        when a method they connect changed, and "setup_ui()" connects through lambdas.
+        Changes to "__init__()" and "setup_ui()" still need a plugin restart.
+        """
+        if self._job_runner is not None and self._job_runner.running:
+            sp.logging.warning("Hot reload: A job is running. Cancel it or wait until it's done.")
+            return
+
+        from .hot_reload import changed_members, changed_names, referenced_names
+
+        start_time = time.perf_counter()
+        reloaded = self.reloader.reload_changed()
+        if not reloaded:
+            sp.logging.info("Hot reload: No changed modules.")
+            return
+
+        # Names tab builders may use that now mean something else.
+        changed = set(reloaded)
+        if "paladin_ui" in reloaded:
+            old_namespace = reloaded["paladin_ui"]
+            changed |= changed_names(old_namespace, sys.modules[__name__], set(reloaded))
+            changed |= changed_members(old_namespace["PainterPaladinUI"], PainterPaladinUI)
+            # Globals here are already the reloaded ones. Methods follow the new class.
+            self.__class__ = PainterPaladinUI
+            if changed & {"__init__", "setup_ui"}:
+                sp.logging.warning("Hot reload: Restart the plugin to apply setup_ui() changes.")
+
+        if "session" in reloaded:
+            self.session.disconnect()
+            self.session = PaladinSession()
+            self.session.connect()
+        logic_reloaded = bool(reloaded.keys() & {"paladin_logic", "session"})
+        if self._logic is not None and logic_reloaded:
+            self.swap_logic()
+        if self._job_runner is not None and (logic_reloaded or "job_runner" in reloaded):
+            self._job_runner.deleteLater()
+            self._job_runner = None
+
+        rebuilt = []
+        for index in sorted(self._built_tabs):
+            title, builder = self.TABS[index]
+            if changed & referenced_names(type(self), builder):
+                self._built_tabs.discard(index)
+                self.build_tab(index)
+                rebuilt.append(title)
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        sp.logging.info(
+            f"Hot reload: {', '.join(reloaded)} in {elapsed_ms:.1f} ms. "
+            f"Rebuilt tabs: {', '.join(rebuilt) or 'None'}",
+        )
+
+    def swap_logic(self) -> None:
+        """Replace plugin logic with one from the reloaded module, keeping its settings."""
+        from .paladin_logic import ExecutionMode, PaladinLogic
+
+        old_logic = self._logic
+        # Enums are new classes after a reload. Matched by value.
+        logic = PaladinLogic(
+            self.session,
+            ExecutionMode(old_logic.execution_mode.value),
+            TargetScope(old_logic.scope.value),
+        )
+        logic.chosen_texture_sets = old_logic.chosen_texture_sets
+        logic.recording = old_logic.recording
+        logic.macro = old_logic.macro
+        self._logic = logic
+
+    def search_api(self, text: str) -> None:
+        """List API entries matching the search box. Loads the index on first use."""
+        try:
+            self._api_results = self.session.api_index.search(text)
+        except Exception as e:
+            sp.logging.warning(f"{e}")
+            return
+
+        self.api_results_list.clear()
+        for entry in self._api_results:
+            self.api_results_list.addItem(f"{entry.name}  ({entry.kind})")
+        if self._api_results:
+            self.api_results_list.setCurrentRow(0)
+        else:
+            self.api_doc_view.clear()
+
+    def search_selected_node_api(self) -> None:
+        """Search the members of the first selected node's class and its base classes."""
+        try:
+            stack = sp.textureset.get_active_stack()
+            selected_nodes = sp.layerstack.get_selected_nodes(stack)
+            if not selected_nodes:
+                sp.logging.warning("No layer or effect selected.")
+                return
+
+            api_index = self.session.api_index
+            api_index.ensure_loaded()
+            class_name = api_index.add_class(type(selected_nodes[0]))
+        except sp.exception.ProjectError:
+            sp.logging.warning("No project loaded. Please open or start a new project.")
+            return
+        except Exception as e:
+            sp.logging.warning(f"{e}")
+            return
+
+        self.api_search_edit.setText(f"c:{class_name}")
+
+    def show_api_entry(self, row: int) -> None:
+        """Show the signature and docstring of a search result."""
+        if not 0 <= row < len(self._api_results):
+            return
+        entry = self._api_results[row]
+        self.api_doc_view.setPlainText(
+            f"{entry.name}{entry.signature}\n{entry.kind}\n\n{entry.doc or 'No docstring.'}",
+        )
+
+    def toggle_api_profiler(self) -> None:
+        """Start or stop timing API calls and plugin actions."""
+        enabled = self.session.profiler.toggle()
+        self.api_profiler_btn.label.setText(f"API Profiler: {'On' if enabled else 'Off'}")
+
+
+class TextureSetPickerDialog(QDialog):
+    """Checkable list of texture sets."""
+
+    def __init__(self, names: list[str], checked: list[str], parent=None) -> None:
+        """Initialize the dialog.
+
+        Args:
+            names: All texture set names in the project.
+            checked: Names checked when the dialog opens.
+            parent: The parent widget in Qt's hierarchy. Defaults to None.
+
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Choose Texture Sets")
 
-        # ------------------------------------------------ #
-        # -------------------- Finish -------------------- #
-        tab1_layout.addStretch()
-        tab2_layout.addStretch()
-        tab3_layout.addStretch()
+        layout = QVBoxLayout(self)
+        self.list_widget = QListWidget()
+        for name in names:
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if name in checked else Qt.Unchecked)
+            self.list_widget.addItem(item)
+        layout.addWidget(self.list_widget)
 
-        tab_main_widget.addTab(tab1_scroll_area, "Toolset")
-        tab_main_widget.addTab(tab2_scroll_area, "Debug")
-        tab_main_widget.addTab(tab3_scroll_area, "Extra")
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
 
-        main_layout.addWidget(tab_main_widget)
+    def checked_names(self) -> list[str]:
+        """Names of the checked texture sets."""
+        return [
+            self.list_widget.item(row).text()
+            for row in range(self.list_widget.count())
+            if self.list_widget.item(row).checkState() == Qt.Checked
+        ]
 
 
 class CustomButton(QFrame):
     """Custom button with better resizing for SP API.
     Can be styled with either a background color or a text title.
-    Background will be gray if title given.
+    Background will be gray if title given, from the shared TITLED_BUTTON_STYLE.
+    For rows of color or value presets, use "SwatchRow".
     """
 
     # Signal emitted whenever QFrame box is clicked.
@@ -494,38 +890,12 @@ class CustomButton(QFrame):
             # Use QLabel on top. QFrame not supporting text.
             self.label = QLabel(title)
             self.label.setAlignment(Qt.AlignCenter)
-            self.label.setStyleSheet("background-color: transparent;")
             title_layout.addWidget(self.label)
             self.setLayout(title_layout)
 
-            # Apply background color to the frame
-            # Turn off QLabel color, only use QFrame. Was doubling values.
-            self.setStyleSheet("""
-                QFrame {
-                background-color: rgb(42, 42, 42); 
-                border: 1px solid rgba(102, 102, 102, 100);
-                border-radius: 3px;
-                padding: 0px;          
-                }
-                QFrame:hover {
-                background-color: rgb(36, 36, 36); 
-                border: 1px solid rgba(200, 200, 255, 100);
-                border-radius: 3px;
-                padding: 0px; 
-                }
-                QLabel {
-                background-color: transparent; 
-                border: 0px;
-                border-radius: 0px;
-                padding: 0px;          
-                }      
-                QLabel:hover {
-                background-color: transparent; 
-                border: 0px;
-                border-radius: 0px;
-                padding: 0px;          
-                }        
-            """)
+            # Styled by TITLED_BUTTON_STYLE, set once on the plugin window.
+            # Per-button stylesheets are slow to build and polish.
+            self.setProperty("titled", True)
 
         # Enable mouse tracking.
         # Not required for hover effect.
@@ -540,3 +910,127 @@ class CustomButton(QFrame):
         """
         self.clicked.emit()
         super().mousePressEvent(event)
+
+
+class SwatchRow(QWidget):
+    """Row of preset swatches drawn in one paint event.
+    Each swatch is a color, or a gray button with a label. Emits the clicked swatch's value.
+    Cheaper than one styled CustomButton per swatch.
+    """
+
+    # Signal emitted with the value of the clicked swatch.
+    clicked = Signal(object)
+
+    # Gap between swatches, in pixels.
+    SPACING = 6
+    BUTTON_COLOR = QColor(42, 42, 42)
+    BUTTON_HOVER_COLOR = QColor(36, 36, 36)
+    BORDER_COLOR = QColor(102, 102, 102, 200)
+    HOVER_BORDER_COLOR = QColor(200, 200, 255, 200)
+
+    def __init__(
+        self,
+        values: list,
+        colors: list[int | tuple[int, int, int]] | None = None,
+        labels: list[str] | None = None,
+        parent=None,
+    ) -> None:
+        """Initialize a row of swatches.
+
+        Args:
+            values: Value emitted per swatch. Ex. (0.8, 0.6, 0.5) or 0.25
+            colors: (R, G, B) 255 color per swatch. Single int for gray.
+                If None, swatches are gray buttons.
+            labels: Text drawn per swatch. Ex. "0.25"
+            parent: The parent widget in Qt's hierarchy. Defaults to None.
+
+        """
+        super().__init__(parent)
+        self.values = list(values)
+        self.labels = labels or [""] * len(self.values)
+        self.hover_index = -1
+
+        self._colors = []
+        for color in colors or [None] * len(self.values):
+            if color is None:
+                self._colors.append(None)
+            elif isinstance(color, int):
+                self._colors.append(QColor(color, color, color))
+            else:
+                self._colors.append(QColor(*color))
+
+        # Same sizing as a row of CustomButtons.
+        self.setMinimumSize(QSize(24 * len(self.values), 24))
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        # Hover without a pressed button.
+        self.setMouseTracking(True)
+
+    def sizeHint(self) -> QSize:
+        return self.minimumSize()
+
+    def swatch_rect(self, index: int) -> QRectF:
+        """Rectangle of a swatch, in widget coordinates."""
+        width = self._swatch_width()
+        rect = QRectF(index * (width + self.SPACING), 0, width, self.height())
+        return rect.adjusted(0.5, 0.5, -0.5, -0.5)
+
+    def index_at(self, x: float) -> int:
+        """Swatch index under an x position. -1 for gaps and outside the row."""
+        step = self._swatch_width() + self.SPACING
+        index = int(x // step)
+        if 0 <= index < len(self.values) and x - index * step <= step - self.SPACING:
+            return index
+        return -1
+
+    def paintEvent(self, event) -> None:
+        """Draw all swatches."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        text_color = self.palette().windowText().color()
+        for index, color in enumerate(self._colors):
+            hovered = index == self.hover_index
+            if color is None:
+                color = self.BUTTON_HOVER_COLOR if hovered else self.BUTTON_COLOR
+            rect = self.swatch_rect(index)
+            painter.setPen(self.HOVER_BORDER_COLOR if hovered else self.BORDER_COLOR)
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 3, 3)
+            if self.labels[index]:
+                painter.setPen(text_color)
+                painter.drawText(rect, Qt.AlignCenter, self.labels[index])
+        painter.end()
+
+    def mouseMoveEvent(self, event) -> None:
+        """Track the hovered swatch. Repaints only when it changes."""
+        self._set_hover_index(self.index_at(event.position().x()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event) -> None:
+        """Clear hover when the mouse leaves the row."""
+        self._set_hover_index(-1)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event) -> None:
+        """Emit the value of the clicked swatch.
+
+        Args:
+            event (QtGui.QMouseEvent): Mouse event from PySide containing click information.
+
+        """
+        index = self.index_at(event.position().x())
+        if index >= 0:
+            self.clicked.emit(self.values[index])
+        super().mousePressEvent(event)
+
+    def _swatch_width(self) -> float:
+        count = len(self.values)
+        return max(self.width() - self.SPACING * (count - 1), count) / count
+
+    def _set_hover_index(self, index: int) -> None:
+        if index == self.hover_index:
+            return
+        # Repaint the old and new hovered swatches only.
+        for old_or_new in (self.hover_index, index):
+            if old_or_new >= 0:
+                self.update(self.swatch_rect(old_or_new).toAlignedRect())
+        self.hover_index = index
@@ -0,0 +1,367 @@
+"""Painter Paladin Preset Library
+==================================================
+
+Preset rows for the UI, loaded from JSON. Studio file first, then the per-user file.
+User rows replace studio rows with the same "id". Files are parsed once, and parsed
+again only when they change on disk. Channel types and colors are resolved while parsing.
+
+Studio presets: "presets/studio_presets.json", or a path in PAINTER_PALADIN_STUDIO_PRESETS.
+User presets: "~/.painter_paladin/user_presets.json", or a path in PAINTER_PALADIN_USER_PRESETS.
+
+Row keys:
+    id        Unique row id. Ex. "skin_color"
+    tab       "Toolset" or "Extra".
+    title     Row title. Ex. "Skin Color (Fill):"
+    action    "set_channel_value", "set_opacity" or "apply_recipe". Default "set_channel_value".
+    channel   Channel for "set_channel_value". Ex. "BaseColor", "Roughness"
+    style     "swatch" draws colors, "label" draws values as text. Default "swatch".
+    values    0-1 numbers, or [R, G, B] 0-255 lists. Recipes for "apply_recipe".
+
+Recipe keys, all optional except title:
+    title       Swatch text. Ex. "Painted Metal"
+    channels    0-1 number or [R, G, B] 0-255 list per channel. Ex. {"Roughness": 0.35}
+    opacity     Overall channel opacity. Ex. 0.5
+    blend_mode  Blend mode for all channels. Ex. "Normal"
+"""
+
+import functools
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import substance_painter as sp
+
+STUDIO_PRESETS_ENV = "PAINTER_PALADIN_STUDIO_PRESETS"
+USER_PRESETS_ENV = "PAINTER_PALADIN_USER_PRESETS"
+DEFAULT_STUDIO_PRESETS = Path(__file__).resolve().parent / "presets" / "studio_presets.json"
+DEFAULT_USER_PRESETS = Path.home() / ".painter_paladin" / "user_presets.json"
+
+PRESET_ACTIONS = ("set_channel_value", "set_opacity", "apply_recipe")
+PRESET_TABS = ("Toolset", "Extra")
+
+
+# ---------------------------------------------------------- #
+# API values, built once and shared by presets and plugin logic.
+
+
+@functools.cache
+def channel_type(name: str):
+    """Channel type by name. Ex. "BaseColor"
+
+    Raises:
+        AttributeError: Unknown channel name.
+
+    """
+    return getattr(sp.layerstack.ChannelType, name)
+
+
+@functools.cache
+def blending_mode(name: str):
+    """Blend mode by name. Ex. "Passthrough"
+
+    Raises:
+        AttributeError: Unknown blend mode name.
+
+    """
+    return getattr(sp.layerstack.BlendingMode, name)
+
+
+@functools.lru_cache(maxsize=256)
+def uniform_color(value: float | tuple[float, float, float]):
+    """Color for a 0-1 gray value or an (R, G, B) 0-1 tuple. Built once per value."""
+    if isinstance(value, tuple):
+        return sp.colormanagement.Color(value[0], value[1], value[2])
+    return sp.colormanagement.Color(value, value, value)
+
+
+# ---------------------------------------------------------- #
+# Presets.
+
+
+@dataclass(frozen=True)
+class MaterialRecipe:
+    """Channel values, opacity and blend mode applied together by one click.
+
+    Args:
+        title (str): Swatch text. Ex. "Painted Metal"
+        channel_values (tuple): (channel name, 0-1 float or (R, G, B) 0-1) pairs.
+        opacity (float | None): Overall channel opacity. Unchanged if None.
+        blend_mode (str | None): Blend mode for all channels. Unchanged if None.
+
+    """
+
+    title: str
+    channel_values: tuple = ()
+    opacity: float | None = None
+    blend_mode: str | None = None
+
+
+@dataclass(frozen=True)
+class PresetRow:
+    """One row of preset swatches.
+
+    Args:
+        id (str): Unique row id. Ex. "skin_color"
+        tab (str): Tab the row is shown in. "Toolset" or "Extra".
+        title (str): Row title. Ex. "Skin Color (Fill):"
+        action (str): PaladinLogic method. "set_channel_value" or "set_opacity".
+        channel (str): Channel for "set_channel_value". Ex. "BaseColor"
+        style (str): "swatch" or "label".
+        values (tuple): Value per swatch, as passed to the action.
+            0-1 float or (R, G, B) 0-1. MaterialRecipe for "apply_recipe".
+        colors (tuple): (R, G, B) 0-255 display color per swatch.
+        labels (tuple): Display text per swatch.
+
+    """
+
+    id: str
+    tab: str
+    title: str
+    action: str
+    channel: str
+    style: str
+    values: tuple
+    colors: tuple
+    labels: tuple
+
+
+def default_preset_paths() -> list[Path]:
+    """Studio and user preset files. Environment variables override the defaults."""
+    return [
+        Path(os.environ.get(STUDIO_PRESETS_ENV) or DEFAULT_STUDIO_PRESETS),
+        Path(os.environ.get(USER_PRESETS_ENV) or DEFAULT_USER_PRESETS),
+    ]
+
+
+def parse_row(data: dict) -> PresetRow:
+    """Parse one JSON row. Colors and channel types are resolved here, not on click.
+
+    Args:
+        data (dict): JSON row. See module docstring for keys.
+
+    Returns:
+        PresetRow: Parsed row.
+
+    Raises:
+        KeyError: Missing "id", "title" or "values".
+        ValueError: Unknown action, tab, style or channel, or a color without 3 values.
+
+    """
+    action = data.get("action", "set_channel_value")
+    tab = data.get("tab", "Toolset")
+    style = data.get("style", "swatch")
+    if action not in PRESET_ACTIONS:
+        raise ValueError(f"Unknown action: {action}")
+    if tab not in PRESET_TABS:
+        raise ValueError(f"Unknown tab: {tab}")
+    if style not in ("swatch", "label"):
+        raise ValueError(f"Unknown style: {style}")
+
+    values, colors, labels = [], [], []
+    for value in data["values"]:
+        if action == "apply_recipe":
+            recipe = parse_recipe(value)
+            values.append(recipe)
+            colors.append(_recipe_color(value))
+            labels.append(recipe.title)
+        else:
+            channel_val, rgb = _parse_value(value)
+            values.append(channel_val)
+            colors.append(rgb)
+            labels.append(f"{value}")
+
+    row = PresetRow(
+        id=data["id"],
+        tab=tab,
+        title=data["title"],
+        action=action,
+        channel=data.get("channel", ""),
+        style=style,
+        values=tuple(values),
+        colors=tuple(colors),
+        labels=tuple(labels),
+    )
+    if action == "set_channel_value":
+        _resolve_channel(row.channel)
+        for value in row.values:
+            uniform_color(value)
+    return row
+
+
+def parse_recipe(data: dict) -> MaterialRecipe:
+    """Parse one JSON recipe. Channel types, colors and blend mode are resolved here.
+
+    Args:
+        data (dict): JSON recipe. See module docstring for keys.
+
+    Returns:
+        MaterialRecipe: Parsed recipe.
+
+    Raises:
+        KeyError: Missing "title".
+        ValueError: Unknown channel or blend mode, or a color without 3 values.
+
+    """
+    channel_values = []
+    for name, value in data.get("channels", {}).items():
+        _resolve_channel(name)
+        channel_val = _parse_value(value)[0]
+        uniform_color(channel_val)
+        channel_values.append((name, channel_val))
+
+    blend_mode = data.get("blend_mode")
+    if blend_mode:
+        try:
+            blending_mode(blend_mode)
+        except AttributeError:
+            raise ValueError(f"Unknown blend mode: {blend_mode}") from None
+
+    opacity = data.get("opacity")
+    return MaterialRecipe(
+        title=data["title"],
+        channel_values=tuple(channel_values),
+        opacity=None if opacity is None else float(opacity),
+        blend_mode=blend_mode or None,
+    )
+
+
+def _parse_value(value: float | list) -> tuple:
+    """JSON value to (action value, (R, G, B) 0-255 display color).
+    Lists are RGB 0-255, numbers are 0-1.
+    """
+    if isinstance(value, list):
+        if len(value) != 3:
+            raise ValueError(f"Color needs 3 values: {value}")
+        rgb = tuple(int(rgb_val) for rgb_val in value)
+        return tuple(rgb_val / 255 for rgb_val in rgb), rgb
+    return float(value), (int(value * 255),) * 3
+
+
+def _recipe_color(data: dict) -> tuple[int, int, int]:
+    """Swatch color of a recipe. Its BaseColor, gray without one."""
+    base_color = data.get("channels", {}).get("BaseColor")
+    if base_color is None:
+        return (42, 42, 42)
+    return _parse_value(base_color)[1]
+
+
+def _resolve_channel(name: str) -> None:
+    """Resolve and cache a channel type. Raises ValueError if unknown."""
+    try:
+        channel_type(name)
+    except AttributeError:
+        raise ValueError(f"Unknown channel: {name}") from None
+
+
+class PresetLibrary:
+    """Preset rows merged from the studio and user files."""
+
+    def __init__(self, paths: list[Path] | None = None) -> None:
+        """Initialize the library. Files are read on first use.
+
+        Args:
+            paths (list[Path]): Preset files, later files override earlier ones.
+                Studio and user files if None.
+
+        """
+        self.paths = paths or default_preset_paths()
+        self._file_rows: dict[Path, list[PresetRow]] = {}
+        # (modified time, size) per file when last parsed. None for a missing file.
+        self._stamps: dict[Path, tuple | None] = {}
+        self._rows: dict[str, PresetRow] | None = None
+
+    def rows(self, tab: str | None = None) -> list[PresetRow]:
+        """Merged preset rows, in file order.
+
+        Args:
+            tab (str): Only rows for this tab. Ex. "Toolset". All rows if None.
+
+        """
+        if self._rows is None:
+            self.reload_changed()
+        return [row for row in self._rows.values() if tab is None or row.tab == tab]
+
+    def row(self, row_id: str) -> PresetRow | None:
+        """Preset row by id. Ex. "skin_color" """
+        if self._rows is None:
+            self.reload_changed()
+        return self._rows.get(row_id)
+
+    def watch_paths(self) -> list[str]:
+        """Existing preset files and their folders, for a file system watcher.
+        Folders catch files that are created, or replaced by editors on save.
+        """
+        paths = []
+        for path in self.paths:
+            for watch_path in (path, path.parent):
+                if watch_path.exists() and str(watch_path) not in paths:
+                    paths.append(str(watch_path))
+        return paths
+
+    def reload_changed(self) -> set[str]:
+        """Parse preset files again that changed on disk since last read.
+
+        Returns:
+            set[str]: Ids of rows added, changed or removed.
+
+        """
+        old_rows = self._rows or {}
+        files_changed = False
+        for path in self.paths:
+            stamp = self._stamp(path)
+            if path in self._stamps and self._stamps[path] == stamp:
+                continue
+            self._stamps[path] = stamp
+            self._file_rows[path] = self._load_file(path)
+            files_changed = True
+
+        if self._rows is not None and not files_changed:
+            return set()
+
+        # Later files replace rows with the same id, in place.
+        merged: dict[str, PresetRow] = {}
+        for path in self.paths:
+            for preset_row in self._file_rows.get(path, []):
+                merged[preset_row.id] = preset_row
+        self._rows = merged
+
+        changed_ids = {
+            row_id
+            for row_id in old_rows.keys() | merged.keys()
+            if old_rows.get(row_id) != merged.get(row_id)
+        }
+        if old_rows and changed_ids:
+            sp.logging.info(f"Presets reloaded: {', '.join(sorted(changed_ids))}")
+        return changed_ids
+
+    @staticmethod
+    def _stamp(path: Path) -> tuple | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_file(self, path: Path) -> list[PresetRow]:
+        """Parse a preset file. Keeps the last good rows if the file can't be read."""
+        if not path.exists():
+            return []
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            sp.logging.warning(f"Presets not loaded: {path}: {e}")
+            return self._file_rows.get(path, [])
+        rows_data = data.get("rows", []) if isinstance(data, dict) else None
+        if not isinstance(rows_data, list):
+            sp.logging.warning(f'Presets not loaded: {path}: Expected an object with a "rows" list')
+            return self._file_rows.get(path, [])
+
+        rows = []
+        for row_data in rows_data:
+            try:
+                rows.append(parse_row(row_data))
+            except Exception as e:
+                row_id = row_data.get("id") if isinstance(row_data, dict) else row_data
+                sp.logging.warning(f"Preset row skipped: {path}: {row_id}: {e}")
+        return rows
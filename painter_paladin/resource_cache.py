@@ -0,0 +1,82 @@
+"""Painter Paladin Resource Cache
+==================================================
+
+Caches resolved shelf resource identifiers, so "sp.resource.search" runs once per session.
+The plugin session warms it when a project opens and clears it when shelves are crawled again.
+"""
+
+from collections import OrderedDict
+
+import substance_painter as sp
+
+# Queries used by the plugin buttons. Resolved when a project opens.
+NOISE_QUERY = "Clouds 1"
+MASK_FILL_QUERY = "n:White Noise"
+GENERATOR_QUERY = "s:starterassets u:generator n:{name}"
+WARM_QUERIES = (
+    NOISE_QUERY,
+    MASK_FILL_QUERY,
+    GENERATOR_QUERY.format(name="Curvature"),
+    GENERATOR_QUERY.format(name="Position"),
+    GENERATOR_QUERY.format(name="Light"),
+)
+
+
+class ResourceCache:
+    """Bounded cache of resource identifiers, keyed by search query."""
+
+    def __init__(self, max_size: int = 64) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): Max number of cached queries. Least recently used is dropped.
+
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._identifiers: OrderedDict[str, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._identifiers)
+
+    def identifier(self, query: str):
+        """Get the identifier of the first resource matching a search query.
+
+        Args:
+            query (str): "sp.resource.search" query. Ex. "s:starterassets u:generator n:Light"
+
+        Returns:
+            sp.resource.ResourceID: Identifier of the first match.
+
+        Raises:
+            LookupError: No resource matches the query.
+
+        """
+        if query in self._identifiers:
+            self.hits += 1
+            self._identifiers.move_to_end(query)
+            return self._identifiers[query]
+
+        self.misses += 1
+        resources = sp.resource.search(query)
+        if not resources:
+            raise LookupError(f"Resource not found: {query}")
+
+        resource_id = resources[0].identifier()
+        self._identifiers[query] = resource_id
+        if len(self._identifiers) > self.max_size:
+            self._identifiers.popitem(last=False)
+        return resource_id
+
+    def warm(self) -> None:
+        """Resolve the plugin's default queries ahead of the first click."""
+        for query in WARM_QUERIES:
+            try:
+                self.identifier(query)
+            except LookupError as e:
+                sp.logging.warning(f"{e}")
+
+    def invalidate(self) -> None:
+        """Forget all cached identifiers."""
+        self._identifiers.clear()
@@ -0,0 +1,212 @@
+"""Painter Paladin Session
+==================================================
+
+Long-lived plugin state shared by the UI and plugin logic.
+Owns the plugin caches and keeps them correct through Substance Painter events.
+"""
+
+from contextlib import contextmanager
+
+import substance_painter as sp
+
+from .api_profiler import ApiProfiler
+from .batch_engine import ActionBatch
+from .import_timer import IMPORT_TIMER
+from .preset_library import PresetLibrary
+from .resource_cache import ResourceCache
+from .stack_index import StackIndex
+
+
+class PaladinSession:
+    """Caches the active stack, its channels and the selection.
+
+    Channels are cached per stack until the project or layer stacks change.
+    Layer stack changes made by the plugin's own actions keep the channel cache,
+    since actions never add or remove channels. Their batches report the changed nodes,
+    so the stack index re-reads only those. The layer stack events of those batches are
+    counted off as they arrive, during or after the action, so only outside edits
+    clear the caches.
+    Painter has no event for texture set switches or selection changes, so the active
+    stack and selection are read once per action and shared by everything inside it.
+    """
+
+    # Stacks with cached channels. Cache is cleared when exceeded.
+    MAX_CACHED_STACKS = 64
+
+    def __init__(self) -> None:
+        self.resources = ResourceCache()
+        self.stack_index = StackIndex()
+        self.profiler = ApiProfiler()
+        self.presets = PresetLibrary()
+        self._api_index = None
+        self.channel_lookups = 0
+        self._channels: dict = {}
+        self._action_depth = 0
+        self._active_stack = None
+        self._selected_nodes: list | None = None
+        # Batches applied by plugin actions whose layer stack event hasn't arrived yet.
+        self._own_changes = 0
+        self._connected = False
+
+    # ---------------------------------------------------------- #
+    # Cached lookups.
+
+    def active_stack(self):
+        """Active stack. Read once per action."""
+        if self._active_stack is None or not self._action_depth:
+            self._active_stack = sp.textureset.get_active_stack()
+            self._selected_nodes = None
+        return self._active_stack
+
+    def selected_nodes(self) -> list:
+        """Selected nodes of the active stack. Read once per action."""
+        stack = self.active_stack()
+        if self._selected_nodes is None or not self._action_depth:
+            self._selected_nodes = sp.layerstack.get_selected_nodes(stack)
+        return self._selected_nodes
+
+    def channels(self, stack) -> set:
+        """Channels of a stack. Cached until the layer stacks change."""
+        channels = self._channels.get(stack)
+        if channels is None:
+            self.channel_lookups += 1
+            if len(self._channels) >= self.MAX_CACHED_STACKS:
+                self._channels.clear()
+            channels = set(stack.all_channels())
+            self._channels[stack] = channels
+        return channels
+
+    @property
+    def api_index(self):
+        """substance_painter API index for the Debug tab. Imported and created on first use.
+
+        Returns:
+            ApiIndex: Loaded from its cache file, or built, on the first search.
+
+        """
+        if self._api_index is None:
+            with IMPORT_TIMER.record():
+                from .api_index import ApiIndex
+
+            self._api_index = ApiIndex()
+        return self._api_index
+
+    @property
+    def in_action(self) -> bool:
+        """Whether an action is running. Nested actions see True."""
+        return self._action_depth > 0
+
+    @contextmanager
+    def action(self):
+        """Share the active stack and selection for everything inside.
+        Nested actions reuse the outer snapshot.
+        """
+        if not self._action_depth:
+            previous_changes, ActionBatch.changes = ActionBatch.changes, self.record_changes
+        self._action_depth += 1
+        try:
+            yield self
+        finally:
+            self._action_depth -= 1
+            if not self._action_depth:
+                self._active_stack = None
+                self._selected_nodes = None
+                ActionBatch.changes = previous_changes
+
+    @contextmanager
+    def snapshot(self, stack, nodes: list):
+        """Use a stack and nodes as the active stack and selection inside, without
+        changing them in Painter. Ex. macro replay per node or per texture set.
+
+        Args:
+            stack (sp.textureset.Stack): Stack actions treat as active.
+            nodes (list): Nodes actions treat as selected.
+
+        """
+        with self.action():
+            previous = (self._active_stack, self._selected_nodes)
+            self._active_stack, self._selected_nodes = stack, list(nodes)
+            try:
+                yield self
+            finally:
+                self._active_stack, self._selected_nodes = previous
+
+    def record_changes(self, group: str, uids: set[int], structural: bool) -> None:
+        """Update the stack index for changes applied by an action batch.
+
+        Args:
+            group (str): Stack label of the changes. Empty for the active stack.
+            uids (set[int]): Uids of the changed nodes.
+            structural (bool): Nodes were added, removed or moved.
+
+        """
+        self._own_changes += 1  # one event per scoped modification
+        if group and group != self.stack_index.stack_label:
+            return  # the index only holds the active stack
+        if structural:
+            self.stack_index.mark_dirty()
+        else:
+            self.stack_index.refresh_nodes(uids)
+
+    def invalidate(self) -> None:
+        """Forget cached channels and mark the stack index dirty."""
+        self._own_changes = 0
+        self._channels.clear()
+        self.stack_index.mark_dirty()
+
+    # ---------------------------------------------------------- #
+    # Substance Painter events.
+
+    def _event_handlers(self) -> list[tuple]:
+        return [
+            (sp.event.ProjectOpened, self._on_project_opened),
+            (sp.event.ProjectCreated, self._on_project_opened),
+            (sp.event.ProjectAboutToClose, self._on_project_closed),
+            (sp.event.LayerStacksModelDataChanged, self._on_layer_stacks_changed),
+            (sp.event.ShelfCrawlingStarted, self._on_shelf_changed),
+            (sp.event.ShelfCrawlingEnded, self._on_shelf_changed),
+        ]
+
+    def connect(self) -> None:
+        """Listen to project, layer stack and shelf events.
+        Warm the resource cache now if a project is already open.
+        """
+        if self._connected:
+            return
+        for event_type, handler in self._event_handlers():
+            sp.event.DISPATCHER.connect(event_type, handler)
+        self._connected = True
+
+        if sp.project.is_open():
+            self.resources.warm()
+
+    def disconnect(self) -> None:
+        """Stop listening to events, clear all caches and stop profiling."""
+        self.profiler.disable()
+        if not self._connected:
+            return
+        for event_type, handler in self._event_handlers():
+            sp.event.DISPATCHER.disconnect(event_type, handler)
+        self._connected = False
+        self.invalidate()
+        self.resources.invalidate()
+
+    def _on_project_opened(self, event) -> None:
+        self.invalidate()
+        self.resources.invalidate()
+        self.resources.warm()
+
+    def _on_project_closed(self, event) -> None:
+        self.invalidate()
+
+    def _on_layer_stacks_changed(self, event) -> None:
+        if self._own_changes:
+            self._own_changes -= 1  # our own batch, already in the stack index
+        elif self._action_depth:
+            self.stack_index.mark_dirty()  # our own change, channels are unchanged
+        else:
+            # An outside edit. The event doesn't say which nodes changed, so everything is re-read.
+            self.invalidate()
+
+    def _on_shelf_changed(self, event) -> None:
+        self.resources.invalidate()
@@ -0,0 +1,248 @@
+"""Painter Paladin Stack Index
+==================================================
+
+In-memory index of the active layer stack, built by walking the tree once.
+Answers queries like "t:fill n:fill_effect" or "b:passthrough c:roughness" without API calls.
+Plugin actions report the nodes they changed, and only those are re-read on the next query.
+Stack switches, added or removed nodes, and changes made outside the plugin rebuild it,
+since Painter's layer stack event doesn't say which nodes changed.
+
+Query terms, separated by spaces. All terms must match. Case insensitive.
+    t:<type>      Node type contains text. Ex. "t:fill", "t:filllayer", "t:effect"
+    n:<name>      Node name, "*" wildcards allowed. Ex. "n:fill_effect", "n:skin_*"
+    p:<name>      Parent name, "*" wildcards allowed. "p:" alone for root layers.
+    m:<mask>      Mask state. "m:black", "m:white", "m:any", "m:none"
+    c:<channel>   Channel is active. Ex. "c:roughness"
+    b:<blend>     Blend mode on any channel, or on "c:" channel when given. Ex. "b:passthrough"
+    <word>        Name contains word.
+"""
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+
+import substance_painter as sp
+
+from .target_scope import stack_label, walk_stack
+
+
+@dataclass
+class NodeRecord:
+    """Indexed state of one layer or effect. Enum values are stored by name.
+
+    Args:
+        uid (int): Node uid. Used to get the node back with "get_node_by_uid".
+        name (str): Node name.
+        node_type (str): Ex. "FillLayer", "PaintEffect"
+        parent_uid (int | None): Parent node uid. None for root layers.
+        parent_name (str): Parent node name. Empty for root layers.
+        mask (str | None): Mask background, "White" or "Black". None without mask.
+        active_channels (frozenset[str]): Active channel names. Ex. {"BaseColor", "Roughness"}
+        blend_modes (dict[str, str]): Blend mode name per channel name.
+
+    """
+
+    uid: int
+    name: str
+    node_type: str
+    parent_uid: int | None = None
+    parent_name: str = ""
+    mask: str | None = None
+    active_channels: frozenset[str] = frozenset()
+    blend_modes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StackQuery:
+    """Parsed query. Empty fields match everything."""
+
+    node_type: str = ""
+    name: str = ""
+    parent: str | None = None
+    mask: str = ""
+    channel: str = ""
+    blend_mode: str = ""
+    words: list[str] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, text: str) -> "StackQuery":
+        """Parse a query string. Ex. "t:fill n:fill_effect m:black"
+
+        Raises:
+            ValueError: Unknown term prefix.
+
+        """
+        query = cls()
+        prefixes = {
+            "t": "node_type",
+            "n": "name",
+            "p": "parent",
+            "m": "mask",
+            "c": "channel",
+            "b": "blend_mode",
+        }
+        for term in text.lower().split():
+            prefix, sep, value = term.partition(":")
+            if not sep:
+                query.words.append(term)
+            elif prefix in prefixes:
+                setattr(query, prefixes[prefix], value)
+            else:
+                raise ValueError(f"Unknown query term: {term}")
+        return query
+
+    def matches(self, record: NodeRecord) -> bool:
+        """Whether a record passes all terms of the query."""
+        name = record.name.lower()
+        if self.node_type and self.node_type not in record.node_type.lower():
+            return False
+        if self.name and not fnmatchcase(name, self.name):
+            return False
+        if self.parent is not None and not fnmatchcase(record.parent_name.lower(), self.parent):
+            return False
+        if any(word not in name for word in self.words):
+            return False
+
+        mask = (record.mask or "none").lower()
+        if self.mask == "any" and mask == "none":
+            return False
+        if self.mask not in ("", "any") and self.mask != mask:
+            return False
+
+        active_channels = {channel.lower() for channel in record.active_channels}
+        blend_modes = {ch.lower(): mode.lower() for ch, mode in record.blend_modes.items()}
+        if self.blend_mode:
+            if self.channel:
+                return blend_modes.get(self.channel) == self.blend_mode
+            return self.blend_mode in blend_modes.values()
+        if self.channel and self.channel not in active_channels:
+            return False
+        return True
+
+
+class StackIndex:
+    """Index of the active stack, updated lazily after layer stack changes."""
+
+    def __init__(self) -> None:
+        self.stack_label = ""
+        self.builds = 0
+        self.refreshes = 0
+        self._records: dict[int, NodeRecord] = {}
+        self._channels: list = []
+        # Uids of changed nodes, re-read on the next query.
+        self._stale: set[int] = set()
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def records(self) -> list[NodeRecord]:
+        """All records of the active stack, top to bottom. Rebuilds if needed."""
+        self._ensure_current()
+        return list(self._records.values())
+
+    def query(self, text: str) -> list[NodeRecord]:
+        """Records matching a query string. Ex. "t:fill n:fill_effect"
+
+        Raises:
+            ValueError: Unknown term prefix.
+
+        """
+        stack_query = StackQuery.parse(text)
+        return [record for record in self.records() if stack_query.matches(record)]
+
+    def query_nodes(self, text: str) -> list:
+        """Layer stack nodes matching a query string."""
+        return [sp.layerstack.get_node_by_uid(record.uid) for record in self.query(text)]
+
+    def mark_dirty(self) -> None:
+        """Rebuild on next query. For added, removed or moved nodes."""
+        self._dirty = True
+        self._stale.clear()
+
+    def refresh_nodes(self, uids) -> None:
+        """Re-read only these nodes on next query. For changes that keep the tree shape.
+        Ex. opacity, blend modes, channel values, mask background
+
+        Args:
+            uids (Iterable[int]): Uids of the changed nodes. Unknown uids are ignored.
+
+        """
+        if not self._dirty:
+            self._stale.update(uids)
+
+    def rebuild(self) -> None:
+        """Walk the active stack once and record every node."""
+        stack = sp.textureset.get_active_stack()
+        channels = list(stack.all_channels())
+        self._records = {}
+        for node, parent in walk_stack(stack):
+            record = self._read_node(node, parent, channels)
+            self._records[record.uid] = record
+        self.stack_label = stack_label(stack)
+        self._channels = channels
+        self._stale.clear()
+        self._dirty = False
+        self.builds += 1
+
+    def _ensure_current(self) -> None:
+        """Rebuild when dirty or when another stack became active.
+        Otherwise re-read the changed nodes.
+        """
+        if self._dirty:
+            self.rebuild()
+            return
+        active_label = stack_label(sp.textureset.get_active_stack())
+        if active_label != self.stack_label:
+            self.rebuild()
+        elif self._stale:
+            self._refresh_stale()
+
+    def _refresh_stale(self) -> None:
+        """Re-read the changed nodes in place. Their position in the tree is unchanged."""
+        stale, self._stale = self._stale, set()
+        for uid in stale:
+            previous = self._records.get(uid)
+            if previous is None:
+                continue  # not in the active stack
+            try:
+                node = sp.layerstack.get_node_by_uid(uid)
+            except Exception:
+                self.rebuild()  # removed after all
+                return
+            record = self._read_node(node, None, self._channels)
+            record.parent_uid = previous.parent_uid
+            record.parent_name = previous.parent_name
+            self._records[uid] = record
+            if record.name != previous.name:
+                for child in self._records.values():
+                    if child.parent_uid == uid:
+                        child.parent_name = record.name
+        self.refreshes += 1
+
+    @staticmethod
+    def _read_node(node, parent, channels: list) -> NodeRecord:
+        """Read the indexed state of one node."""
+        record = NodeRecord(
+            uid=node.uid(),
+            name=node.get_name(),
+            node_type=node.get_type().name,
+        )
+        if parent is not None:
+            record.parent_uid = parent.uid()
+            record.parent_name = parent.get_name()
+
+        if isinstance(node, sp.layerstack.LayerNode) and node.has_mask():
+            record.mask = node.get_mask_background().name
+
+        # Only fill layers/ effects have separate channel activation.
+        if hasattr(node, "active_channels"):
+            record.active_channels = frozenset(ch.name for ch in node.active_channels)
+        else:
+            record.active_channels = frozenset(ch.name for ch in channels)
+
+        for channel in channels:
+            try:
+                record.blend_modes[channel.name] = node.get_blending_mode(channel).name
+            except Exception:
+                pass  # effects without blending, ex. filters
+        return record
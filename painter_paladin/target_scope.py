@@ -0,0 +1,162 @@
+"""Painter Paladin Target Scope
+==================================================
+
+Resolves which stacks and nodes an action applies to.
+Outside the active stack, nodes are matched by name and type against the current selection.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from enum import Enum
+
+import substance_painter as sp
+
+
+class TargetScope(Enum):
+    """Stacks an action applies to."""
+
+    ACTIVE_STACK = "Active Stack"
+    TEXTURE_SET_STACKS = "All Stacks (Texture Set)"
+    ALL_TEXTURE_SETS = "All Texture Sets"
+    CHOSEN_TEXTURE_SETS = "Chosen Texture Sets"
+
+
+@dataclass
+class StackTarget:
+    """Nodes to change in one stack.
+
+    Args:
+        stack (sp.textureset.Stack): Stack holding the nodes.
+        nodes (list): Layers and effects to change.
+        channels (set): Channels available in the stack.
+        label (str): Texture set and stack name for logging. Ex. "body/material_1"
+
+    """
+
+    stack: object
+    nodes: list = field(default_factory=list)
+    channels: set = field(default_factory=set)
+    label: str = ""
+
+
+def stack_label(stack) -> str:
+    """Texture set name, plus stack name for layered materials. Ex. "body/material_1" """
+    stack_name = stack.name()
+    texture_set_name = stack.material().name()
+    return f"{texture_set_name}/{stack_name}" if stack_name else texture_set_name
+
+
+def texture_set_names() -> list[str]:
+    """Names of all texture sets in the open project."""
+    return [texture_set.name() for texture_set in sp.textureset.all_texture_sets()]
+
+
+def walk_stack(stack) -> Iterator[tuple]:
+    """Walk every layer and effect of a stack, top to bottom.
+
+    Args:
+        stack (sp.textureset.Stack): Stack to walk.
+
+    Yields:
+        tuple: (node, parent node). Parent is None for root layers.
+
+    """
+    pending = [(node, None) for node in reversed(sp.layerstack.get_root_layer_nodes(stack))]
+    while pending:
+        node, parent = pending.pop()
+        yield node, parent
+        if not isinstance(node, sp.layerstack.LayerNode):
+            continue  # effects have no children
+        children = node.content_effects() + node.mask_effects()
+        if node.get_type() == sp.layerstack.NodeType.GroupLayer:
+            children += node.sub_layers()
+        pending.extend((child, node) for child in reversed(children))
+
+
+def iter_stack_nodes(stack) -> Iterator:
+    """Walk every layer and effect of a stack, top to bottom.
+
+    Args:
+        stack (sp.textureset.Stack): Stack to walk.
+
+    Yields:
+        Layers, group sub layers, content effects and mask effects.
+
+    """
+    for node, _parent in walk_stack(stack):
+        yield node
+
+
+def node_key(node) -> tuple:
+    """Name and type used to find the same node in other stacks."""
+    return (node.get_name(), node.get_type())
+
+
+def scope_stacks(scope: TargetScope, active_stack, chosen_texture_sets=()) -> list:
+    """Stacks covered by a scope.
+
+    Args:
+        scope (TargetScope): Which stacks to cover.
+        active_stack (sp.textureset.Stack): Currently active stack.
+        chosen_texture_sets (Iterable[str]): Texture set names for CHOSEN_TEXTURE_SETS.
+
+    Returns:
+        list: Stacks in texture set order.
+
+    """
+    if scope is TargetScope.ACTIVE_STACK:
+        return [active_stack]
+    if scope is TargetScope.TEXTURE_SET_STACKS:
+        return active_stack.material().all_stacks()
+
+    chosen = set(chosen_texture_sets)
+    stacks = []
+    for texture_set in sp.textureset.all_texture_sets():
+        if scope is TargetScope.CHOSEN_TEXTURE_SETS and texture_set.name() not in chosen:
+            continue
+        stacks.extend(texture_set.all_stacks())
+    return stacks
+
+
+def resolve_targets(session, scope: TargetScope, chosen_texture_sets=()) -> list[StackTarget]:
+    """Resolve the stacks and nodes an action applies to.
+
+    The selection in the active stack is always the reference.
+    Other stacks contribute their nodes with a matching name and type.
+
+    Args:
+        session (PaladinSession): Provides the cached active stack, selection and channels.
+        scope (TargetScope): Which stacks to cover.
+        chosen_texture_sets (Iterable[str]): Texture set names for CHOSEN_TEXTURE_SETS.
+
+    Returns:
+        list[StackTarget]: One entry per stack with matching nodes. Empty if nothing selected.
+
+    """
+    active_stack = session.active_stack()
+    selected_nodes = session.selected_nodes()
+    if not selected_nodes:
+        return []
+
+    active_label = stack_label(active_stack)
+    if scope is TargetScope.ACTIVE_STACK:
+        return [
+            StackTarget(
+                active_stack,
+                selected_nodes,
+                session.channels(active_stack),
+                active_label,
+            ),
+        ]
+
+    selected_keys = {node_key(node) for node in selected_nodes}
+    targets = []
+    for stack in scope_stacks(scope, active_stack, chosen_texture_sets):
+        label = stack_label(stack)
+        if label == active_label:
+            nodes = selected_nodes
+        else:
+            nodes = [node for node in iter_stack_nodes(stack) if node_key(node) in selected_keys]
+        if nodes:
+            targets.append(StackTarget(stack, nodes, session.channels(stack), label))
+    return targets
@@ -0,0 +1,418 @@
+"""Substance Painter Multi-Project Batch Runner
+==================================================
+
+Runs the same Paladin action or script on many .spp projects, spread over several
+Painter instances. Each instance is launched with "--enable-remote-scripting" on its own port.
+Every instance works through a shared queue one project at a time: open, run, save, close.
+
+A failed project is retried on another healthy instance. An instance that stops answering
+is dropped, and its projects go to the others. A JSON report lists per-project timing
+and results.
+
+Paladin actions run on the layers and effects matching a stack index query, in every stack.
+Scripts run with "project_path" set, and report back whatever they assign to "result".
+
+Ex. python batch_projects.py projects/ --action set_passthrough_mode --query "n:passthrough"
+Ex. python batch_projects.py list.txt --script fix.py --targets 60041 60042 60043
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import textwrap
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from lib_remote import ExecuteScriptError, PainterError
+from lib_remote_async import AsyncRemotePainter, parseTarget
+from remote_registry import decodeResult
+
+# Opens the project, runs the job body, saves and closes. The body sets "_output".
+JOB_TEMPLATE = """\
+import json, time
+import substance_painter as sp
+_start = time.perf_counter()
+if sp.project.is_open():
+    sp.project.close()
+sp.project.open({project!r})
+try:
+{body}
+    if {save!r}:
+        sp.project.save()
+finally:
+    sp.project.close()
+json.dumps({{"output": _output, "painter_time": time.perf_counter() - _start}})
+"""
+
+# Runs a PaladinLogic action on the query matches of every stack.
+# Uses the loaded plugin's modules, or imports "painter_paladin" if the plugin isn't loaded.
+# Actions catch their own errors and log a warning, so any warning fails the job.
+# The project is then closed without saving, and the runner retries or reports it.
+ACTION_BODY = """\
+import importlib, sys
+_package = next(
+    (name for name in sys.modules if name.rpartition(".")[2] == "painter_paladin"),
+    "painter_paladin",
+)
+_logic = importlib.import_module(_package + ".paladin_logic").PaladinLogic()
+_output = []
+_warnings = []
+_warning = sp.logging.warning
+def _capture_warning(message, *args, **kwargs):
+    _warnings.append(f"{{_label}}: {{message}}")
+    return _warning(message, *args, **kwargs)
+sp.logging.warning = _capture_warning
+try:
+    for _texture_set in sp.textureset.all_texture_sets():
+        for _stack in _texture_set.all_stacks():
+            _label = f"{{_texture_set.name()}}/{{_stack.name()}}"
+            sp.textureset.set_active_stack(_stack)
+            _nodes = _logic.session.stack_index.query_nodes({query!r})
+            if _nodes:
+                sp.layerstack.set_selected_nodes(_nodes)
+                getattr(_logic, {action!r})(*{args!r})
+            _output.append({{"stack": _label, "nodes": len(_nodes)}})
+finally:
+    sp.logging.warning = _warning
+if _warnings:
+    raise RuntimeError("Action failed: " + "; ".join(_warnings))
+"""
+
+# Runs a user script in its own namespace.
+SCRIPT_BODY = """\
+_namespace = {{"__name__": "__batch__", "project_path": sp.project.file_path()}}
+exec(compile({source!r}, {filename!r}, "exec"), _namespace)
+_output = _namespace.get("result")
+"""
+
+
+@dataclass
+class Attempt:
+    """One try of a project on one instance.
+
+    Args:
+        target: The "host:port" of the instance.
+        elapsed: Seconds from sending the request to its result.
+        error: Error text. None on success.
+
+    """
+
+    target: str
+    elapsed: float
+    error: str | None = None
+
+
+@dataclass
+class ProjectResult:
+    """Outcome of one project, after all attempts.
+
+    Args:
+        project: Path of the .spp file, as Painter sees it.
+        ok: True if the last attempt succeeded.
+        target: Instance of the last attempt. None if it never ran.
+        elapsed: Seconds over all attempts.
+        painter_time: Seconds Painter spent on the successful attempt, open to close.
+        output: What the action or script sent back. Ex. nodes changed per stack
+        attempts: Every try, in order.
+
+    """
+
+    project: str
+    ok: bool = False
+    target: str | None = None
+    elapsed: float = 0.0
+    painter_time: float | None = None
+    output: object = None
+    attempts: list[Attempt] = field(default_factory=list)
+
+
+def actionBody(action: str, args: list, query: str) -> str:
+    """Job body running a Paladin action. Ex. actionBody("set_opacity", [0.5], "t:fill")"""
+    if not action.isidentifier():
+        raise ValueError(f"Action name is not a Python identifier: {action}")
+    return ACTION_BODY.format(action=action, args=tuple(args), query=query)
+
+
+def scriptBody(source: str, filename: str = "<batch>") -> str:
+    """Job body running a script. "project_path" is set, "result" is sent back."""
+    return SCRIPT_BODY.format(source=source, filename=filename)
+
+
+def jobScript(project: str, body: str, save: bool = True) -> str:
+    """Full script for one project.
+
+    Args:
+        project: Path of the .spp file, as Painter sees it.
+        body: From "actionBody()" or "scriptBody()".
+        save: Save the project before closing it.
+
+    """
+    return JOB_TEMPLATE.format(project=project, body=textwrap.indent(body, "    "), save=save)
+
+
+def findProjects(paths: list[str]) -> list[str]:
+    """Expands folders to the .spp files in them, and .txt files to the paths they list.
+
+    Args:
+        paths: .spp files, folders or text files with one path per line.
+
+    """
+    projects = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            projects.extend(str(project) for project in sorted(path.rglob("*.spp")))
+        elif path.suffix.lower() == ".txt":
+            lines = path.read_text(encoding="utf-8").splitlines()
+            projects.extend(line.strip() for line in lines if line.strip())
+        else:
+            projects.append(str(path))
+    return projects
+
+
+class BatchRunner:
+    """Spreads project jobs over Painter instances, one worker per instance.
+
+    Args:
+        targets: The instances, as "host:port" strings, (host, port) tuples or ports.
+        retries (int, optional): Extra attempts per failed project. Defaults to 1.
+        timeout (float, optional): Seconds each project may take. An instance going over
+            is still busy with it, so it's dropped. Defaults to 3600.
+        verbose (bool, optional): Print the raw Painter responses. Defaults to False.
+
+    """
+
+    def __init__(
+        self,
+        targets: list[str | tuple[str, int] | int],
+        retries: int = 1,
+        timeout: float = 3600,
+        verbose: bool = False,
+    ) -> None:
+        self._retries: int = retries
+        self._timeout: float = timeout
+        self._verbose: bool = verbose
+        self.clients: dict[str, AsyncRemotePainter] = {}
+        for target in targets:
+            host, port = parseTarget(str(target) if isinstance(target, int) else target)
+            remote = AsyncRemotePainter(port, host)
+            self.clients[remote.target] = remote
+        # Instances still taking jobs.
+        self.healthy: set[str] = set()
+        self._pending: list[ProjectResult] = []
+        self._scripts: dict[str, str] = {}
+        self._running: int = 0
+        self._changed: asyncio.Condition | None = None
+        self._onDone = None
+
+    async def run(self, jobs: dict[str, str], onDone=None) -> list[ProjectResult]:
+        """Runs every job and returns once all succeeded or ran out of attempts.
+
+        Args:
+            jobs: Script per project. Ex. {"D:/a.spp": jobScript("D:/a.spp", body)}
+            onDone (callable, optional): Called with each finished ProjectResult.
+
+        Returns:
+            list[ProjectResult]: One result per project, in job order.
+
+        """
+        self._scripts = dict(jobs)
+        results = [ProjectResult(project) for project in jobs]
+        self._pending = list(results)
+        self._changed = asyncio.Condition()
+        self._onDone = onDone
+
+        checks = await asyncio.gather(
+            *(self._check(remote) for remote in self.clients.values()),
+        )
+        self.healthy = {target for target, ok in zip(self.clients, checks, strict=True) if ok}
+        try:
+            await asyncio.gather(*(self._work(self.clients[target]) for target in self.healthy))
+        finally:
+            await asyncio.gather(*(remote.close() for remote in self.clients.values()))
+
+        # Left over when every instance was dropped.
+        for result in self._pending:
+            result.attempts.append(Attempt("", 0.0, "No healthy Painter instance left"))
+            self._finish(result)
+        return results
+
+    async def _check(self, remote: AsyncRemotePainter) -> bool:
+        """True if the instance answers within the connect timeout."""
+        try:
+            await remote.checkConnection()
+            return True
+        except PainterError:
+            return False
+
+    def _nextJob(self, target: str) -> ProjectResult | None:
+        """Next project for an instance. Retries go to instances that haven't tried them,
+        unless every healthy instance already has.
+        """
+        for result in self._pending:
+            tried = {attempt.target for attempt in result.attempts}
+            if target not in tried or self.healthy <= tried:
+                self._pending.remove(result)
+                return result
+        return None
+
+    async def _work(self, remote: AsyncRemotePainter) -> None:
+        """Takes jobs for one instance until none are left, or the instance is dropped."""
+        target = remote.target
+        while True:
+            async with self._changed:
+                while (result := self._nextJob(target)) is None:
+                    if not self._pending and not self._running:
+                        return
+                    await self._changed.wait()
+                self._running += 1
+
+            attempt, healthy = await self._attempt(remote, result)
+            result.attempts.append(attempt)
+            result.target = target
+            result.elapsed += attempt.elapsed
+
+            async with self._changed:
+                self._running -= 1
+                if not healthy:
+                    self.healthy.discard(target)
+                if attempt.error is None or len(result.attempts) > self._retries:
+                    self._finish(result)
+                else:
+                    self._pending.insert(0, result)
+                self._changed.notify_all()
+            if not healthy:
+                print(f"{target}: dropped, {attempt.error}", file=sys.stderr)
+                return
+
+    async def _attempt(self, remote: AsyncRemotePainter, result: ProjectResult):
+        """Runs one project once.
+
+        Returns:
+            tuple[Attempt, bool]: The attempt, and whether the instance can take more jobs.
+
+        """
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                remote.execScript(self._scripts[result.project], "python", self._verbose),
+                self._timeout,
+            )
+        except ExecuteScriptError as e:
+            # The project or script failed. The instance is fine.
+            return Attempt(remote.target, time.perf_counter() - start, str(e)), True
+        except PainterError as e:
+            error = str(e)
+            healthy = await self._check(remote)
+        except asyncio.TimeoutError:
+            error = f"No response within {self._timeout} s"
+            healthy = False
+        else:
+            data = decodeResult(response)
+            if isinstance(data, dict):
+                result.output = data.get("output")
+                result.painter_time = data.get("painter_time")
+            else:
+                result.output = data
+            return Attempt(remote.target, time.perf_counter() - start), True
+        return Attempt(remote.target, time.perf_counter() - start, error), healthy
+
+    def _finish(self, result: ProjectResult) -> None:
+        result.ok = bool(result.attempts) and result.attempts[-1].error is None
+        if self._onDone is not None:
+            self._onDone(result)
+
+
+def writeReport(path: Path, results: list[ProjectResult], wallTime: float, **settings) -> dict:
+    """Writes the JSON report and returns it.
+
+    Args:
+        path: Report file.
+        results: Per-project results.
+        wallTime: Seconds for the whole batch.
+        **settings: Batch settings recorded in the report. Ex. action="set_opacity"
+
+    """
+    targets: dict[str, int] = {}
+    for result in results:
+        if result.ok:
+            targets[result.target] = targets.get(result.target, 0) + 1
+    report = {
+        "settings": settings,
+        "summary": {
+            "projects": len(results),
+            "ok": sum(result.ok for result in results),
+            "failed": sum(not result.ok for result in results),
+            "retried": sum(len(result.attempts) > 1 for result in results),
+            "wall_time": round(wallTime, 3),
+            "projects_per_target": targets,
+        },
+        "projects": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    return report
+
+
+def main() -> None:
+    """Run a batch from the command line. Exits with 1 if any project failed."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("projects", nargs="+", help=".spp files, folders or .txt path lists.")
+    job = parser.add_mutually_exclusive_group(required=True)
+    job.add_argument("--action", help="PaladinLogic method. Ex. set_passthrough_mode")
+    job.add_argument("--script", type=Path, help="Python script to run in each project.")
+    parser.add_argument("--args", default="[]", help="Action arguments as a JSON list.")
+    parser.add_argument("--query", default="", help="Stack index query. All nodes if empty.")
+    parser.add_argument("--targets", nargs="+", default=["localhost:60041"], help="host:port")
+    parser.add_argument("--retries", type=int, default=1, help="Extra attempts per project.")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds per project.")
+    parser.add_argument("--no-save", action="store_true", help="Close projects without saving.")
+    parser.add_argument("--report", type=Path, default=Path("batch_report.json"))
+    parser.add_argument("--verbose", action="store_true", help="Print raw Painter responses.")
+    args = parser.parse_args()
+
+    projects = findProjects(args.projects)
+    if not projects:
+        print("Error: No projects found.")
+        sys.exit(1)
+    if args.action:
+        body = actionBody(args.action, json.loads(args.args), args.query)
+    else:
+        body = scriptBody(args.script.read_text(encoding="utf-8"), str(args.script))
+    jobs = {project: jobScript(project, body, not args.no_save) for project in projects}
+
+    done = []
+
+    def onDone(result: ProjectResult) -> None:
+        done.append(result)
+        status = "ok" if result.ok else f"failed: {result.attempts[-1].error}"
+        print(
+            f"[{len(done)}/{len(jobs)}] {result.project} on {result.target}: {status} "
+            f"({result.elapsed:.2f} s)",
+            file=sys.stderr,
+        )
+
+    runner = BatchRunner(args.targets, args.retries, args.timeout, args.verbose)
+    start = time.perf_counter()
+    results = asyncio.run(runner.run(jobs, onDone))
+    wall_time = time.perf_counter() - start
+
+    settings = {
+        "action": args.action,
+        "args": json.loads(args.args) if args.action else None,
+        "query": args.query if args.action else None,
+        "script": str(args.script) if args.script else None,
+        "targets": list(runner.clients),
+        "save": not args.no_save,
+    }
+    summary = writeReport(args.report, results, wall_time, **settings)["summary"]
+    print(
+        f"{summary['ok']}/{summary['projects']} projects ok, {summary['failed']} failed, "
+        f"{summary['retried']} retried, in {wall_time:.2f} s on {len(runner.clients)} instances",
+    )
+    print(f"Report written to: {args.report}")
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
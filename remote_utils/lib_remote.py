@@ -2,11 +2,82 @@
 ==================================================
 
 A Python interface for remotely running scripts in Substance Painter via HTTP.
+One keep-alive connection is reused for every request, and reopened when it drops
+or sat idle longer than the server keeps it open.
+
+Ex. with RemotePainter() as remote: remote.execScripts([script_a, script_b], "python")
 """
 
 import base64
+import contextlib
+import io
 import json
+import socket
+import time
+import uuid
+import zlib
+from collections import deque
+from dataclasses import dataclass
 from http import client
+from pathlib import Path
+
+# Errors of sending over a kept-alive connection the server closed while idle.
+# Raised before the request reached Painter, so it is safe to reconnect and resend.
+STALE_CONNECTION_ERRORS = (
+    client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# Raw bytes per request of "uploadFile()" and "downloadFile()".
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+# zlib level of compressed transfers. Fast, and still shrinks JSON several times.
+COMPRESS_LEVEL = 1
+
+# Appends one chunk to a file in Painter's temp folder. Returns the file path.
+UPLOAD_CHUNK_TEMPLATE = """\
+import base64, os, tempfile, zlib
+_path = os.path.join(tempfile.gettempdir(), "painter_remote", {name!r})
+if {first!r}:
+    os.makedirs(os.path.dirname(_path), exist_ok=True)
+_data = base64.b64decode({data!r})
+with open(_path, "wb" if {first!r} else "ab") as _file:
+    _file.write(zlib.decompress(_data) if {compressed!r} else _data)
+del _data
+_path
+"""
+
+# Reads one chunk of a file in Painter. Returns it base64 encoded.
+# With "remove", the file is deleted after reading, ex. on the last chunk.
+DOWNLOAD_CHUNK_TEMPLATE = """\
+import base64, os, zlib
+try:
+    with open({path!r}, "rb") as _file:
+        _file.seek({offset!r})
+        _data = _file.read({size!r})
+finally:
+    if {remove!r}:
+        os.remove({path!r})
+if {compressed!r}:
+    _data = zlib.compress(_data, {level!r})
+base64.b64encode(_data).decode("ascii")
+"""
+
+FILE_SIZE_TEMPLATE = """\
+import os
+str(os.path.getsize({path!r}))
+"""
+
+# Deletes files in Painter. Missing files are skipped.
+REMOVE_FILES_TEMPLATE = """\
+import os
+for _path in {paths!r}:
+    try:
+        os.remove(_path)
+    except OSError:
+        pass
+"""
 
 
 class PainterError(Exception):
@@ -33,6 +104,121 @@ class ExecuteScriptError(PainterError):
         super().__init__(f"An error occurred when executing script: {error_detail}")
 
 
+def encodeCommand(script: str, type: str) -> bytes:
+    """Encodes a script as the JSON request body for the "/run.json" route.
+
+    Args:
+        script: The script content to execute.
+        type: The type of script ("js" for JavaScript, "python" for Python).
+
+    Returns:
+        bytes: The JSON request body.
+
+    """
+    # Encode script to base64 for transmission
+    encoded_script: str = base64.b64encode(script.encode("utf-8")).decode("utf-8")
+    # Format the command as JSON based on script type
+    command: dict = {"js" if type == "js" else "python": encoded_script}
+    # Convert command to bytes for HTTP request
+    return json.dumps(command).encode("utf-8")
+
+
+def parseResponse(data: bytes, body: bytes, type: str, verbose: bool = True) -> dict:
+    """Processes the JSON response of a script request.
+    Shared by the blocking and the asyncio clients.
+
+    Args:
+        data: The raw response body.
+        body: The encoded script data that was sent.
+        type: The type of script ("js" for JavaScript, "python" for Python).
+        verbose: Print the raw response and how it was read. Off for large transfers.
+
+    Returns:
+        dict: A dictionary containing the response status and optional output.
+
+    Raises:
+        ExecuteScriptError: The response holds an "error".
+
+    """
+    log = print if verbose else lambda *args: None
+    # Log the raw response for debugging
+    log("Raw response:", data)
+
+    if not data:
+        # Handle empty response as success
+        log("Empty response received")
+        return {"status": "success"}
+
+    decoded_data = None
+    try:
+        decoded_data = data.decode("utf-8")
+        parsed_data = json.loads(decoded_data)
+    except json.JSONDecodeError:
+        # Handle non-JSON response
+        log("Response is not JSON:", decoded_data)
+        return {"status": "success", "output": decoded_data}
+    except UnicodeDecodeError as e:
+        # Handle decoding errors
+        log(f"Error decoding response: {e}")
+        return {"status": "error", "output": f"Unicode decoding error: {e}"}
+
+    if parsed_data is None:
+        # Treat null response as success
+        log("Received null response, treating as success")
+        return {"status": "success"}
+
+    if not isinstance(parsed_data, dict):
+        # Handle unexpected response types
+        log(f"Unexpected response type: {parsed_data.__class__}, treating as success")
+        return {"status": "success", "output": str(parsed_data) if parsed_data else None}
+
+    if "error" in parsed_data:
+        # Debug JS script content on error
+        if isinstance(body, bytes) and type == "js":
+            try:
+                body_json = json.loads(body.decode("utf-8"))
+                if "js" in body_json:
+                    log(base64.b64decode(body_json["js"]))
+            except (json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+                log(f"Error processing error response body: {e}")
+        raise ExecuteScriptError(parsed_data["error"])
+
+    # Log success if no error found
+    log("No error found in response")
+    return parsed_data
+
+
+def _openBinary(target, mode: str):
+    """Opens a path, wraps bytes, or passes a binary file object through unclosed."""
+    if isinstance(target, str | Path):
+        return open(target, mode)
+    if isinstance(target, bytes | bytearray):
+        return io.BytesIO(target)
+    return contextlib.nullcontext(target)
+
+
+@dataclass
+class RequestTiming:
+    """Timing of one request to Substance Painter.
+
+    Args:
+        route: The API route of the request. Ex. "/run.json"
+        bytes_sent: Size of the request body.
+        bytes_received: Size of the response body.
+        connect_time: Seconds spent opening the connection. 0 if it was reused.
+        total_time: Seconds from sending the request to reading the whole response.
+        reused: True if the request went over an already open connection.
+
+    """
+
+    route: str
+    bytes_sent: int
+    bytes_received: int
+    connect_time: float
+    total_time: float
+    reused: bool
+
+
 class RemotePainter:
     """Interface to execute scripts remotely in Substance Painter.
 
@@ -50,108 +236,274 @@ class RemotePainter:
             "Content-type": "application/json",
             "Accept": "application/json",
         }
+        self._CONNECT_TIMEOUT: float = 10
+        self._REQUEST_TIMEOUT: float = 3600
+        # Idle seconds after which the server may have closed the connection. Reopened first.
+        self._IDLE_TIMEOUT: float = 5
+        # Persistent connection, opened on first use.
+        self._connection: client.HTTPConnection | None = None
+        self._lastUsed: float = 0.0
+        # Timing of recent requests, oldest first.
+        self.timings: deque[RequestTiming] = deque(maxlen=1000)
+        # Paths of files uploaded to Painter's temp folder, removed by "cleanupTransfers()".
+        self.uploads: list[str] = []
+
+    def __enter__(self) -> "RemotePainter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            # Best effort while an error is already leaving the block, so it isn't masked.
+            failing = exc_info[0] is not None
+            with contextlib.suppress(Exception) if failing else contextlib.nullcontext():
+                if self.uploads:
+                    self.cleanupTransfers()
+        finally:
+            self.close()
+
+    @property
+    def lastTiming(self) -> RequestTiming | None:
+        """Timing of the most recent request. None before the first request."""
+        return self.timings[-1] if self.timings else None
 
     def checkConnection(self) -> bool:
         """Tests the connection to Substance Painter.
+        The connection is kept open for the following requests.
 
         Returns:
             bool: True if the connection is successful.
 
         """
-        connection = None
         try:
-            connection = client.HTTPConnection(self._host, self._port, timeout=10)
-            connection.connect()
+            self._getConnection()
             return True
         except Exception as e:
+            self.close()
             raise PainterError(f"Failed to connect to {self._host}:{self._port}: {e}")
-        finally:
-            if connection:
-                connection.close()
 
-    def execScript(self, script: str, type: str) -> dict:
+    def close(self) -> None:
+        """Closes the persistent connection. The next request opens a new one."""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def execScript(self, script: str, type: str, verbose: bool = True) -> dict:
         """Executes a script in Substance Painter.
 
         Args:
             script: The script content to execute.
             type: The type of script ("js" for JavaScript, "python" for Python).
+            verbose: Print the raw response and how it was read.
 
         Returns:
             dict: A dictionary with execution status and optional output.
 
         """
-        # Encode script to base64 for transmission
-        encoded_script: str = base64.b64encode(script.encode("utf-8")).decode("utf-8")
-        # Format the command as JSON based on script type
-        command: dict = {"js" if type == "js" else "python": encoded_script}
-        # Convert command to bytes for HTTP request
-        command_bytes: bytes = json.dumps(command).encode("utf-8")
-        return self._jsonPostRequest(self._PAINTER_ROUTE, command_bytes, type)
-
-    def _jsonPostRequest(self, route: str, body: bytes, type: str) -> dict:
-        """Sends a POST request to Substance Painter and processes the JSON response.
+        body = encodeCommand(script, type)
+        return self._jsonPostRequest(self._PAINTER_ROUTE, body, type, verbose)
+
+    def execScripts(self, scripts: list[str], type: str, verbose: bool = True) -> list[dict]:
+        """Executes scripts one after another over the same connection.
+        Stops at the first failing script.
 
         Args:
-            route: The API route to send the request to.
-            body: The encoded script data to send.
+            scripts: The script contents to execute, in order.
             type: The type of script ("js" for JavaScript, "python" for Python).
+            verbose: Print the raw responses and how they were read.
 
         Returns:
-            dict: A dictionary containing the response status and optional output.
+            list[dict]: One execution result per script.
+
+        Raises:
+            ExecuteScriptError: A script failed. Earlier scripts already ran.
 
         """
-        connection = None
-        try:
-            connection = client.HTTPConnection(self._host, self._port, timeout=3600)
-            connection.request("POST", route, body, self._HEADERS)
-            response = connection.getresponse()
-            data = response.read()
-        finally:
-            if connection:
-                connection.close()
+        # Encode all scripts first, so the connection is not idle between requests.
+        bodies = [encodeCommand(script, type) for script in scripts]
+        return [
+            self._jsonPostRequest(self._PAINTER_ROUTE, body, type, verbose) for body in bodies
+        ]
+
+    def uploadFile(
+        self,
+        source: str | Path | bytes | io.BufferedIOBase,
+        chunkSize: int = TRANSFER_CHUNK_SIZE,
+        compress: bool = False,
+    ) -> str:
+        """Uploads a file to Painter's temp folder in chunks, one request each.
+        Only one chunk is held in memory at a time, here and in Painter.
 
-        # Log the raw response for debugging
-        print(f"Raw response: {data}")
+        Args:
+            source: File path, bytes, or a binary file object read from its current position.
+            chunkSize: Raw bytes per request.
+            compress: zlib compress each chunk. Worth it for text, ex. JSON preset libraries.
 
-        if not data:
-            # Handle empty response as success
-            print("Empty response received")
-            return {"status": "success"}
+        Returns:
+            str: Path of the uploaded file in Painter. Scripts read it from there.
+                Removed by "cleanupTransfers()", or when the context manager exits.
 
-        decoded_data = None
+        """
+        suffix = Path(source).suffix if isinstance(source, str | Path) else ""
+        name = f"{uuid.uuid4().hex}{suffix}"
+        remote_path = None
         try:
-            decoded_data = data.decode("utf-8")
-            parsed_data = json.loads(decoded_data)
-        except json.JSONDecodeError:
-            # Handle non-JSON response
-            print(f"Response is not JSON: {decoded_data}")
-            return {"status": "success", "output": decoded_data}
-        except UnicodeDecodeError as e:
-            # Handle decoding errors
-            print(f"Error decoding response: {e}")
-            return {"status": "error", "output": f"Unicode decoding error: {e}"}
-
-        if parsed_data is None:
-            # Treat null response as success
-            print("Received null response, treating as success")
-            return {"status": "success"}
-
-        if not isinstance(parsed_data, dict):
-            # Handle unexpected response types
-            print(f"Unexpected response type: {type(parsed_data)}, treating as success")
-            return {"status": "success", "output": str(parsed_data) if parsed_data else None}
-
-        if "error" in parsed_data:
-            # Debug JS script content on error
-            if isinstance(body, bytes) and type == "js":
-                try:
-                    body_json = json.loads(body.decode("utf-8"))
-                    if "js" in body_json:
-                        print(base64.b64decode(body_json["js"]))
-                except (json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
-                    print(f"Error processing error response body: {e}")
-            raise ExecuteScriptError(parsed_data["error"])
-
-        # Log success if no error found
-        print("No error found in response")
-        return parsed_data
+            with _openBinary(source, "rb") as file:
+                while True:
+                    chunk = file.read(chunkSize)
+                    if not chunk and remote_path is not None:
+                        break
+                    data = zlib.compress(chunk, COMPRESS_LEVEL) if compress else chunk
+                    script = UPLOAD_CHUNK_TEMPLATE.format(
+                        name=name,
+                        first=remote_path is None,
+                        data=base64.b64encode(data).decode("ascii"),
+                        compressed=compress,
+                    )
+                    remote_path = self._transferScript(script)
+        except Exception:
+            # Don't leave a partial file behind. The connection may be gone too.
+            if remote_path is not None:
+                with contextlib.suppress(Exception):
+                    self._transferScript(REMOVE_FILES_TEMPLATE.format(paths=[remote_path]))
+            raise
+        self.uploads.append(remote_path)
+        return remote_path
+
+    def downloadFile(
+        self,
+        remotePath: str,
+        destination: str | Path | io.BufferedIOBase,
+        chunkSize: int = TRANSFER_CHUNK_SIZE,
+        compress: bool = False,
+        remove: bool = False,
+    ) -> int:
+        """Downloads a file from Painter in chunks, one request each.
+        Only one chunk is held in memory at a time, here and in Painter.
+
+        Args:
+            remotePath: Path of the file in Painter. Ex. a stack dump a script wrote
+            destination: File path, or a binary file object written from its current position.
+            chunkSize: Raw bytes per request.
+            compress: zlib compress each chunk in Painter.
+            remove: Delete the file in Painter once its last chunk is read.
+
+        Returns:
+            int: Bytes downloaded.
+
+        """
+        size = int(self._transferScript(FILE_SIZE_TEMPLATE.format(path=remotePath), True) or 0)
+        if not size and remove:
+            self._transferScript(REMOVE_FILES_TEMPLATE.format(paths=[remotePath]))
+        with _openBinary(destination, "wb") as file:
+            for offset in range(0, size, chunkSize):
+                last = remove and offset + chunkSize >= size
+                script = DOWNLOAD_CHUNK_TEMPLATE.format(
+                    path=remotePath,
+                    offset=offset,
+                    size=chunkSize,
+                    remove=last,
+                    compressed=compress,
+                    level=COMPRESS_LEVEL,
+                )
+                # Resending a chunk that deleted the file would fail, so it isn't retried.
+                data = base64.b64decode(self._transferScript(script, not last) or "")
+                file.write(zlib.decompress(data) if compress else data)
+        return size
+
+    def cleanupTransfers(self) -> None:
+        """Deletes the files this client uploaded to Painter's temp folder."""
+        if self.uploads:
+            self._transferScript(REMOVE_FILES_TEMPLATE.format(paths=self.uploads))
+            self.uploads.clear()
+
+    def _transferScript(self, script: str, retry: bool = False) -> str | None:
+        """Runs a transfer script and returns the value of its last line, without printing it.
+        Only read-only scripts may "retry", an upload chunk sent twice is appended twice.
+        """
+        body = encodeCommand(script, "python")
+        response = parseResponse(
+            self._sendRequest(self._PAINTER_ROUTE, body, retry),
+            body,
+            "python",
+            verbose=False,
+        )
+        return response.get("output")
+
+    def _getConnection(self) -> client.HTTPConnection:
+        """Returns the persistent connection, opening it if needed.
+        Connects with a short timeout, then waits up to an hour for script results.
+        """
+        if self._connection is None:
+            self._connection = client.HTTPConnection(
+                self._host,
+                self._port,
+                timeout=self._CONNECT_TIMEOUT,
+            )
+        if self._connection.sock is None:
+            # Not opened yet, or closed by a "Connection: close" response.
+            self._connection.connect()
+            self._connection.sock.settimeout(self._REQUEST_TIMEOUT)
+            # Small requests are sent right away, not held back waiting for an ACK.
+            self._connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._lastUsed = time.monotonic()
+        return self._connection
+
+    def _sendRequest(self, route: str, body: bytes, retry: bool = False) -> bytes:
+        """Sends a POST request over the persistent connection and returns the response body.
+        Reconnects first if the connection sat idle longer than the server keeps it open.
+        Reconnects and resends once if sending over a reused connection failed.
+        A failure while reading the response is raised, Painter may have run the script already.
+        Pass "retry" for idempotent scripts to resend after read failures too.
+        """
+        idle = time.monotonic() - self._lastUsed
+        if self._connection is not None and idle > self._IDLE_TIMEOUT:
+            # Likely closed by the server. It would only show once the response is read.
+            self.close()
+        for attempt in range(2):
+            start = time.perf_counter()
+            reused = self._connection is not None and self._connection.sock is not None
+            sent = False
+            try:
+                connection = self._getConnection()
+                connect_time = 0.0 if reused else time.perf_counter() - start
+                connection.request("POST", route, body, self._HEADERS)
+                sent = True
+                data = connection.getresponse().read()
+                self._lastUsed = time.monotonic()
+            except (*STALE_CONNECTION_ERRORS, client.HTTPException, ConnectionError) as e:
+                self.close()
+                stale = not sent and isinstance(e, STALE_CONNECTION_ERRORS)
+                # A fresh connection failing is a real error, not an idle timeout.
+                if not reused or attempt or not (stale or retry):
+                    raise
+                continue
+            except Exception:
+                self.close()
+                raise
+
+            self.timings.append(
+                RequestTiming(
+                    route,
+                    len(body),
+                    len(data),
+                    connect_time,
+                    time.perf_counter() - start,
+                    reused,
+                ),
+            )
+            return data
+
+    def _jsonPostRequest(self, route: str, body: bytes, type: str, verbose: bool = True) -> dict:
+        """Sends a POST request to Substance Painter and processes the JSON response.
+
+        Args:
+            route: The API route to send the request to.
+            body: The encoded script data to send.
+            type: The type of script ("js" for JavaScript, "python" for Python).
+            verbose: Print the raw response and how it was read.
+
+        Returns:
+            dict: A dictionary containing the response status and optional output.
+
+        """
+        return parseResponse(self._sendRequest(route, body), body, type, verbose)
@@ -0,0 +1,361 @@
+"""Substance Painter Async Remote Executor
+==================================================
+
+An asyncio counterpart to "lib_remote.RemotePainter", for driving many Painter instances
+at once. Each instance is launched with "--enable-remote-scripting" on its own port.
+Requests to different instances run concurrently, so total time follows the slowest instance.
+
+Ex. python lib_remote_async.py script.py localhost:60041 localhost:60042
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+
+from lib_remote import PainterError, encodeCommand, parseResponse
+
+
+@dataclass
+class TargetResult:
+    """Outcome of one script request to one Painter instance.
+
+    Args:
+        target: The "host:port" of the instance.
+        result: The parsed response. None if the request failed.
+        error: The PainterError or ExecuteScriptError raised. None on success.
+        elapsed: Seconds from queueing the request to its result, including the wait
+            for a free concurrency slot.
+
+    """
+
+    target: str
+    result: dict | None = None
+    error: PainterError | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if the script ran without error."""
+        return self.error is None
+
+
+def parseTarget(target: str | tuple[str, int]) -> tuple[str, int]:
+    """Splits a "host:port" string, or a port alone, into (host, port)."""
+    if isinstance(target, tuple):
+        return target
+    host, _, port = target.rpartition(":")
+    return host or "localhost", int(port)
+
+
+class AsyncRemotePainter:
+    """Async interface to execute scripts in one Substance Painter instance.
+    Requests go one at a time over one keep-alive connection, like "RemotePainter".
+
+    Args:
+        port (int, optional): The port to connect to Substance Painter. Defaults to 60041.
+        host (str, optional): The host address for Substance Painter. Defaults to "localhost".
+
+    """
+
+    def __init__(self, port: int = 60041, host: str = "localhost") -> None:
+        self._host: str = host
+        self._port: int = port
+        self._PAINTER_ROUTE: str = "/run.json"
+        self._CONNECT_TIMEOUT: float = 10
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        # Painter answers one request per connection at a time.
+        self._lock = asyncio.Lock()
+
+    @property
+    def target(self) -> str:
+        return f"{self._host}:{self._port}"
+
+    async def __aenter__(self) -> "AsyncRemotePainter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def checkConnection(self) -> bool:
+        """Tests the connection to Substance Painter.
+        The connection is kept open for the following requests.
+
+        Returns:
+            bool: True if the connection is successful.
+
+        """
+        async with self._lock:
+            await self._checkConnection()
+        return True
+
+    async def _checkConnection(self) -> dict:
+        """Opens the connection if needed. The caller holds the connection lock."""
+        await self._getConnection()
+        return {"status": "connected"}
+
+    async def close(self) -> None:
+        """Closes the persistent connection. The next request opens a new one."""
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def execScript(self, script: str, type: str, verbose: bool = True) -> dict:
+        """Executes a script in Substance Painter.
+
+        Args:
+            script: The script content to execute.
+            type: The type of script ("js" for JavaScript, "python" for Python).
+            verbose: Print the raw response and how it was read.
+
+        Returns:
+            dict: A dictionary with execution status and optional output.
+
+        Raises:
+            PainterError: The connection failed.
+            ExecuteScriptError: The script raised an error in Painter.
+
+        """
+        async with self._lock:
+            return await self._execScript(script, type, verbose)
+
+    async def _execScript(self, script: str, type: str, verbose: bool = True) -> dict:
+        """Executes a script. The caller holds the connection lock."""
+        body = encodeCommand(script, type)
+        data = await self._sendRequest(self._PAINTER_ROUTE, body)
+        return parseResponse(data, body, type, verbose)
+
+    async def _getConnection(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Returns the persistent connection, opening it if needed."""
+        if self._writer is None or self._writer.is_closing():
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._host, self._port),
+                    self._CONNECT_TIMEOUT,
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                raise PainterError(f"Failed to connect to {self.target}: {e!r}") from e
+        return self._reader, self._writer
+
+    async def _sendRequest(self, route: str, body: bytes) -> bytes:
+        """Sends a POST request over the persistent connection and returns the response body.
+        Reconnects and resends once if sending over a reused connection failed.
+        A failure while reading the response is raised, Painter may have run the script already.
+        """
+        for attempt in range(2):
+            reused = self._writer is not None and not self._writer.is_closing()
+            reader, writer = await self._getConnection()
+            try:
+                writer.write(
+                    f"POST {route} HTTP/1.1\r\n"
+                    f"Host: {self.target}\r\n"
+                    "Content-type: application/json\r\n"
+                    "Accept: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body,
+                )
+                await writer.drain()
+            except ConnectionError as e:
+                await self.close()
+                # A fresh connection failing is a real error, not an idle timeout.
+                if not reused or attempt:
+                    raise PainterError(f"Connection to {self.target} lost: {e!r}") from e
+                continue
+            except BaseException:
+                await self.close()
+                raise
+
+            try:
+                return await self._readResponse(reader)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                raise PainterError(
+                    f"Connection to {self.target} lost while waiting for the response: {e!r}",
+                ) from e
+            except ValueError as e:
+                await self.close()
+                raise PainterError(f"Malformed response from {self.target}: {e!r}") from e
+            except BaseException:
+                # Cancelled or timed out mid response. The connection state is unknown.
+                await self.close()
+                raise
+
+    async def _readResponse(self, reader: asyncio.StreamReader) -> bytes:
+        """Reads one HTTP response and returns its body.
+
+        Raises:
+            PainterError: The response status is not 2xx, or the response is malformed.
+
+        """
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Server closed the connection")
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise PainterError(f"Malformed response from {self.target}: {status_line!r}")
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                data += await reader.readexactly(size)
+                await reader.readline()
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            # No length, the body ends when the server closes the connection.
+            data = await reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close" or status_line.startswith(b"HTTP/1.0"):
+            await self.close()
+        if not 200 <= status < 300:
+            detail = data.decode("utf-8", "replace")[:200]
+            reason = status_line.decode("latin-1").strip()
+            raise PainterError(f"{self.target} answered {reason}: {detail}")
+        return data
+
+
+class RemotePainterPool:
+    """Runs scripts on many Substance Painter instances concurrently.
+
+    Args:
+        targets: The instances, as "host:port" strings or (host, port) tuples.
+        maxConcurrency (int, optional): Most requests in flight at once. Defaults to 8.
+        timeout (float, optional): Seconds each request may take before it fails,
+            per target. Defaults to 3600.
+
+    """
+
+    def __init__(
+        self,
+        targets: list[str | tuple[str, int]],
+        maxConcurrency: int = 8,
+        timeout: float = 3600,
+    ) -> None:
+        self._timeout: float = timeout
+        self._semaphore = asyncio.Semaphore(maxConcurrency)
+        self.clients: dict[str, AsyncRemotePainter] = {}
+        for target in targets:
+            host, port = parseTarget(target)
+            remote = AsyncRemotePainter(port, host)
+            self.clients[remote.target] = remote
+
+    async def __aenter__(self) -> "RemotePainterPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the connections to all instances."""
+        await asyncio.gather(*(remote.close() for remote in self.clients.values()))
+
+    async def checkConnections(self) -> list[TargetResult]:
+        """Tests the connection to every instance.
+
+        Returns:
+            list[TargetResult]: One result per instance, in target order.
+
+        """
+        return await asyncio.gather(
+            *(self._run(remote, remote._checkConnection) for remote in self.clients.values()),
+        )
+
+    async def execScript(
+        self,
+        script: str,
+        type: str,
+        verbose: bool = True,
+    ) -> list[TargetResult]:
+        """Executes the same script in every instance.
+
+        Args:
+            script: The script content to execute.
+            type: The type of script ("js" for JavaScript, "python" for Python).
+            verbose: Print the raw responses and how they were read.
+
+        Returns:
+            list[TargetResult]: One result per instance, in target order.
+
+        """
+        jobs = [(target, script, type) for target in self.clients]
+        return await self.execJobs(jobs, verbose)
+
+    async def execJobs(
+        self,
+        jobs: list[tuple[str, str, str]],
+        verbose: bool = True,
+    ) -> list[TargetResult]:
+        """Executes scripts in chosen instances. Jobs for the same instance run in order,
+        jobs for different instances run concurrently.
+
+        Args:
+            jobs: (target, script, type) per request. Ex. ("localhost:60041", script, "python")
+            verbose: Print the raw responses and how they were read.
+
+        Returns:
+            list[TargetResult]: One result per job, in job order.
+
+        """
+        coroutines = []
+        for target, script, type in jobs:
+            host, port = parseTarget(target)
+            remote = self.clients.get(f"{host}:{port}")
+            if remote is None:
+                remote = self.clients[f"{host}:{port}"] = AsyncRemotePainter(port, host)
+            coroutines.append(self._run(remote, remote._execScript, script, type, verbose))
+        return await asyncio.gather(*coroutines)
+
+    async def _run(self, remote: AsyncRemotePainter, request, *args) -> TargetResult:
+        """Runs one request within the concurrency limit and timeout, as a TargetResult.
+        Waiting for earlier requests to the same instance is not counted in the timeout.
+        """
+        start = time.perf_counter()
+        try:
+            async with remote._lock, self._semaphore:
+                result = await asyncio.wait_for(request(*args), self._timeout)
+            return TargetResult(remote.target, result, None, time.perf_counter() - start)
+        except PainterError as e:
+            error = e
+        except asyncio.TimeoutError:
+            error = PainterError(f"No response from {remote.target} within {self._timeout} s")
+        except Exception as e:
+            # Ex. a malformed response. Every target still gets its TargetResult.
+            error = PainterError(f"Request to {remote.target} failed: {e!r}")
+        return TargetResult(remote.target, None, error, time.perf_counter() - start)
+
+
+async def sendScriptToPainters(script: str, targets: list[str]) -> list[TargetResult]:
+    """Executes a Python script in every target and prints one line per target."""
+    async with RemotePainterPool(targets) as pool:
+        results = await pool.execScript(script, "python")
+    for result in results:
+        status = "ok" if result.ok else f"failed: {result.error}"
+        print(f"{result.target}: {status} ({result.elapsed * 1000:.1f} ms)")
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python lib_remote_async.py script.py host:port [host:port ...]")
+        sys.exit(1)
+    with open(sys.argv[1]) as file:
+        script_content = file.read()
+    results = asyncio.run(sendScriptToPainters(script_content, sys.argv[2:]))
+    sys.exit(0 if all(result.ok for result in results) else 1)
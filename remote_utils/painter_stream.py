@@ -0,0 +1,255 @@
+"""Substance Painter Stream Jobs (Painter side)
+==================================================
+
+Runs a remote script as a job on Painter's main thread and buffers its log records,
+prints and progress until the client polls for them. Uploaded and called by "remote_stream.py".
+
+Painter answers one remote request at a time on its main thread, so polls are only served
+between steps of a job. A script that defines a generator function "run()" is stepped one
+"yield" at a time, each yielded value sent back as progress. Ex. yield 0.5, yield "Baking"
+A plain script runs in one step. Its result is whatever it assigns to "result",
+or the return value of "run()".
+
+A job is forgotten once the client polls its final state. Jobs of clients that went away
+are cancelled, then forgotten, after JOB_IDLE_TIMEOUT without polls or steps.
+"""
+
+import contextlib
+import itertools
+import json
+import threading
+import time
+import traceback
+import types
+from collections import deque
+
+import substance_painter as sp
+
+# Unpolled records kept per job. Older ones are dropped and counted.
+MAX_RECORDS = 10000
+# sp.logging functions captured while a job step runs.
+LOG_FUNCTIONS = ("info", "warning", "error")
+# Seconds a job may go without a poll or a step before it's cancelled and forgotten.
+JOB_IDLE_TIMEOUT = 300
+
+JOBS: dict[str, "StreamJob"] = {}
+_job_ids = itertools.count(1)
+
+
+class _PrintCapture:
+    """Stdout replacement recording each printed line."""
+
+    def __init__(self, job: "StreamJob") -> None:
+        self._job = job
+        self._line = ""
+
+    def write(self, text: str) -> int:
+        self._line += text
+        *lines, self._line = self._line.split("\n")
+        for line in lines:
+            self._job.record("print", message=line)
+        return len(text)
+
+    def flush(self) -> None:
+        if self._line:
+            self._job.record("print", message=self._line)
+            self._line = ""
+
+
+class StreamJob:
+    """One streamed script, stepped on the main thread.
+
+    Args:
+        job_id: Id the client polls with.
+        source: Python source of the script.
+        filename: Name shown in tracebacks.
+
+    """
+
+    def __init__(self, job_id: str, source: str, filename: str) -> None:
+        self.job_id = job_id
+        self.code = compile(source, filename, "exec")
+        self.namespace = {"__name__": "__stream__"}
+        self.records: deque[dict] = deque()
+        self.dropped = 0
+        self.done = False
+        self.cancelled = False
+        self.result = None
+        self.error: str | None = None
+        self._seq = itertools.count(1)
+        self._steps = None
+        self._lock = threading.Lock()
+        # Last poll or step. A long step counts as activity, polls wait for it to end.
+        self.last_active = time.monotonic()
+
+    def record(self, kind: str, message: str = "", level: str | None = None, value=None) -> None:
+        """Buffer a record for the next poll."""
+        with self._lock:
+            if len(self.records) >= MAX_RECORDS:
+                self.records.popleft()
+                self.dropped += 1
+            self.records.append(
+                {
+                    "seq": next(self._seq),
+                    "kind": kind,
+                    "time": time.time(),
+                    "level": level,
+                    "message": message,
+                    "value": jsonable(value),
+                },
+            )
+
+    def take(self, after: int) -> list[dict]:
+        """Records newer than "after". Older ones were received and are forgotten."""
+        with self._lock:
+            while self.records and self.records[0]["seq"] <= after:
+                self.records.popleft()
+            return list(self.records)
+
+    def step(self) -> None:
+        """Run the script, or its "run()" generator up to the next yield."""
+        self.last_active = time.monotonic()
+        if self.cancelled:
+            self.finish(error="Cancelled")
+            return
+        try:
+            with self.capture():
+                try:
+                    if self._steps is None:
+                        exec(self.code, self.namespace)
+                        run = self.namespace.get("run")
+                        value = run() if callable(run) else self.namespace.get("result")
+                        if not isinstance(value, types.GeneratorType):
+                            self.finish(result=value)
+                            return
+                        self._steps = value
+                    progress = next(self._steps)
+                except StopIteration as e:
+                    self.finish(result=e.value)
+                    return
+        except Exception:
+            self.finish(error=traceback.format_exc())
+            return
+        self.record("progress", value=progress)
+        schedule(self.step)
+
+    def finish(self, result=None, error: str | None = None) -> None:
+        self.result = jsonable(result)
+        self.error = error
+        self.done = True
+        self.last_active = time.monotonic()
+
+    @contextlib.contextmanager
+    def capture(self):
+        """Record sp.logging calls and prints while a step runs. They still reach Painter."""
+        originals = {name: getattr(sp.logging, name) for name in LOG_FUNCTIONS}
+
+        def wrap(name, original):
+            def log(message, *args, **kwargs):
+                self.record("log", message=str(message), level=name.upper())
+                return original(message, *args, **kwargs)
+
+            return log
+
+        for name, original in originals.items():
+            setattr(sp.logging, name, wrap(name, original))
+        printed = _PrintCapture(self)
+        try:
+            with contextlib.redirect_stdout(printed):
+                yield
+        finally:
+            printed.flush()
+            for name, original in originals.items():
+                setattr(sp.logging, name, original)
+
+
+def jsonable(value):
+    """The value if JSON can send it, else its repr."""
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def schedule(callback) -> None:
+    """Run a callback on the main thread once the current request is answered.
+    Outside Painter, without a Qt application, it runs on a background thread.
+    """
+    try:
+        from PySide6.QtCore import QCoreApplication, QTimer
+
+        if QCoreApplication.instance() is not None:
+            QTimer.singleShot(0, callback)
+            return
+    except ImportError:
+        pass
+    threading.Thread(target=callback, daemon=True).start()
+
+
+def expire_jobs(timeout: float = JOB_IDLE_TIMEOUT) -> list[str]:
+    """Cancel idle running jobs, and forget idle finished ones with their records.
+    Called on every start and poll.
+
+    Args:
+        timeout: Seconds without a poll or a step.
+
+    Returns:
+        list[str]: Ids of the forgotten jobs.
+
+    """
+    now = time.monotonic()
+    expired = []
+    for job_id, job in list(JOBS.items()):
+        if now - job.last_active < timeout:
+            continue
+        if job.done:
+            del JOBS[job_id]
+            expired.append(job_id)
+        else:
+            job.cancelled = True  # forgotten once its next step finishes it
+    return expired
+
+
+def start(source: str, filename: str = "<stream>") -> str:
+    """Start a streamed script. Returns its job id."""
+    expire_jobs()
+    job_id = str(next(_job_ids))
+    JOBS[job_id] = StreamJob(job_id, source, filename)
+    schedule(JOBS[job_id].step)
+    return job_id
+
+
+def poll(job_id: str, after: int = 0) -> dict:
+    """New records of a job, and its result once done. A done job is forgotten after this.
+
+    Args:
+        job_id: From "start()".
+        after: Seq of the last record received. Ex. 0 on the first poll
+
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        raise RuntimeError(f"Unknown stream job: {job_id}")
+    job.last_active = time.monotonic()
+    expire_jobs()
+    done = job.done
+    state = {
+        "records": job.take(after),
+        "dropped": job.dropped,
+        "done": done,
+        "result": job.result if done else None,
+        "error": job.error if done else None,
+    }
+    if done:
+        del JOBS[job_id]
+    return state
+
+
+def cancel(job_id: str) -> bool:
+    """Stop a job before its next step. Returns False if it's unknown or already done."""
+    job = JOBS.get(job_id)
+    if job is None or job.done:
+        return False
+    job.cancelled = True
+    return True
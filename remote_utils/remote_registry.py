@@ -0,0 +1,172 @@
+"""Substance Painter Remote Module Registry
+==================================================
+
+Uploads a helper module to Substance Painter once, then calls its functions by name.
+Modules stay loaded in Painter, keyed by a hash of their source. A call only sends the
+function name, JSON arguments and the expected hash. The module is uploaded again only
+when Painter doesn't have that hash, ex. the source changed or Painter was restarted.
+
+Return values come back when Painter returns the value of the script's last expression.
+They need to be JSON serializable.
+
+Ex. registry.register("helpers", source), registry.call("helpers", "rename_layers", "skin_")
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from lib_remote import ExecuteScriptError, PainterError, RemotePainter
+
+# Modules are kept in Painter's sys.modules under this prefix. Ex. "painter_remote.helpers"
+MODULE_PREFIX = "painter_remote"
+# Error text raised in Painter when a call needs the module uploaded first.
+MISSING_MARKER = "painter_remote module missing"
+
+UPLOAD_TEMPLATE = """\
+import sys, types
+_module = types.ModuleType({module_name!r})
+_module.__remote_hash__ = {source_hash!r}
+exec(compile({source!r}, {filename!r}, "exec"), _module.__dict__)
+sys.modules[{module_name!r}] = _module
+del _module
+{source_hash!r}
+"""
+
+CALL_TEMPLATE = """\
+import json, sys
+_module = sys.modules.get({module_name!r})
+if getattr(_module, "__remote_hash__", None) != {source_hash!r}:
+    raise RuntimeError({missing!r})
+_result = _module.{function}(*json.loads({args!r}), **json.loads({kwargs!r}))
+del _module
+json.dumps(_result)
+"""
+
+
+def sourceHash(source: str) -> str:
+    """Short content hash of module source."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def decodeResult(response: dict):
+    """Decodes the JSON return value from a script response. None if there is none.
+    Scripts send it back as "json.dumps(value)" on their last line.
+    """
+    if "status" not in response:
+        return response  # JSON object sent back as is
+    output = response.get("output")
+    if output is None:
+        return None
+    try:
+        return json.loads(output)
+    except (TypeError, ValueError):
+        return output
+
+
+class RemoteModuleRegistry:
+    """Helper modules registered by name, uploaded to Substance Painter on first call.
+
+    Args:
+        remote (RemotePainter, optional): Connection to Substance Painter.
+            A new one on the default port if None.
+        verbose (bool, optional): Print the raw responses of uploads and calls.
+            Defaults to True.
+
+    """
+
+    def __init__(self, remote: RemotePainter | None = None, verbose: bool = True) -> None:
+        self.remote: RemotePainter = remote or RemotePainter()
+        self.verbose: bool = verbose
+        # (hash, source) per module name.
+        self._modules: dict[str, tuple[str, str]] = {}
+        self.uploads: int = 0
+        self.calls: int = 0
+
+    def register(self, name: str, source: str) -> str:
+        """Registers module source under a name. Nothing is sent until the first call.
+
+        Args:
+            name: Module name, a Python identifier. Ex. "helpers"
+            source: Python source of the module.
+
+        Returns:
+            str: Content hash of the source.
+
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Module name is not a Python identifier: {name}")
+        source_hash = sourceHash(source)
+        self._modules[name] = (source_hash, source)
+        return source_hash
+
+    def registerFile(self, path: str | Path, name: str | None = None) -> str:
+        """Registers a Python file. Reading it again only uploads it again if it changed.
+
+        Args:
+            path: Path to the Python file.
+            name: Module name. The file name without ".py" if None.
+
+        Returns:
+            str: Content hash of the file.
+
+        """
+        path = Path(path)
+        return self.register(name or path.stem, path.read_text(encoding="utf-8"))
+
+    def upload(self, name: str) -> None:
+        """Uploads a registered module to Substance Painter now, replacing any older version."""
+        source_hash, source = self._source(name)
+        script = UPLOAD_TEMPLATE.format(
+            module_name=f"{MODULE_PREFIX}.{name}",
+            source_hash=source_hash,
+            source=source,
+            filename=f"<{MODULE_PREFIX}.{name}>",
+        )
+        self.remote.execScript(script, "python", self.verbose)
+        self.uploads += 1
+
+    def call(self, name: str, function: str, *args, **kwargs):
+        """Calls a function of a registered module in Substance Painter.
+        Uploads the module first if Painter doesn't have this version of it.
+
+        Args:
+            name: Registered module name. Ex. "helpers"
+            function: Function name in the module. Ex. "rename_layers"
+            *args: JSON serializable positional arguments.
+            **kwargs: JSON serializable keyword arguments.
+
+        Returns:
+            The function's return value, if Painter sends it back. Otherwise None.
+
+        Raises:
+            ExecuteScriptError: The function raised an error in Painter.
+
+        """
+        if not function.isidentifier():
+            raise ValueError(f"Function name is not a Python identifier: {function}")
+        source_hash = self._source(name)[0]
+        script = CALL_TEMPLATE.format(
+            module_name=f"{MODULE_PREFIX}.{name}",
+            source_hash=source_hash,
+            missing=MISSING_MARKER,
+            function=function,
+            args=json.dumps(args),
+            kwargs=json.dumps(kwargs),
+        )
+        try:
+            response = self.remote.execScript(script, "python", self.verbose)
+        except ExecuteScriptError as e:
+            if MISSING_MARKER not in str(e):
+                raise
+            self.upload(name)
+            response = self.remote.execScript(script, "python", self.verbose)
+        self.calls += 1
+        return decodeResult(response)
+
+    def _source(self, name: str) -> tuple[str, str]:
+        """(hash, source) of a registered module."""
+        try:
+            return self._modules[name]
+        except KeyError:
+            raise PainterError(f"Module not registered: {name}") from None
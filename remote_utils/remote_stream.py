@@ -0,0 +1,148 @@
+"""Substance Painter Streamed Remote Scripts
+==================================================
+
+Runs a script in Substance Painter and streams its log records, prints and progress back
+while it runs, instead of one response at the end.
+
+The script runs as a job on Painter's main thread, see "painter_stream.py" (uploaded once).
+The client polls the job over the same keep-alive connection and yields each new record.
+Polls are answered between job steps, so long scripts should define a generator function
+"run()" and yield progress between steps. Ex. yield i / count
+
+Ex. python remote_stream.py long_script.py
+"""
+
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from lib_remote import ExecuteScriptError, RemotePainter
+from remote_registry import RemoteModuleRegistry
+
+# Painter side of the stream, uploaded through the module registry.
+PAINTER_STREAM_FILE = Path(__file__).resolve().parent / "painter_stream.py"
+PAINTER_STREAM_MODULE = "painter_stream"
+
+
+@dataclass
+class StreamRecord:
+    """One record sent back by a streamed script.
+
+    Args:
+        seq: Order of the record within its job, from 1.
+        kind: "log" for sp.logging calls, "print" for printed lines, "progress" for yields.
+        time: Painter's clock when it was recorded, in seconds since the epoch.
+        level: Log level for "log" records. Ex. "INFO", "WARNING", "ERROR"
+        message: Log message or printed line.
+        value: Yielded value for "progress" records. Ex. 0.5, "Baking"
+
+    """
+
+    seq: int
+    kind: str
+    time: float
+    level: str | None = None
+    message: str = ""
+    value: object = None
+
+    def __str__(self) -> str:
+        if self.kind == "log":
+            return f"[{self.level}] {self.message}"
+        if self.kind == "progress":
+            return f"[PROGRESS] {self.value}"
+        return self.message
+
+
+class ScriptStream:
+    """A script running in Substance Painter. Iterate it to get its records as they arrive.
+    After the last record, "result" holds what the script sent back.
+
+    Args:
+        remote (RemotePainter): Connection to Substance Painter.
+        script: Python source to run.
+        registry (RemoteModuleRegistry, optional): Registry to upload the Painter side with.
+            A new one on "remote" if None, not printing raw responses.
+        pollInterval (float, optional): Seconds between polls while nothing new arrives.
+            Defaults to 0.1.
+
+    Raises:
+        ExecuteScriptError: While iterating, if the script raised an error or was cancelled.
+
+    """
+
+    def __init__(
+        self,
+        remote: RemotePainter,
+        script: str,
+        registry: RemoteModuleRegistry | None = None,
+        pollInterval: float = 0.1,
+    ) -> None:
+        self.registry: RemoteModuleRegistry = registry or RemoteModuleRegistry(remote, False)
+        self.registry.registerFile(PAINTER_STREAM_FILE, PAINTER_STREAM_MODULE)
+        self._pollInterval: float = pollInterval
+        self.done: bool = False
+        self.result = None
+        # Records Painter dropped because they weren't polled in time.
+        self.dropped: int = 0
+        self.jobId: str = self._call("start", script, "<stream>")
+
+    def __iter__(self) -> Iterator[StreamRecord]:
+        last_seq = 0
+        while not self.done:
+            state = self._call("poll", self.jobId, last_seq)
+            self.dropped = state["dropped"]
+            for record in state["records"]:
+                last_seq = record["seq"]
+                yield StreamRecord(**record)
+            if state["done"]:
+                self.done = True
+                self.result = state["result"]
+                if state["error"] is not None:
+                    raise ExecuteScriptError(state["error"])
+            elif not state["records"]:
+                time.sleep(self._pollInterval)
+
+    def cancel(self) -> bool:
+        """Stops the script before its next step. Records until then are still streamed.
+
+        Returns:
+            bool: False if the script already finished.
+
+        """
+        return self._call("cancel", self.jobId)
+
+    def _call(self, function: str, *args):
+        """Calls the Painter side."""
+        return self.registry.call(PAINTER_STREAM_MODULE, function, *args)
+
+
+def streamScript(remote: RemotePainter, script: str, pollInterval: float = 0.1) -> ScriptStream:
+    """Starts a script in Substance Painter and returns its record stream.
+
+    Ex.
+        stream = streamScript(remote, script)
+        for record in stream:
+            print(record)
+        print(stream.result)
+
+    """
+    return ScriptStream(remote, script, pollInterval=pollInterval)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python remote_stream.py script.py")
+        sys.exit(1)
+    with open(sys.argv[1]) as file:
+        script_content = file.read()
+    with RemotePainter() as Remote:
+        stream = streamScript(Remote, script_content)
+        try:
+            for stream_record in stream:
+                print(stream_record)
+        except ExecuteScriptError as e:
+            print(f"Script execution failed: {e}")
+            sys.exit(1)
+        print(f"Result from Substance Painter: {stream.result}")
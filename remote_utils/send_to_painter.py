@@ -2,11 +2,18 @@
 ==================================================
 
 Sends a Python script file to Substance Painter for remote execution.
+With a function name, the file is kept loaded in Painter as a module and only that
+function is called. The file is sent again only when it changes.
+
+Ex. python send_to_painter.py example_script.py
+Ex. python send_to_painter.py helpers.py rename_layers
 """
 
 import sys
+from pathlib import Path
 
 import lib_remote
+import remote_registry
 
 
 def send_script_to_painter() -> None:
@@ -16,20 +23,9 @@ def send_script_to_painter() -> None:
     and executes it remotely. Prints status messages and exits on failure.
 
     Args:
-        None (uses sys.argv[1] for script file path)
+        None (uses sys.argv[1] for script file path, optional sys.argv[2] for a function name)
 
     """
-    # Create connection to Substance Painter
-    Remote = lib_remote.RemotePainter()
-
-    # Check connection
-    try:
-        Remote.checkConnection()
-        print("Connection to Substance Painter established")
-    except Exception as e:
-        print(f"Connection failed: {e}")
-        sys.exit(1)
-
     # Get script path from command-line argument
     if len(sys.argv) < 2:
         print("Error: No script file provided. Please pass a script file path.")
@@ -46,16 +42,34 @@ def send_script_to_painter() -> None:
         print(f"Error reading script file: {e}")
         sys.exit(1)
 
-    # Execute the script in Substance Painter
-    try:
-        result = Remote.execScript(script_content, "python")
-        print("Script executed successfully")
-        if result:
-            print(f"Result from Substance Painter: {result}")
-    except lib_remote.ExecuteScriptError as e:
-        print(f"Script execution failed: {e}")
-    except Exception as e:
-        print(f"Unexpected error during execution: {e}")
+    # Create connection to Substance Painter. Kept open for the script request.
+    with lib_remote.RemotePainter() as Remote:
+        # Check connection
+        try:
+            Remote.checkConnection()
+            print("Connection to Substance Painter established")
+        except Exception as e:
+            print(f"Connection failed: {e}")
+            sys.exit(1)
+
+        # Execute the script in Substance Painter
+        try:
+            if len(sys.argv) > 2:
+                # Each file is its own module, so switching files doesn't evict the other.
+                registry = remote_registry.RemoteModuleRegistry(Remote)
+                registry.registerFile(script_path)
+                result = registry.call(Path(script_path).stem, sys.argv[2])
+                print(f"Module uploads: {registry.uploads}")
+            else:
+                result = Remote.execScript(script_content, "python")
+            print("Script executed successfully")
+            if result:
+                print(f"Result from Substance Painter: {result}")
+            print(f"Request time: {Remote.lastTiming.total_time * 1000:.1f} ms")
+        except lib_remote.ExecuteScriptError as e:
+            print(f"Script execution failed: {e}")
+        except Exception as e:
+            print(f"Unexpected error during execution: {e}")
 
 
 if __name__ == "__main__":